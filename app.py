@@ -1,31 +1,33 @@
+from __future__ import annotations
+
 import os
-import re
 import base64
 import mimetypes
-import matplotlib.pyplot as plt
-import pandas as pd
+import tempfile
 import streamlit as st
-from Sastrawi.StopWordRemover.StopWordRemoverFactory import (
-    StopWordRemoverFactory, StopWordRemover, ArrayDictionary
-)
-from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
-from textblob import TextBlob      
+
+# pandas, matplotlib & pipeline sentinex (Sastrawi) diimpor di bawah halaman
+# "Tentang", sehingga halaman itu tidak menunggu dependensi berat.
 
 
 # ============================================================
 #  Avatar bulat 
 # ============================================================
+@st.cache_data(show_spinner=False)
+def _encode_image(path: str, mtime: float) -> tuple[str, str]:
+    """(mime, base64) file gambar; di-cache per path + waktu modifikasi."""
+    mime, _ = mimetypes.guess_type(path)
+    with open(path, "rb") as f:
+        return mime or "image/jpeg", base64.b64encode(f.read()).decode()
+
+
 def img_to_html_circle(path: str, size: int = 220, alt: str = "") -> str:
     """
     Render gambar lokal (path) sebagai <img> base64 berbentuk lingkaran.
     - size: lebar gambar (px)
     - alt : teks alternatif (SEO/aksesibilitas)
     """
-    mime, _ = mimetypes.guess_type(path)
-    if mime is None:
-        mime = "image/jpeg"
-    with open(path, "rb") as f:
-        b64 = base64.b64encode(f.read()).decode()
+    mime, b64 = _encode_image(path, os.path.getmtime(path))
 
     # CSS: bulat penuh + border merah + shadow lembut
     return (
@@ -56,7 +58,6 @@ def _ensure_gps() -> bool:
         return False
 
 
-@st.cache_data(show_spinner=True)
 def scrape_gplay_reviews(
     package_id: str,
     lang: str = "id",
@@ -66,140 +67,98 @@ def scrape_gplay_reviews(
     filter_score: int | None = None
 ) -> pd.DataFrame:
     """
-    Ambil ulasan Google Play → DataFrame kolom: ['user','rating','date','text'].
+    Ambil ulasan Google Play → DataFrame kolom: ['review_id','user','rating','date','text'].
     Param:
       - package_id  : nama paket aplikasi (mis. blibli.mobile.commerce)
       - lang/country: bahasa & negara (kode ISO)
       - count       : jumlah ulasan
       - sort_key    : NEWEST atau MOST_RELEVANT
       - filter_score: None atau skor 1..5 untuk filter
+    Diambil per halaman; progres tersimpan sehingga klik berikutnya
+    melanjutkan / memakai ulang hasil yang sudah ada.
     """
     if not _ensure_gps():
-        return pd.DataFrame(columns=["user", "rating", "date", "text"])
+        return pd.DataFrame(columns=SCRAPE_COLUMNS)
+
+    with stage("scrape") as rec:
+        df_ = scrape_reviews(
+            package_id,
+            lang=lang,
+            country=country,
+            count=int(count),
+            sort_key=sort_key,
+            filter_score=filter_score
+        )
+        rec.rows = len(df_)
+    return df_
 
-    from google_play_scraper import reviews, Sort
 
-    sort = Sort.NEWEST if str(sort_key).upper() == "NEWEST" else Sort.MOST_RELEVANT
+def scrape_gplay_many(**kwargs) -> pd.DataFrame:
+    """Scrape 4 aplikasi (Blibli, Tokopedia, Lazada, Shopee) bersamaan → satu DataFrame + kolom 'app'."""
+    if not _ensure_gps():
+        return pd.DataFrame(columns=["app"] + SCRAPE_COLUMNS)
 
-    result, _ = reviews(
-        package_id,
-        lang=lang,
-        country=country,
-        sort=sort,
-        count=int(count),
-        filter_score_with=filter_score
-    )
+    with stage("scrape") as rec:
+        hasil = scrape_many(PACKAGES, **kwargs)
+        rec.rows = sum(len(df_) for df_ in hasil.values())
+    return pd.concat(
+        [df_.assign(app=app) for app, df_ in hasil.items()], ignore_index=True
+    )[["app"] + SCRAPE_COLUMNS]
 
-    if not result:
-        return pd.DataFrame(columns=["user", "rating", "date", "text"])
+@st.cache_resource
+def get_review_store() -> ReviewStore:
+    """Satu koneksi penyimpanan ulasan lokal per proses."""
+    return ReviewStore()
 
-    # Normalisasi kolom agar konsisten
-    df = pd.DataFrame(result)
-    keep = ["userName", "score", "at", "content"]
-    df = df[[c for c in keep if c in df.columns]].copy()
-    df.rename(
-        columns={"userName": "user", "score": "rating", "at": "date", "content": "text"},
-        inplace=True
-    )
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    df.sort_values("date", ascending=False, inplace=True, ignore_index=True)
-    return df
 
-# ============================================================
-# 1) Kamus Normalisasi & Stopword
-# ============================================================
-norm = {
-    "nggak": "tidak", "gak": "tidak", "ga": "tidak", "ngga": "tidak", "tdk": "tidak",
-    "yg": "yang", "dr": "dari", "dgn": "dengan", "utk": "untuk", "tp": "tapi",
-    "bgt": "banget", "bngt": "banget", "bkn": "bukan", "aja": "saja", "aj": "saja",
-    "krn": "karena", "krna": "karena", "sm": "sama", "bgus": "bagus", "trnyata": "ternyata",
-    "km": "kamu", "kmu": "kamu", "sy": "saya", "gw": "saya", "ane": "saya",
-}
-
-# Tambahan stopword (dipertahankan sesuai kode asli)
-more_stop_words = [
-    "ada", "adalah", "adanya", "akan", "amat", "an", "anda", "andalah", "antara", "apa", "apaan",
-    "apakah", "apalagi", "bagi", "bahkan", "bagaimana", "bahwa", "bahwasanya", "baik", "beberapa",
-    "bagian", "banyak", "baru", "bawah", "berikut", "berbagai", "bersama", "bersama-sama", "bisa",
-    "boleh", "bukan", "kepada", "kalian", "kami", "kamu", "karena", "dari", "daripada", "dalam",
-    "dengan", "di", "dia", "dirimu", "juga", "jika", "lagi", "lain", "lalu", "mana", "maka", "atau",
-    "telah", "kemudian", "kalau", "sedang", "dan", "tapi", "dapat", "itu", "saja", "hanya", "lebih",
-    "setiap", "sangat", "sudah", "ini", "pada", "lebih", "saja", "lagi", "maka", "sangat", "atau",
-    "kami", "atau", "sangat", "hanya", "lebih", "dan", "saja", "maka", "telah", "tetapi", "baru"
-]
-
-stop_words = StopWordRemoverFactory().get_stop_words()
-stop_words.extend(more_stop_words)
-new_array = ArrayDictionary(stop_words)
-stop_words_remover_new = StopWordRemover(new_array)
+def sync_to_store(packages: dict, lang: str, country: str, count: int,
+                  dedup: bool = False, filter_score: int | None = None) -> pd.DataFrame:
+    """
+    Scraping inkremental: ambil & proses hanya ulasan baru tiap package,
+    lalu tampilkan `count` ulasan terbaru dari penyimpanan lokal.
+    Sinkronisasi selalu mengambil semua skor (urut NEWEST, agar high-water
+    mark tidak melompati ulasan); filter_score hanya menyaring tampilan.
+    dedup=True: ulasan (hampir) duplikat memakai hasil klasternya.
+    """
+    store = get_review_store()
+    frames = []
+    for app, package_id in packages.items():
+        with stage("scrape") as rec:
+            info = sync_package(store, package_id, lang=lang, country=country, max_new=count,
+                                workers=default_workers(), dedup=dedup)
+            rec.rows = info["fetched"]
+        st.sidebar.success(
+            f"{app}: {info['fetched']} diambil, {info['new']} baru, {info['processed']} diproses"
+            + (f" ({info['duplicates']} duplikat)" if dedup else "")
+            + (f"; {info['backfill_pending']} celah dilanjutkan pada sinkronisasi berikutnya"
+               if info["backfill_pending"] else "")
+        )
+        frames.append(store.load(package_id, limit=count, rating=filter_score).assign(app=app))
+    return pd.concat(frames, ignore_index=True)
 
 
-# ============================================================
-# 2) Fungsi Pre-processing (6 langkah)
-# ============================================================
-def cleaning(text):
-    # Hapus mention, hashtag, link
-    text = re.sub(r'@[A-Za-z0-9_]+', ' ', text)
-    text = re.sub(r'#\w+', ' ', text)
-    text = re.sub(r'https?://\S+|www\.\S+', ' ', text)
-    # Hapus angka
-    text = re.sub(r'\d+', ' ', text)
-    # Hapus ekspresi tidak penting seperti 'hehe', 'wkwk', 'haha', dan kata promosi
-    text = re.sub(r'\b(hehe|wkwk|haha|promosi|promo|diskon|gratis ongkir|voucher|cashback)\b', ' ', text)
-    # Hapus simbol, tanda baca, dan emoji
-    text = re.sub(r'[^\w\s]', ' ', text)
-    # Ganti huruf berulang (baguuuus → bagus)
-    text = re.sub(r'(.)\1{2,}', r'\1', text)
-    # Hapus spasi berlebih dan ubah ke huruf kecil
-    text = re.sub(r'\s+', ' ', text).lower().strip()
-    return text
-
-def normalisasi(str_text: str) -> str:
-    """Ganti slang → baku berdasar kamus norm."""
-    for k, v in norm.items():
-        str_text = str_text.replace(k, v)
-    return str_text
-
-def stopword(str_text: str) -> str:
-    """Hapus stopword (Sastrawi + tambahan)."""
-    return stop_words_remover_new.remove(str_text)
-
-def stemming(tokens: list[str]) -> str:
-    """Stemming token menggunakan Sastrawi kemudian gabung kembali sebagai string."""
-    factory = StemmerFactory()
-    stemmer = factory.create_stemmer()
-    stems = [stemmer.stem(w) for w in tokens]
-    return " ".join(stems)
+@st.cache_resource
+def get_dedup_index() -> NearDupIndex:
+    """Indeks near-duplicate mode Upload CSV (bertambah antar-unggahan, disimpan di cache)."""
+    return NearDupIndex.load(cache_path("neardup.json"))
+
+
+def show_dedup_stats(index: NearDupIndex, skipped: int, rows: int) -> None:
+    d = index.stats()
+    st.caption(
+        f"Dedup: {skipped} dari {rows} baris memakai hasil klaster duplikat | indeks: "
+        f"{d['clusters']} klaster, {d['members']} ulasan ({d['dup_rate']:.1%} duplikat; "
+        f"{d['exact_hits']} identik, {d['near_hits']} hampir sama)"
+    )
+    with st.expander("Klaster duplikat terbesar"):
+        st.dataframe(index.top_clusters(), use_container_width=True)
+
+
+@st.cache_resource
+def get_model_bundle():
+    """Bundle model FastText + Bi-GRU (folder SENTINEX_MODEL_DIR / models), None bila belum ada."""
+    return load_bundle() if bundle_available() else None
 
-# ============================================================
-# 3) Deteksi Sentimen (leksikon sederhana)
-# ============================================================
-POS = [
-    "bagus", "mantap", "cepat", "murah", "puas", "baik", "keren", "nyaman", "top", "recommended",
-    "memuaskan", "senang", "lancar", "hebat", "ok", "oke", "terbaik", "worth", "rapi", "tepat"
-]
-NEG = [
-    "buruk", "jelek", "lambat", "lemot", "mahal", "kecewa", "mengecewakan", "error", "rusak",
-    "bohong", "tidak sesuai", "susah", "parah", "tolol", "bangsat", "goblok", "sampah", "payah",
-    "ngehang", "hang", "lag", "crash", "bug", "refund", "komplain"
-]
-
-def deteksi_sentimen(teks: str) -> str:
-    teks = teks.lower()
-    sp, sn = 0, 0
-    for kata in POS:
-        if kata in teks:
-            sp += 1
-    for kata in NEG:
-        if kata in teks:
-            sn += 1
-    if any(k in teks for k in ["tolol", "bangsat", "goblok", "sampah"]):
-        return "Negatif"
-    if sp > sn:
-        return "Positif"
-    elif sn > sp:
-        return "Negatif"
-    return "Netral"
 
 # ============================================================
 # 4) Antarmuka Streamlit
@@ -277,6 +236,40 @@ if choice == "Tentang":
 # ============================================================
 # HALAMAN: Utama (Input Teks / Upload CSV + hasil)
 # ============================================================
+import pandas as pd
+
+from sentinex.aggregate import detect_label_column, evaluate_predictions, label_distribution, peek
+from sentinex.cache import get_result_cache, preprocess_cached
+from sentinex.columnar import frame_bytes, read_frame
+from sentinex.config import cache_path
+from sentinex.dedup import NearDupIndex, preprocess_dedup
+from sentinex.inference import bundle_available, load_bundle
+from sentinex.langfilter import split_english
+from sentinex.metrics import cache_stats, get_metrics, stage
+from sentinex.parallel import default_workers
+from sentinex.preprocessing import (
+    cleaning, normalisasi, stopword, stemming
+)
+from sentinex.sentiment import deteksi_sentimen
+from sentinex.scraper import COLUMNS as SCRAPE_COLUMNS, PACKAGES, scrape_many, scrape_reviews
+from sentinex.stemming import get_stemmer
+from sentinex.store import ReviewStore, sync_package
+from sentinex.streaming import process_csv_stream
+
+
+@st.cache_resource(show_spinner="Menyiapkan kamus stopword & stemmer…")
+def warm_pipeline() -> dict:
+    """
+    Bangun stopword remover, kamus normalisasi & kamus kata dasar Sastrawi
+    sekali per proses (bukan per rerun / per klik pertama).
+    """
+    stopword(" ok ")
+    svc = get_stemmer()
+    svc.stemmer
+    return {"stem_cache": svc.stats()["size"]}
+
+
+warm_pipeline()
 
 # Judul utama halaman (muncul di semua menu selain "Tentang")
 st.title("💬 Sistem Deteksi Sentimen & Pre-Processing Teks")
@@ -290,21 +283,52 @@ pkg    = st.sidebar.text_input("Package ID", "blibli.mobile.commerce", key="pkg"
 bahasa = st.sidebar.selectbox("Bahasa", ["id", "en"], index=0, key="bahasa")
 negara = st.sidebar.selectbox("Negara", ["id", "us", "sg", "my"], index=0, key="negara")
 jumlah = st.sidebar.slider("Jumlah ulasan", 100, 10000, 500, 50, key="jumlah")  # max 10k sesuai permintaan
-urut   = st.sidebar.selectbox("Urutkan", ["NEWEST", "MOST_RELEVANT"], index=0, key="urut")
-skor   = st.sidebar.selectbox("Filter skor", ["Semua", 1, 2, 3, 4, 5], index=0, key="skor")
+inkremental = st.sidebar.checkbox(
+    "Hanya ulasan baru (simpan ke penyimpanan lokal)", value=False, key="scrape_inkremental",
+    help="Ulasan disimpan beserta hasil stem & sentimen; scraping berikutnya hanya mengambil "
+         "dan memproses ulasan yang lebih baru. Selalu diurutkan NEWEST."
+)
+urut   = st.sidebar.selectbox("Urutkan", ["NEWEST", "MOST_RELEVANT"], index=0, key="urut",
+                              disabled=inkremental,
+                              help="Mode inkremental selalu memakai NEWEST." if inkremental else None)
+skor   = st.sidebar.selectbox("Filter skor", ["Semua", 1, 2, 3, 4, 5], index=0, key="skor",
+                              help="Mode inkremental: semua skor tetap disimpan, filter hanya "
+                                   "menyaring ulasan yang ditampilkan." if inkremental else None)
+semua  = st.sidebar.checkbox("Scrape 4 aplikasi sekaligus", value=False, key="scrape_semua")
+dedup_scrape = inkremental and st.sidebar.checkbox(
+    "Gabungkan ulasan duplikat / hampir sama", value=False, key="scrape_dedup",
+    help="Ulasan yang (hampir) identik dengan ulasan tersimpan memakai hasil klasternya (MinHash/LSH)."
+)
 
 if st.sidebar.button("Scrape sekarang"):
     filter_score = None if skor == "Semua" else int(skor)
-    df_scraped = scrape_gplay_reviews(
-        package_id=pkg,
-        lang=bahasa,
-        country=negara,
-        count=jumlah,
-        sort_key=urut,
-        filter_score=filter_score
-    )
-    # simpan ke session agar bisa ditampilkan di bawah
-    st.session_state["scraped_df"] = df_scraped
+    try:
+        with st.spinner("Mengambil ulasan…"):
+            if inkremental:
+                df_scraped = sync_to_store(
+                    PACKAGES if semua else {pkg: pkg},
+                    lang=bahasa, country=negara, count=jumlah, dedup=dedup_scrape,
+                    filter_score=filter_score
+                )
+            elif semua:
+                df_scraped = scrape_gplay_many(
+                    lang=bahasa, country=negara, count=jumlah, sort_key=urut, filter_score=filter_score
+                )
+            else:
+                df_scraped = scrape_gplay_reviews(
+                    package_id=pkg,
+                    lang=bahasa,
+                    country=negara,
+                    count=jumlah,
+                    sort_key=urut,
+                    filter_score=filter_score
+                )
+        # simpan ke session agar bisa ditampilkan di bawah
+        st.session_state["scraped_df"] = df_scraped
+    except Exception as e:
+        st.sidebar.error(
+            f"Scraping terhenti: {e}\n\nProgres sudah tersimpan, klik lagi untuk melanjutkan."
+        )
 
 
 # ============================================================
@@ -312,6 +336,11 @@ if st.sidebar.button("Scrape sekarang"):
 # ============================================================
 if choice == "Input Teks":
     teks = st.text_area("Masukkan ulasan:", "KURIR YG RETUR PENGGUNA YG NANGGUNG APLIKASI TOLOL")
+    bundle = get_model_bundle()
+    model_app = (
+        st.selectbox("Model FastText + Bi-GRU (aplikasi)", bundle.apps, key="model_app_teks")
+        if bundle is not None else None
+    )
     if st.button("Proses"):
         st.subheader("🔧 Tahapan Pre-processing")
         st.write("**Teks asli:**", teks)
@@ -337,40 +366,187 @@ if choice == "Input Teks":
         hasil = deteksi_sentimen(teks6)
         st.success(f"Hasil Deteksi Sentimen: **{hasil}**")
 
+        if bundle is not None:
+            pred = bundle.predict_one(teks, app=model_app)
+            st.info(f"Prediksi Model FastText + Bi-GRU ({model_app}): **{pred}**")
+
 
 # ============================================================
 # MODE 2: Upload File CSV
 # ============================================================
 elif choice == "Upload File CSV":
+    FORMAT_UNDUHAN = {
+        "CSV": (".csv", "text/csv"),
+        "Parquet": (".parquet", "application/vnd.apache.parquet"),
+        "Arrow": (".arrow", "application/vnd.apache.arrow.file"),
+    }
     file = st.file_uploader("Unggah file CSV", type=["csv"])
     if file is not None:
-        df = pd.read_csv(file)
+        mode_stream = st.checkbox(
+            "Mode streaming (file besar: diproses per chunk, hasil ditulis bertahap)",
+            value=False, key="mode_stream"
+        )
+        # Mode streaming hanya membaca beberapa baris untuk pratinjau
+        if mode_stream:
+            df = pd.read_csv(file, nrows=5)
+        else:
+            with stage("csv_parse") as rec:
+                df = pd.read_csv(file)
+                rec.rows = len(df)
+        file.seek(0)
         st.subheader("📄 Data Awal")
         st.write(df.head())
 
         kolom = st.text_input("Nama kolom teks (mis: review):", "review")
+        tampil_antara = st.checkbox(
+            "Sertakan kolom antara (clean, norm, stop, token)", value=False, key="keep_intermediate"
+        )
+        buang_inggris = st.checkbox(
+            "Buang ulasan berbahasa Inggris", value=False, key="drop_english"
+        )
+        pakai_dedup = st.checkbox(
+            "Proses sekali per ulasan duplikat / hampir sama (MinHash/LSH)", value=False,
+            key="pakai_dedup", disabled=tampil_antara,
+            help="Hasil perwakilan klaster disalin ke anggotanya; menambah kolom dup_cluster & dup_size."
+        ) and not tampil_antara
+        n_worker = st.number_input(
+            "Jumlah worker (proses paralel, 1 = serial)",
+            min_value=1, max_value=os.cpu_count() or 1,
+            value=min(default_workers(), os.cpu_count() or 1), step=1, key="n_worker"
+        )
+        bundle = get_model_bundle()
+        model_app = None
+        if bundle is not None and st.checkbox("Tambahkan prediksi model FastText + Bi-GRU", key="pakai_model"):
+            model_app = st.selectbox("Model aplikasi", bundle.apps, key="model_app_csv")
+        # Parquet/Arrow: kolom label sebagai kategori, token sebagai list → file lebih kecil & cepat dibaca
+        format_unduh = st.selectbox("Format file hasil", list(FORMAT_UNDUHAN), key="format_unduh")
+        ext, mime = FORMAT_UNDUHAN[format_unduh]
         if st.button("Proses CSV"):
             if kolom not in df.columns:
                 st.error(f"Kolom '{kolom}' tidak ditemukan.")
+            elif mode_stream:
+                # Hasil ditulis ke file sementara; file lama sesi ini dihapus
+                old_out = st.session_state.pop("stream_out", None)
+                if old_out and os.path.exists(old_out):
+                    os.remove(old_out)
+                fd, out_path = tempfile.mkstemp(prefix="sentinex_", suffix=ext)
+                os.close(fd)
+                st.session_state["stream_out"] = out_path
+
+                bar = st.progress(0.0, text="Memproses chunk…")
+                info = process_csv_stream(
+                    file, kolom, out_path,
+                    workers=int(n_worker),
+                    keep_intermediate=tampil_antara,
+                    model_app=model_app,
+                    drop_english=buang_inggris,
+                    dedup=get_dedup_index() if pakai_dedup else None,
+                    on_chunk=lambda i, n, rows: bar.progress(
+                        min(i / n, 1.0), text=f"Chunk {i}/{n} — {rows} baris"
+                    ),
+                )
+                bar.progress(1.0, text=f"Selesai: {info['rows']} baris, {info['chunks']} chunk "
+                                       f"({info['seconds']:.1f} detik)")
+                if buang_inggris:
+                    st.caption(f"Ulasan berbahasa Inggris dibuang: {info['dropped_english']}")
+                if pakai_dedup:
+                    get_dedup_index().save()
+                    show_dedup_stats(get_dedup_index(), info["dedup_skipped"], info["rows"])
+                get_stemmer().save()
+
+                st.subheader("✅ Hasil Deteksi Sentimen")
+                tampil = [kolom, "stem", "sentimen"] + (["prediksi_model"] if model_app else [])
+                if info["rows"] == 0:
+                    st.warning("Tidak ada baris yang diproses (file kosong atau semua baris terfilter).")
+                else:
+                    st.write(read_frame(out_path, columns=tampil, nrows=15))
+
+                with open(out_path, "rb") as f_out:
+                    st.download_button(
+                        f"💾 Download Hasil {format_unduh}",
+                        f_out,
+                        f"hasil_sentimen{ext}",
+                        mime
+                    )
             else:
-                df["clean"]  = df[kolom].astype(str).apply(cleaning).str.lower()
-                df["norm"]   = df["clean"].apply(lambda x: normalisasi(" " + x + " "))
-                df["stop"]   = df["norm"].apply(stopword)
-                df["token"]  = df["stop"].apply(lambda x: x.split())
-                df["stem"]   = df["token"].apply(stemming)
-                df["sentimen"] = df["stem"].apply(deteksi_sentimen)
+                if buang_inggris:
+                    with stage("langfilter", rows=len(df)):
+                        df, df_en = split_english(df, kolom, workers=int(n_worker))
+                    st.caption(f"Ulasan berbahasa Inggris dibuang: {len(df_en)}")
+                if pakai_dedup:
+                    hasil_df, dedup_info = preprocess_dedup(df[kolom], get_dedup_index(),
+                                                            workers=int(n_worker))
+                    get_dedup_index().save()
+                    show_dedup_stats(get_dedup_index(), dedup_info["skipped"], dedup_info["rows"])
+                else:
+                    hasil_df = preprocess_cached(
+                        df[kolom], workers=int(n_worker), keep_intermediate=tampil_antara
+                    )
+                df = df.drop(columns=hasil_df.columns, errors="ignore").join(hasil_df)
+                if model_app is not None:
+                    with stage("model_predict", rows=len(df)):
+                        df["prediksi_model"] = bundle.predict(df[kolom].astype(str), app=model_app)
+
+                # simpan cache stem agar run berikutnya tidak mengulang
+                stemmer_svc = get_stemmer()
+                stemmer_svc.save()
+                st_stats = stemmer_svc.stats()
+                st.caption(
+                    f"Cache stemming: {st_stats['hits']} hit / {st_stats['misses']} miss "
+                    f"(hit rate {st_stats['hit_rate']:.1%}, {st_stats['size']} kata)"
+                )
+                rc_stats = get_result_cache().stats()
+                st.caption(
+                    f"Cache hasil: {rc_stats['hits']} teks dari cache / {rc_stats['misses']} diproses "
+                    f"({rc_stats['entries']} entri, {rc_stats['bytes'] / 1e6:.1f} MB)"
+                )
 
                 st.subheader("✅ Hasil Deteksi Sentimen")
-                st.write(df[[kolom, "stem", "sentimen"]].head(15))
+                tampil = [kolom, "stem", "sentimen"] + (["prediksi_model"] if model_app else [])
+                st.write(df[tampil].head(15))
 
+                with stage("csv_encode" if ext == ".csv" else "columnar_encode", rows=len(df)):
+                    out_bytes = frame_bytes(df, ext.lstrip("."))
                 st.download_button(
-                    "💾 Download Hasil CSV",
-                    df.to_csv(index=False).encode("utf-8"),
-                    "hasil_sentimen.csv",
-                    "text/csv"
+                    f"💾 Download Hasil {format_unduh}",
+                    out_bytes,
+                    f"hasil_sentimen{ext}",
+                    mime
                 )
 
 
+# ============================================================
+# Rincian waktu per tahap (instrumentasi pipeline)
+# ============================================================
+def render_metrics_panel() -> None:
+    """Panel lipat berisi waktu, baris, memori per tahap + statistik cache."""
+    metrics = get_metrics()
+    snap = metrics.snapshot()
+    with st.expander("⏱️ Rincian waktu per tahap pipeline", expanded=False):
+        if not snap:
+            st.caption("Belum ada tahap yang tercatat. Jalankan scraping atau Proses CSV.")
+            return
+        tabel = pd.DataFrame.from_dict(snap, orient="index")
+        tabel["rss_delta_mb"] = tabel["rss_delta"] / 2**20
+        st.dataframe(
+            tabel[["calls", "rows", "seconds", "max_seconds", "rows_per_s", "rss_delta_mb"]]
+            .rename_axis("tahap").round(3),
+            use_container_width=True,
+        )
+        st.caption("Waktu tahap yang berjalan di worker paralel adalah total waktu semua worker.")
+        st.dataframe(pd.DataFrame.from_dict(cache_stats(), orient="index").rename_axis("cache"),
+                     use_container_width=True)
+        c1, c2 = st.columns(2)
+        c1.download_button("📈 Unduh metrik (Prometheus)", metrics.to_prometheus(),
+                           "sentinex_metrics.prom", "text/plain")
+        if c2.button("Reset metrik"):
+            metrics.reset()
+            st.rerun()
+
+
+render_metrics_panel()
+
+
 # ============================================================
 # OUTPUT LAPORAN: TABEL EVALUASI → GRAFIK & TABEL DISTRIBUSI
 # ============================================================
@@ -380,16 +556,24 @@ st.header("📑 Hasil Akhir: Evaluasi Model & Distribusi Sentimen")
 # ---------- A) Tabel Evaluasi ----------
 st.subheader("A. Tabel Evaluasi (Accuracy, Precision, Recall, F1)")
 eval_file = st.file_uploader(
-    "Unggah file rekap evaluasi (opsional, default: /content/rekap_4_aplikasi.csv)",
-    type=["csv"],
+    "Unggah file rekap evaluasi atau log prediksi BUKTI_PREDIKSI_ALL "
+    "(opsional, default: /content/rekap_4_aplikasi.csv)",
+    type=["csv", "parquet", "arrow", "feather"],
     key="eval_uploader"
 )
 eval_path_default = "/content/rekap_4_aplikasi.csv"
 eval_df = None
 
 try:
-    if eval_file is not None:
-        eval_df = pd.read_csv(eval_file)
+    if eval_file is not None and {"aplikasi", "true", "pred"} <= set(peek(eval_file, nrows=1).columns):
+        # log prediksi per baris → metrik dihitung ulang secara streaming
+        with stage("aggregate") as rec:
+            eval_agg = evaluate_predictions([eval_file])
+            eval_df = eval_agg.recap_table()
+            rec.rows = eval_agg.counter.rows
+        st.dataframe(eval_agg.status_table(), use_container_width=True)
+    elif eval_file is not None:
+        eval_df = read_frame(eval_file)
     elif os.path.exists(eval_path_default):
         eval_df = pd.read_csv(eval_path_default)
     else:
@@ -407,7 +591,7 @@ if eval_df is not None:
     st.download_button(
         "💾 Unduh Tabel Evaluasi (CSV)",
         eval_df.to_csv(index=False).encode("utf-8"),
-        "tabel_evaluasi_4_aplikasi.csv",
+        f"tabel_evaluasi_{len(eval_df)}_aplikasi.csv",
         "text/csv"
     )
     st.markdown("""
@@ -423,11 +607,12 @@ if eval_df is not None:
 
 # ---------- Distribusi Sentimen (Grafik + Tabel digabung ----------
 st.subheader("B. Tabel & Grafik Distribusi Sentimen per Aplikasi ")
-st.write("Unggah **4 file CSV** (Blibli, Tokopedia, Lazada, Shopee).")
+st.write("Unggah file berlabel **per aplikasi** (CSV / Parquet / Arrow). Nama aplikasi ditebak dari "
+         "nama file; beberapa file untuk aplikasi yang sama dijumlahkan.")
 
 files = st.file_uploader(
-    "Unggah 4 dataset (wajib):",
-    type=["csv"],
+    "Unggah dataset:",
+    type=["csv", "parquet", "arrow", "feather"],
     accept_multiple_files=True,
     key="dist_uploader_combined"
 )
@@ -448,86 +633,56 @@ def _guess_app_name(filename: str) -> str | None:
     return None
 
 
-def _detect_label_column(df: pd.DataFrame) -> str:
-    """Cari kolom label sentimen paling masuk akal."""
-    candidates = ["label", "sentiment", "kelas", "target", "y"]
-    lower_map = {c.lower(): c for c in df.columns}
-    for c in candidates:
-        if c in lower_map:
-            return lower_map[c]
-    obj_cols = [c for c in df.columns if df[c].dtype == "O"]
-    return obj_cols[-1] if obj_cols else df.columns[-1]
-
-
-required_apps = ["Blibli", "Tokopedia", "Lazada", "Shopee"]
 sent_df = None  # hasil akhir tabel distribusi
 
 if files:
-    # (1) Baca semua file
-    raw_files = []
+    # (1) Pemetaan file → aplikasi (otomatis dari nama file, manual jika tidak dikenali)
+    #     dan kolom label; hanya beberapa baris awal yang dibaca
+    sources, unknown = [], []
     for f in files:
         try:
-            df_tmp = pd.read_csv(f)
+            sample = peek(f)
         except Exception as e:
             st.error(f"Gagal membaca {f.name}: {e}")
             continue
-        raw_files.append((f.name, df_tmp))
-
-    # (2) Pemetaan otomatis (dari nama file) + manual jika perlu
-    auto_map, unknown, used = {}, [], set()
-    for fname, df_tmp in raw_files:
-        app_guess = _guess_app_name(fname)
-        if app_guess and app_guess not in used:
-            auto_map[app_guess] = df_tmp
-            used.add(app_guess)
+        app_guess = _guess_app_name(f.name)
+        if app_guess:
+            sources.append((app_guess, f, detect_label_column(sample)))
         else:
-            unknown.append((fname, df_tmp))
-
-    remaining = [a for a in required_apps if a not in auto_map]
-    if unknown and remaining:
-        st.info("Beberapa file belum terpetakan otomatis. Silakan pilih aplikasinya secara manual.")
-        manual_map = {}
-        for idx, (fname, df_tmp) in enumerate(unknown):
-            if not remaining:
-                break
-            ch = st.selectbox(
-                f"Pilih aplikasi untuk file: {fname}",
-                ["(pilih)"] + remaining,
-                key=f"map_combined_{idx}"
-            )
-            if ch != "(pilih)":
-                manual_map[ch] = df_tmp
-                remaining.remove(ch)
-        auto_map.update(manual_map)
-
-    missing = [a for a in required_apps if a not in auto_map]
-    if missing:
-        st.warning(f"Belum lengkap: {', '.join(missing)}")
-
-    # (3) Hitung distribusi bila 4 aplikasi lengkap
-    if auto_map and not missing:
-        rows = []
-        for app in required_apps:
-            df_ = auto_map[app].copy()
-            label_col = _detect_label_column(df_)
-            labels = df_[label_col].astype(str).str.strip().str.lower()
-            pos = int((labels == "positif").sum())
-            neg = int((labels == "negatif").sum())
-            neu = int((labels == "netral").sum())
-            tot = int(len(df_))
-            rows.append({"App": app, "Positif": pos, "Negatif": neg, "Netral": neu, "Total": tot})
-
-        if rows:
-            sent_df = pd.DataFrame(rows).sort_values("App").reset_index(drop=True)
-
-            # (4) Grafik batang
-            df_plot = sent_df.set_index("App")[["Positif", "Negatif", "Netral"]]
-            fig, ax = plt.subplots(figsize=(10, 6))
+            unknown.append((f, detect_label_column(sample)))
+
+    if unknown:
+        st.info("Beberapa file belum terpetakan otomatis. Isi nama aplikasinya secara manual.")
+        for idx, (f, label_col) in enumerate(unknown):
+            default = os.path.splitext(f.name)[0]
+            app_name = st.text_input(f"Nama aplikasi untuk file: {f.name}", default,
+                                     key=f"map_combined_{idx}").strip()
+            sources.append((app_name or default, f, label_col))
+
+    # (2) Hitung distribusi: satu lintasan per file, dibaca per chunk
+    hitung_klaster = st.checkbox(
+        "Hitung sekali per klaster duplikat (file dengan kolom dup_cluster)", value=False,
+        key="dist_dedup"
+    )
+
+    if sources:
+        with stage("aggregate") as rec:
+            sent_df = label_distribution(sources, dedup_col="dup_cluster" if hitung_klaster else None)
+            rec.rows = int(sent_df["Total"].sum())
+
+        if not sent_df.empty:
+            label_cols = [c for c in sent_df.columns if c not in ("App", "Total")]
+
+            # (3) Grafik batang
+            df_plot = sent_df.set_index("App")[label_cols]
+            import matplotlib.pyplot as plt  # hanya dimuat bila grafik benar-benar digambar
+
+            fig, ax = plt.subplots(figsize=(max(10, 2 * len(df_plot)), 6))
             df_plot.plot(kind="bar", ax=ax)
             ax.set_title("Distribusi Sentimen Tiap Aplikasi E-Commerce", fontsize=14, weight="bold")
             ax.set_xlabel("Aplikasi", fontsize=12)
             ax.set_ylabel("Jumlah Ulasan", fontsize=12)
-            ax.set_ylim(0, 500)  # batas y default (0–500)
+            ax.set_ylim(0, max(int(df_plot.to_numpy().max()), 1) * 1.1)  # ruang untuk label angka
             ax.grid(axis="y", linestyle="--", alpha=0.7)
             ax.legend(title="Kategori Sentimen")
 
@@ -540,17 +695,17 @@ if files:
                 )
             st.pyplot(fig)
 
-            # (5) Tabel + tombol unduh
+            # (4) Tabel + tombol unduh
             st.subheader("Tabel Distribusi Sentimen per Aplikasi")
-            st.dataframe(sent_df[["App", "Positif", "Negatif", "Netral", "Total"]], use_container_width=True)
+            st.dataframe(sent_df, use_container_width=True)
             st.download_button(
                 "💾 Unduh Tabel Distribusi (CSV)",
                 sent_df.to_csv(index=False).encode("utf-8"),
-                "tabel_distribusi_sentimen_4_aplikasi.csv",
+                f"tabel_distribusi_sentimen_{len(sent_df)}_aplikasi.csv",
                 "text/csv"
             )
 
-            # (6) Catatan ringkas
+            # (5) Catatan ringkas
     st.markdown("""
 **Penjelasan singkat:**
 - Shopee memiliki ulasan positif tertinggi (341), dengan negatif (99) dan netral (60), menunjukkan mayoritas pengguna merasa puas dengan aplikasi ini.
@@ -564,7 +719,7 @@ if files:
     - Netral tertinggi juga terdapat pada Tokopedia.
 """)
 else:
-    st.info("Unggah 4 dataset untuk menampilkan tabel distribusi dan penjelasannya.")
+    st.info("Unggah dataset untuk menampilkan tabel distribusi dan penjelasannya.")
 
 
 # ============================================================
@@ -0,0 +1,41 @@
+"""
+SENTINEX — pipeline pre-processing & deteksi sentimen ulasan e-commerce.
+
+Paket ini sengaja tidak mengimpor streamlit/matplotlib agar bisa dipakai
+dari app.py maupun dari skrip batch (`python -m sentinex --help`).
+Nama-nama di bawah diimpor saat pertama kali diakses, sehingga
+`import sentinex.metrics` / `sentinex.config` tidak ikut memuat pandas
+dan Sastrawi.
+
+Fungsi `preprocessing.stemming` sengaja tidak diekspor di sini: namanya
+sama dengan submodul `sentinex.stemming`, dan menimpanya sebagai atribut
+paket membuat `from . import stemming` mendapat fungsi, bukan modul.
+"""
+import importlib
+
+_EXPORTS = {
+    "cleaning": "preprocessing",
+    "normalisasi": "preprocessing",
+    "stopword": "preprocessing",
+    "preprocess_batch": "preprocessing",
+    "deteksi_sentimen": "sentiment",
+    "preprocess_parallel": "parallel",
+    "preprocess_cached": "cache",
+    "StemmerService": "stemming",
+    "get_stemmer": "stemming",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'sentinex' has no attribute '{name}'")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,386 @@
+"""
+Agregasi streaming untuk laporan: distribusi label dan evaluasi prediksi.
+
+Semua sumber (CSV / Parquet / Arrow, satu atau banyak file) dibaca per
+chunk, hanya kolom yang dibutuhkan. Tiap chunk dihitung secara vektor:
+kolom kunci diubah ke kategori, normalisasi teks (strip + lower) hanya
+dilakukan pada daftar kategori (bukan tiap baris), lalu kombinasi kode
+dihitung sekaligus dengan `np.bincount`. Memori sebanding ukuran chunk
++ jumlah kombinasi unik, bukan jumlah baris.
+
+- `label_distribution`: jumlah Positif/Negatif/Netral per aplikasi
+  (jumlah aplikasi bebas; beberapa file boleh untuk aplikasi yang sama).
+- `EvalAggregator` / `evaluate_predictions`: dari log prediksi
+  (kolom aplikasi, fold, true, pred — format BUKTI_PREDIKSI_ALL):
+  rekap BENAR/SALAH per aplikasi, pola kesalahan true → pred, confusion
+  matrix dan accuracy + macro precision/recall/F1 per aplikasi & fold.
+
+Contoh:
+    python -m sentinex.aggregate distribusi "3. Hasil Dari Pre-Processing/*.csv"
+    python -m sentinex.aggregate evaluasi BUKTI_PREDIKSI_ALL.csv -o rekap/
+"""
+import argparse
+import glob
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from .columnar import format_of, read_frame, require_pyarrow
+
+DEFAULT_CHUNK_ROWS = 200_000
+LABEL_ORDER = ("positif", "negatif", "netral")
+LABEL_CANDIDATES = ("label", "sentiment", "sentimen", "kelas", "target", "y")
+APP_ORDER = ("Tokopedia", "Shopee", "Lazada", "Blibli")  # urutan aplikasi di notebook (CELL 7/10)
+
+
+# ============================================================
+# Pembacaan per chunk
+# ============================================================
+def iter_chunks(src, columns=None, chunksize: int = DEFAULT_CHUNK_ROWS):
+    """DataFrame per chunk dari CSV / Parquet / Arrow (path atau file upload)."""
+    fmt = format_of(getattr(src, "name", src))
+    if fmt == "csv":
+        # kolom kunci dibaca sebagai kategori: parsing langsung ke kode
+        dtype = {c: "category" for c in columns} if columns else None
+        yield from pd.read_csv(src, usecols=columns, dtype=dtype, chunksize=chunksize)
+        return
+    pa = require_pyarrow()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(src).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+        return
+    if isinstance(src, (str, os.PathLike)):
+        src = pa.memory_map(str(src))
+    reader = pa.ipc.open_file(src)
+    for i in range(reader.num_record_batches):
+        batch = reader.get_batch(i)
+        if columns is not None:
+            batch = batch.select(columns)
+        yield batch.to_pandas()
+
+
+def peek(src, nrows: int = 50) -> pd.DataFrame:
+    """Beberapa baris awal (untuk nama kolom / tebak kolom label) tanpa membaca seluruh file."""
+    df = read_frame(src, nrows=nrows)
+    if hasattr(src, "seek"):
+        src.seek(0)
+    return df
+
+
+def detect_label_column(df: pd.DataFrame) -> str:
+    """Cari kolom label sentimen paling masuk akal."""
+    lower_map = {str(c).lower(): c for c in df.columns}
+    for c in LABEL_CANDIDATES:
+        if c in lower_map:
+            return lower_map[c]
+    obj_cols = [c for c in df.columns if df[c].dtype == "O" or pd.api.types.is_string_dtype(df[c])]
+    return obj_cols[-1] if obj_cols else df.columns[-1]
+
+
+def app_order(apps) -> list:
+    """Aplikasi urut seperti notebook (APP_ORDER), aplikasi lain menyusul urut nama."""
+    apps = [a for a in dict.fromkeys(apps) if pd.notna(a)]
+    known = [a for a in APP_ORDER if a in apps]
+    return known + sorted(a for a in apps if a not in APP_ORDER)
+
+
+# ============================================================
+# Penghitung kombinasi kategori
+# ============================================================
+def _codes(series: pd.Series, normalize: bool) -> tuple[np.ndarray, list]:
+    """(kode per baris, daftar nilai); NaN → kode terakhir dengan nilai None."""
+    cat = series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype("category")
+    values = cat.cat.categories
+    if normalize:
+        values = pd.Index(values.astype(str)).str.strip().str.lower()
+    remap, uniques = pd.factorize(values)
+    codes = cat.cat.codes.to_numpy()
+    missing = codes < 0
+    codes = remap[codes] if len(remap) else codes.copy()
+    codes[missing] = len(uniques)
+    return codes, list(uniques) + [None]
+
+
+class GroupCounter:
+    """Hitung jumlah baris per kombinasi nilai beberapa kolom, lintas chunk."""
+
+    def __init__(self, keys, normalize=()):
+        self.keys = list(keys)
+        self.normalize = set(normalize)
+        self.counts: dict[tuple, int] = {}
+        self.rows = 0
+
+    def update(self, df: pd.DataFrame, fixed: dict | None = None) -> None:
+        """Tambahkan satu chunk; `fixed` mengisi kunci bernilai konstan (mis. nama aplikasi)."""
+        fixed = fixed or {}
+        cols = [k for k in self.keys if k not in fixed]
+        if not len(df):
+            return
+        codes, values = [], []
+        for k in cols:
+            c, v = _codes(df[k], k in self.normalize)
+            codes.append(c)
+            values.append(v)
+        dims = tuple(len(v) for v in values)
+        counts = np.bincount(np.ravel_multi_index(codes, dims), minlength=int(np.prod(dims)))
+        nz = np.flatnonzero(counts)
+        idx = np.unravel_index(nz, dims)
+        for j, n in enumerate(counts[nz]):
+            part = {k: values[i][idx[i][j]] for i, k in enumerate(cols)}
+            part.update(fixed)
+            key = tuple(part[k] for k in self.keys)
+            self.counts[key] = self.counts.get(key, 0) + int(n)
+        self.rows += len(df)
+
+    def merge(self, other: "GroupCounter") -> None:
+        for key, n in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + n
+        self.rows += other.rows
+
+    def to_series(self) -> pd.Series:
+        if not self.counts:
+            return pd.Series(dtype="int64", index=pd.MultiIndex.from_tuples([], names=self.keys))
+        index = pd.MultiIndex.from_tuples(list(self.counts), names=self.keys)
+        return pd.Series(list(self.counts.values()), index=index, dtype="int64").sort_index()
+
+
+# ============================================================
+# Distribusi label per aplikasi
+# ============================================================
+def label_distribution(sources, chunksize: int = DEFAULT_CHUNK_ROWS,
+                       dedup_col: str | None = None) -> pd.DataFrame:
+    """
+    sources: iterable (nama_aplikasi, file, kolom_label atau None).
+    Kembalikan tabel App | Positif | Negatif | Netral | (label lain) | Total,
+    satu baris per aplikasi (urut nama). Label dinormalisasi strip + lower.
+    dedup_col (mis. "dup_cluster" dari sentinex.dedup): tiap klaster hanya
+    dihitung sekali per aplikasi; file tanpa kolom itu dihitung biasa.
+    """
+    counter = GroupCounter(["app", "label"], normalize={"label"})
+    seen: dict[str, set] = {}
+    for app, src, label_col in sources:
+        sample = peek(src)
+        if label_col is None:
+            label_col = detect_label_column(sample)
+        key = dedup_col if dedup_col in sample.columns else None
+        for chunk in iter_chunks(src, [label_col] + ([key] if key else []), chunksize):
+            if key:
+                # baris tanpa klaster (disimpan saat dedup mati) dihitung satu per satu
+                done = seen.setdefault(app, set())
+                ids = pd.to_numeric(chunk[key], errors="coerce")
+                first = ids.notna() & ~ids.duplicated() & ~ids.isin(done)
+                done.update(ids[first].astype("int64").tolist())
+                chunk = chunk[ids.isna() | first]
+            counter.update(chunk.rename(columns={label_col: "label"}), fixed={"app": app})
+        if hasattr(src, "seek"):
+            src.seek(0)
+
+    s = counter.to_series()
+    if s.empty:
+        return pd.DataFrame(columns=["App", *(lab.capitalize() for lab in LABEL_ORDER), "Total"])
+    table = s.unstack("label", fill_value=0)
+    extra = sorted(c for c in table.columns if c not in LABEL_ORDER and pd.notna(c))
+    table = table.reindex(columns=[*LABEL_ORDER, *extra], fill_value=0)
+    table.columns = [str(c).capitalize() for c in table.columns]
+    table["Total"] = s.groupby(level="app").sum()
+    return table.rename_axis("App").reset_index().sort_values("App").reset_index(drop=True)
+
+
+# ============================================================
+# Evaluasi dari log prediksi
+# ============================================================
+def macro_scores(cm: np.ndarray) -> dict:
+    """Accuracy + macro precision/recall/F1 dari confusion matrix (zero_division=0, seperti sklearn)."""
+    cm = np.asarray(cm, dtype=np.float64)
+    tp = np.diag(cm)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.nan_to_num(tp / cm.sum(axis=0))
+        recall = np.nan_to_num(tp / cm.sum(axis=1))
+        f1 = np.nan_to_num(2 * precision * recall / (precision + recall))
+    total = cm.sum()
+    return {
+        "accuracy": float(tp.sum() / total) if total else 0.0,
+        "precision_macro": float(precision.mean()) if len(tp) else 0.0,
+        "recall_macro": float(recall.mean()) if len(tp) else 0.0,
+        "f1_macro": float(f1.mean()) if len(tp) else 0.0,
+    }
+
+
+class EvalAggregator:
+    """
+    Akumulator evaluasi satu lintasan atas log prediksi berkolom
+    aplikasi, fold (opsional), true, pred. Status BENAR/SALAH diturunkan
+    dari true == pred (sama dengan cara kolom `status` dibuat di training).
+    """
+
+    def __init__(self, app_col: str = "aplikasi", true_col: str = "true",
+                 pred_col: str = "pred", fold_col: str | None = "fold"):
+        self.app_col, self.true_col, self.pred_col, self.fold_col = app_col, true_col, pred_col, fold_col
+        keys = ["aplikasi", "fold", "true", "pred"] if fold_col else ["aplikasi", "true", "pred"]
+        self.counter = GroupCounter(keys)
+
+    @property
+    def columns(self) -> list[str]:
+        cols = [self.app_col, self.true_col, self.pred_col]
+        return cols + [self.fold_col] if self.fold_col else cols
+
+    def update(self, df: pd.DataFrame) -> None:
+        rename = {self.app_col: "aplikasi", self.true_col: "true", self.pred_col: "pred"}
+        if self.fold_col:
+            rename[self.fold_col] = "fold"
+        self.counter.update(df.rename(columns=rename))
+
+    def add_source(self, src, chunksize: int = DEFAULT_CHUNK_ROWS) -> None:
+        for chunk in iter_chunks(src, self.columns, chunksize):
+            self.update(chunk)
+
+    # ---------- hasil ----------
+    def _counts(self) -> pd.DataFrame:
+        df = self.counter.to_series().rename("jumlah").reset_index()
+        if "fold" in df.columns:
+            # dari CSV fold terbaca sebagai kategori teks
+            df["fold"] = pd.to_numeric(df["fold"], errors="coerce").astype("Int64")
+        return df
+
+    def status_table(self) -> pd.DataFrame:
+        """aplikasi | BENAR | SALAH | total (format REKAP_BENAR_SALAH_PER_APLIKASI)."""
+        df = self._counts()
+        df["status"] = np.where(df["true"] == df["pred"], "BENAR", "SALAH")
+        out = df.pivot_table(index="aplikasi", columns="status", values="jumlah",
+                             aggfunc="sum", fill_value=0)
+        out = out.reindex(columns=["BENAR", "SALAH"], fill_value=0)
+        out["total"] = out["BENAR"] + out["SALAH"]
+        out.columns.name = None
+        return out.reset_index()
+
+    def error_table(self) -> pd.DataFrame:
+        """
+        true | pred | jumlah | aplikasi (REKAP_ERROR_TRUE_TO_PRED): aplikasi
+        urut `app_order`, di dalamnya urut jumlah terbesar, sama dengan CELL 10.
+        """
+        df = self._counts()
+        df = df[df["true"] != df["pred"]]
+        out = df.groupby(["aplikasi", "true", "pred"], as_index=False)["jumlah"].sum()
+        parts = [out[out["aplikasi"] == app].sort_values("jumlah", ascending=False)
+                 for app in app_order(out["aplikasi"])]
+        if not parts:
+            return pd.DataFrame(columns=["true", "pred", "jumlah", "aplikasi"])
+        return pd.concat(parts)[["true", "pred", "jumlah", "aplikasi"]].reset_index(drop=True)
+
+    def confusion_matrices(self, by_fold: bool = False) -> dict:
+        """{aplikasi: {"classes": [...], "cm": [[...]]}} (atau kunci (aplikasi, fold))."""
+        df = self._counts()
+        out = {}
+        groups = dict(list(df.groupby("aplikasi", sort=True)))
+        for app in app_order(groups):
+            sub = groups[app]
+            classes = sorted(set(sub["true"].dropna()) | set(sub["pred"].dropna()))
+            parts = sub.groupby("fold", sort=True) if by_fold else [(None, sub)]
+            for fold, part in parts:
+                cm = (part.pivot_table(index="true", columns="pred", values="jumlah",
+                                       aggfunc="sum", fill_value=0)
+                      .reindex(index=classes, columns=classes, fill_value=0))
+                out[(app, int(fold)) if by_fold else app] = {
+                    "classes": classes, "cm": cm.to_numpy(dtype=np.int64).tolist()}
+        return out
+
+    def metrics_table(self, by_fold: bool = False) -> pd.DataFrame:
+        """accuracy + macro P/R/F1 per aplikasi (atau per aplikasi & fold, seperti tabel_evaluasi)."""
+        rows = []
+        for name, res in self.confusion_matrices(by_fold).items():
+            app, fold = name if by_fold else (name, None)
+            row = {"aplikasi": app, **({"fold": fold} if by_fold else {})}
+            row.update(macro_scores(np.array(res["cm"])))
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    def recap_table(self) -> pd.DataFrame:
+        """
+        App | Accuracy | Precision | Recall | F1 (format rekap_4_aplikasi, urut `app_order`):
+        rata-rata metrik per fold bila ada kolom fold, selain itu dari seluruh prediksi.
+        """
+        if self.fold_col:
+            df = self.metrics_table(by_fold=True).drop(columns="fold")
+            df = df.groupby("aplikasi", as_index=False, sort=False).mean()
+        else:
+            df = self.metrics_table()
+        return df.rename(columns={"aplikasi": "App", "accuracy": "Accuracy", "precision_macro": "Precision",
+                                  "recall_macro": "Recall", "f1_macro": "F1"})
+
+
+def evaluate_predictions(sources, chunksize: int = DEFAULT_CHUNK_ROWS, **columns) -> EvalAggregator:
+    """Agregasi satu atau banyak file log prediksi dalam satu lintasan."""
+    agg = EvalAggregator(**columns)
+    if agg.fold_col and agg.fold_col not in peek(sources[0], nrows=1).columns:
+        agg = EvalAggregator(**{**columns, "fold_col": None})
+    for src in sources:
+        agg.add_source(src, chunksize)
+    return agg
+
+
+# ============================================================
+# CLI
+# ============================================================
+def _expand(patterns) -> list[str]:
+    return [p for pattern in patterns for p in (sorted(glob.glob(pattern)) or [pattern])]
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m sentinex.aggregate",
+                                 description="Agregasi distribusi sentimen & evaluasi prediksi (streaming).")
+    sub = ap.add_subparsers(dest="mode", required=True)
+
+    d = sub.add_parser("distribusi", help="jumlah label sentimen per aplikasi")
+    d.add_argument("inputs", nargs="+", help="file / pola glob; APP=path untuk menamai aplikasi")
+    d.add_argument("--label-col", help="nama kolom label (default: tebak otomatis)")
+    d.add_argument("--dedup-col", help="hitung sekali per klaster di kolom ini (mis. dup_cluster)")
+    d.add_argument("-o", "--output", help="simpan tabel ke CSV ini")
+
+    e = sub.add_parser("evaluasi", help="rekap BENAR/SALAH, error true→pred, confusion matrix, macro P/R/F1")
+    e.add_argument("inputs", nargs="+", help="file log prediksi (BUKTI_PREDIKSI_ALL)")
+    e.add_argument("-o", "--out-dir", help="tulis REKAP_*.csv, confusion matrix & metrik ke folder ini")
+
+    for p in (d, e):
+        p.add_argument("--chunksize", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    if args.mode == "distribusi":
+        sources = []
+        for item in args.inputs:
+            app, sep, pattern = item.partition("=")
+            for path in _expand([pattern if sep else item]):
+                name = app if sep else os.path.splitext(os.path.basename(path))[0]
+                sources.append((name, path, args.label_col))
+        table = label_distribution(sources, args.chunksize, args.dedup_col)
+        print(table.to_string(index=False))
+        if args.output:
+            table.to_csv(args.output, index=False)
+    else:
+        agg = evaluate_predictions(_expand(args.inputs), args.chunksize)
+        status, errors, recap = agg.status_table(), agg.error_table(), agg.recap_table()
+        print(status.to_string(index=False))
+        print()
+        print(recap.round(4).to_string(index=False))
+        if args.out_dir:
+            os.makedirs(args.out_dir, exist_ok=True)
+            status.to_csv(os.path.join(args.out_dir, "REKAP_BENAR_SALAH_PER_APLIKASI.csv"), index=False)
+            errors.to_csv(os.path.join(args.out_dir, "REKAP_ERROR_TRUE_TO_PRED.csv"), index=False)
+            recap.round(4).to_csv(os.path.join(args.out_dir, "rekap_aplikasi.csv"), index=False)
+            if agg.fold_col:
+                agg.metrics_table(by_fold=True).to_csv(
+                    os.path.join(args.out_dir, "tabel_evaluasi_per_fold.csv"), index=False, float_format="%.4f")
+            with open(os.path.join(args.out_dir, "confusion_matrix_sum.json"), "w") as f:
+                json.dump({app: {"classes": r["classes"], "cm_sum": r["cm"]}
+                           for app, r in agg.confusion_matrices().items()}, f, ensure_ascii=False, indent=2)
+    print(f"\n({time.perf_counter() - t0:.2f} detik)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
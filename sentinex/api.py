@@ -0,0 +1,324 @@
+"""
+HTTP API lokal SENTINEX (asyncio, tanpa dependensi tambahan).
+
+Endpoint (JSON):
+    POST /preprocess        {"text": "..."}    → clean, norm, stop, token, stem, sentimen
+    POST /sentiment         {"text": "..."}    → stem, sentimen
+    POST /sentiment/batch   {"texts": [...]}   → results: [{stem, sentimen}, ...]
+    GET  /health                               → status & panjang antrean
+    GET  /metrics                              → metrik teks Prometheus
+
+Permintaan satu teks yang datang bersamaan digabung (coalescing) menjadi
+micro-batch (maks. `max_batch` teks atau `max_wait_ms`), lalu dijalankan
+di worker pool lewat `preprocess_cached`. Jumlah batch yang berjalan
+dibatasi jumlah worker; bila antrean penuh, server membalas 503 dengan
+header Retry-After (backpressure). Setiap respons berisi `timings`
+(queue_ms, process_ms, total_ms, batch_size).
+
+Contoh:
+    python -m sentinex.api --port 8000 --workers 2
+    python -m sentinex.loadgen --url http://127.0.0.1:8000 -c 64 -n 5000
+"""
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from .cache import preprocess_cached
+from .metrics import get_metrics
+from .parallel import default_workers, get_pool, shutdown_pools
+from .stemming import get_stemmer
+
+DEFAULT_MAX_BATCH = 64
+DEFAULT_MAX_WAIT_MS = 5.0
+DEFAULT_QUEUE_LIMIT = 2048
+MAX_BATCH_TEXTS = 10_000          # batas /sentiment/batch per permintaan
+MAX_BODY_BYTES = 8 * 1024 * 1024
+INTERMEDIATE_COLS = ["clean", "norm", "stop", "token"]
+
+
+class QueueFull(Exception):
+    """Antrean coalescing penuh (dibalas 503)."""
+
+
+# ============================================================
+# Eksekusi batch (di worker process atau thread)
+# ============================================================
+def run_batch(texts: list[str], keep_intermediate: bool, remote: bool) -> tuple[list[dict], dict, list]:
+    """
+    Jalankan pipeline untuk satu batch; kembalikan hasil per teks dan, bila
+    dijalankan di worker process (`remote`), metrik tahap serta entri cache
+    stem baru worker tersebut.
+    """
+    df = preprocess_cached(texts, workers=1, keep_intermediate=keep_intermediate)
+    cols = (INTERMEDIATE_COLS if keep_intermediate else []) + ["stem", "sentimen"]
+    records = df[cols].to_dict("records")
+    if not remote:
+        return records, {}, []
+    return records, get_metrics().drain(), get_stemmer().drain_new()
+
+
+class Coalescer:
+    """Antrean permintaan satu teks → micro-batch → executor."""
+
+    def __init__(self, executor, workers: int, keep_intermediate: bool,
+                 max_batch: int = DEFAULT_MAX_BATCH, max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+                 queue_limit: int = DEFAULT_QUEUE_LIMIT):
+        self.executor = executor
+        self.remote = not isinstance(executor, ThreadPoolExecutor)
+        self.keep_intermediate = keep_intermediate
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_limit)
+        self.slots = asyncio.Semaphore(workers)   # batch yang sedang berjalan
+        self.batches = 0
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    async def submit(self, text: str) -> tuple[dict, dict]:
+        """Masukkan satu teks; tunggu (hasil, timings). QueueFull bila antrean penuh."""
+        fut = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((text, fut, time.perf_counter()))
+        except asyncio.QueueFull:
+            raise QueueFull from None
+        return await fut
+
+    async def run(self, texts: list[str]) -> tuple[list[dict], float]:
+        """Jalankan satu batch langsung (dipakai /sentiment/batch); kembalikan (hasil, detik)."""
+        async with self.slots:
+            return await self._execute(texts)
+
+    async def _execute(self, texts: list[str]) -> tuple[list[dict], float]:
+        t0 = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        records, worker_metrics, stems = await loop.run_in_executor(
+            self.executor, run_batch, texts, self.keep_intermediate, self.remote
+        )
+        get_metrics().merge(worker_metrics)
+        if stems:
+            get_stemmer().merge(stems)
+        self.batches += 1
+        return records, time.perf_counter() - t0
+
+    async def _loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self.queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self.slots.acquire()
+            asyncio.create_task(self._dispatch(batch))
+
+    async def _dispatch(self, batch: list) -> None:
+        start = time.perf_counter()
+        try:
+            records, seconds = await self._execute([text for text, _, _ in batch])
+        except Exception as e:  # gagal satu batch → semua permintaan di batch gagal
+            for _, fut, _ in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        finally:
+            self.slots.release()
+        for (_, fut, t_in), rec in zip(batch, records):
+            if not fut.done():
+                fut.set_result((rec, {
+                    "queue_ms": round((start - t_in) * 1000, 3),
+                    "process_ms": round(seconds * 1000, 3),
+                    "batch_size": len(batch),
+                }))
+
+
+# ============================================================
+# Server HTTP/1.1 minimal (keep-alive, JSON)
+# ============================================================
+class SentimentServer:
+    def __init__(self, workers: int = 1, max_batch: int = DEFAULT_MAX_BATCH,
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS, queue_limit: int = DEFAULT_QUEUE_LIMIT):
+        self.workers = max(1, int(workers))
+        # 1 worker: thread di proses ini (tanpa biaya spawn); >1: process pool bersama
+        self.executor = (ThreadPoolExecutor(max_workers=1, thread_name_prefix="sentinex-api")
+                         if self.workers == 1 else get_pool(self.workers))
+        opts = dict(max_batch=max_batch, max_wait_ms=max_wait_ms, queue_limit=queue_limit)
+        self.sentiment = Coalescer(self.executor, self.workers, False, **opts)
+        self.preprocess = Coalescer(self.executor, self.workers, True, **opts)
+        self.requests = 0
+        self.rejected = 0
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8000) -> asyncio.AbstractServer:
+        self.sentiment.start()
+        self.preprocess.start()
+        return await asyncio.start_server(self._handle, host, port, limit=MAX_BODY_BYTES)
+
+    async def close(self) -> None:
+        await self.sentiment.stop()
+        await self.preprocess.stop()
+        if isinstance(self.executor, ThreadPoolExecutor):
+            self.executor.shutdown(wait=False)
+
+    # ------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------
+    async def dispatch(self, method: str, path: str, body: bytes) -> tuple[int, object, dict]:
+        """(status, payload JSON / teks, header tambahan)."""
+        if method == "GET" and path == "/health":
+            return 200, {
+                "status": "ok",
+                "workers": self.workers,
+                "queue": self.sentiment.queue.qsize() + self.preprocess.queue.qsize(),
+                "batches": self.sentiment.batches + self.preprocess.batches,
+                "requests": self.requests,
+                "rejected": self.rejected,
+            }, {}
+        if method == "GET" and path == "/metrics":
+            return 200, get_metrics().to_prometheus(), {}
+        if path not in ("/preprocess", "/sentiment", "/sentiment/batch"):
+            return 404, {"error": f"endpoint {path} tidak ada"}, {}
+        if method != "POST":
+            return 405, {"error": "gunakan POST"}, {"Allow": "POST"}
+
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"error": "body harus JSON"}, {}
+        t0 = time.perf_counter()
+        try:
+            if path == "/sentiment/batch":
+                texts = payload.get("texts") if isinstance(payload, dict) else None
+                if not isinstance(texts, list):
+                    return 400, {"error": "field 'texts' (list) wajib"}, {}
+                if len(texts) > MAX_BATCH_TEXTS:
+                    return 413, {"error": f"maksimal {MAX_BATCH_TEXTS} teks per permintaan"}, {}
+                results, seconds = await self.sentiment.run([str(t) for t in texts])
+                timings = {"queue_ms": 0.0, "process_ms": round(seconds * 1000, 3),
+                           "batch_size": len(texts)}
+                out = {"results": results}
+            else:
+                text = payload.get("text") if isinstance(payload, dict) else None
+                if not isinstance(text, str):
+                    return 400, {"error": "field 'text' (string) wajib"}, {}
+                co = self.preprocess if path == "/preprocess" else self.sentiment
+                result, timings = await co.submit(text)
+                out = {"text": text, **result}
+        except QueueFull:
+            self.rejected += 1
+            return 503, {"error": "server sibuk, antrean penuh"}, {"Retry-After": "1"}
+        except Exception as e:
+            return 500, {"error": f"{type(e).__name__}: {e}"}, {}
+        timings["total_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+        out["timings"] = timings
+        return 200, out, {}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "request tidak valid"}, {}, False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                raw_length = headers.get("content-length") or "0"
+                if not (raw_length.isascii() and raw_length.isdigit()):  # "-1", "abc", "1_0"
+                    await self._respond(writer, 400, {"error": "Content-Length tidak valid"}, {}, False)
+                    break
+                length = int(raw_length)
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "body terlalu besar"}, {}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version == "HTTP/1.1")
+
+                self.requests += 1
+                status, payload, extra = await self.dispatch(method, target.split("?", 1)[0], body)
+                await self._respond(writer, status, payload, extra, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status: int, payload, extra: dict, keep_alive: bool) -> None:
+        if isinstance(payload, str):
+            data, ctype = payload.encode("utf-8"), "text/plain; version=0.0.4"
+        else:
+            data, ctype = json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json"
+        head = [
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+            f"Content-Type: {ctype}",
+            f"Content-Length: {len(data)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ] + [f"{k}: {v}" for k, v in extra.items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data)
+        await writer.drain()
+
+
+async def serve(host: str, port: int, **kwargs) -> None:
+    app = SentimentServer(**kwargs)
+    server = await app.start(host, port)
+    print(f"✅ SENTINEX API di http://{host}:{port} (workers={app.workers})", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await app.close()
+        shutdown_pools()
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m sentinex.api",
+                                 description="HTTP API sentimen SENTINEX (asyncio).")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("-w", "--workers", type=int, default=default_workers(),
+                    help="jumlah worker pipeline (default: %(default)s)")
+    ap.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH,
+                    help="teks maksimum per micro-batch (default: %(default)s)")
+    ap.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS,
+                    help="waktu tunggu maksimum pengisian batch (default: %(default)s)")
+    ap.add_argument("--queue-limit", type=int, default=DEFAULT_QUEUE_LIMIT,
+                    help="panjang antrean maksimum sebelum 503 (default: %(default)s)")
+    args = ap.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, workers=args.workers, max_batch=args.max_batch,
+                          max_wait_ms=args.max_wait_ms, queue_limit=args.queue_limit))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
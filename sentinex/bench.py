@@ -0,0 +1,366 @@
+"""
+Benchmark tahap-tahap pipeline pre-processing + sentimen.
+
+Korpus: ulasan hasil scraping (`1. Scraping Data/*.csv`), ulasan
+berlabel (`2. Ulasan Yang Sudah DiLabelling/*.csv`) dan korpus sintetis
+(10k / 100k / 1M ulasan) yang dibentuk dari kosakata & distribusi panjang
+korpus asli dengan seed tetap, sehingga hasilnya bisa diulang.
+
+Untuk setiap korpus diukur per tahap (cleaning, normalisasi, stopword,
+stemming, sentimen), pipeline per ulasan, dan pipeline batch
+(`preprocess_batch`). Tahap stopword juga diukur lewat jalur lama
+Sastrawi (`stopword_sastrawi`) dan hasil keduanya harus identik:
+    throughput (ulasan/detik), latensi p50/p99 per ulasan (µs), peak RSS (MB)
+
+Contoh:
+    python -m sentinex.bench -o bench.json --save-baseline bench_baseline.json
+    python -m sentinex.bench -o bench.json --baseline bench_baseline.json   # exit 1 bila regresi
+    python -m sentinex.bench --sizes 10000 100000 1000000
+"""
+import argparse
+import gc
+import glob
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from .metrics import rss_bytes
+from .preprocessing import (
+    cleaning, normalisasi, preprocess_batch, stemming, stop_words_remover_new, stopword_tokens,
+)
+from .sentiment import deteksi_sentimen
+from .stemming import get_stemmer
+
+CORPORA = {
+    "scraped": "1. Scraping Data/*.csv",
+    "labelled": "2. Ulasan Yang Sudah DiLabelling/*.csv",
+}
+TEXT_COL = "content"
+DEFAULT_SIZES = [10_000]
+SEED = 42
+DEFAULT_TOLERANCE = 0.20   # regresi bila throughput turun > 20%
+DEFAULT_RSS_TOLERANCE = 0.25
+
+# Anggaran waktu impor dingin (ms). Modul ringan tidak boleh ikut memuat
+# pandas/Sastrawi; modul pipeline dibatasi agar cold start app tetap cepat.
+IMPORT_BUDGET_MS = {
+    "sentinex": 50,
+    "sentinex.config": 50,
+    "sentinex.metrics": 50,
+    "sentinex.preprocessing": 1500,
+    "sentinex.cache": 1500,
+    "sentinex.streaming": 2000,
+    "sentinex.api": 2000,
+}
+
+
+# ============================================================
+# Korpus
+# ============================================================
+def load_corpus(pattern: str, root: str = ".") -> list[str]:
+    """Gabungan kolom `content` semua CSV yang cocok dengan pola."""
+    texts = []
+    for path in sorted(glob.glob(os.path.join(root, pattern))):
+        df = pd.read_csv(path)
+        if TEXT_COL in df.columns:
+            texts.extend(df[TEXT_COL].astype(str).tolist())
+    return texts
+
+
+def synthesize(base: list[str], n: int, seed: int = SEED, copy_ratio: float = 0.2) -> list[str]:
+    """
+    `n` ulasan sintetis: sebagian salinan utuh ulasan asli (duplikat seperti
+    "mantap", "top" memang sering muncul), sisanya kata-kata acak dari
+    korpus (mengikuti frekuensinya) dengan panjang mengikuti distribusi asli.
+    """
+    rng = random.Random(seed)
+    tokens = [t.split(" ") for t in base]
+    pool = [w for ts in tokens for w in ts]
+    lengths = [len(ts) for ts in tokens]
+    out = []
+    for _ in range(n):
+        if rng.random() < copy_ratio:
+            out.append(rng.choice(base))
+        else:
+            out.append(" ".join(rng.choices(pool, k=rng.choice(lengths))))
+    return out
+
+
+def build_datasets(root: str = ".", sizes=DEFAULT_SIZES, seed: int = SEED) -> dict[str, list[str]]:
+    datasets = {name: load_corpus(pattern, root) for name, pattern in CORPORA.items()}
+    datasets = {k: v for k, v in datasets.items() if v}
+    base = [t for texts in datasets.values() for t in texts]
+    if not base:
+        raise SystemExit(f"Korpus tidak ditemukan di {os.path.abspath(root)}")
+    for n in sizes:
+        datasets[f"synthetic_{_size_label(n)}"] = synthesize(base, n, seed)
+    return datasets
+
+
+def _size_label(n: int) -> str:
+    if n >= 1_000_000 and n % 1_000_000 == 0:
+        return f"{n // 1_000_000}m"
+    if n >= 1_000 and n % 1_000 == 0:
+        return f"{n // 1_000}k"
+    return str(n)
+
+
+# ============================================================
+# Pengukuran
+# ============================================================
+class RssSampler:
+    """Catat peak RSS selama blok `with` (sampling tiap `interval` detik)."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, rss_bytes())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = rss_bytes()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_bytes())
+
+
+def _row(dataset: str, stage: str, n: int, seconds: float, peak: int, lat_ns=None) -> dict:
+    row = {
+        "dataset": dataset,
+        "stage": stage,
+        "n": n,
+        "seconds": round(seconds, 4),
+        "reviews_per_s": round(n / seconds, 1) if seconds else None,
+        "p50_us": None,
+        "p99_us": None,
+        "peak_rss_mb": round(peak / 2**20, 1),
+    }
+    if lat_ns is not None and len(lat_ns):
+        p50, p99 = np.percentile(lat_ns, [50, 99]) / 1000
+        row["p50_us"], row["p99_us"] = round(float(p50), 2), round(float(p99), 2)
+    return row
+
+
+def time_stage(fn, inputs: list) -> tuple[list, float, np.ndarray, int]:
+    """Jalankan fn per item; kembalikan (output, detik, latensi ns per item, peak RSS)."""
+    out = [None] * len(inputs)
+    lat = np.empty(len(inputs), dtype=np.int64)
+    clock = time.perf_counter_ns
+    gc.collect()
+    with RssSampler() as rss:
+        t0 = clock()
+        for i, x in enumerate(inputs):
+            s = clock()
+            out[i] = fn(x)
+            lat[i] = clock() - s
+        total = clock() - t0
+    return out, total / 1e9, lat, rss.peak
+
+
+STAGES = [
+    ("cleaning", cleaning),
+    ("normalisasi", lambda x: normalisasi(" " + x + " ")),
+    ("stopword", stopword_tokens),
+    ("stemming", stemming),
+    ("sentimen", deteksi_sentimen),
+]
+
+
+def _stopword_sastrawi(text: str) -> list[str]:
+    """Jalur lama (StopWordRemover + split) sebagai pembanding tahap stopword."""
+    return stop_words_remover_new.remove(text).split()
+
+
+def _pipeline_one(text: str) -> str:
+    stem = stemming(stopword_tokens(normalisasi(" " + cleaning(text) + " ")))
+    return deteksi_sentimen(stem)
+
+
+def bench_dataset(name: str, texts: list[str]) -> list[dict]:
+    """Semua tahap + pipeline untuk satu korpus. Cache stem dikosongkan di awal."""
+    svc = get_stemmer()
+    rows = []
+
+    svc.clear()
+    data = texts
+    for stage, fn in STAGES:
+        if stage == "stopword":
+            ref, secs, lat, peak = time_stage(_stopword_sastrawi, data)
+            rows.append(_row(name, "stopword_sastrawi", len(texts), secs, peak, lat))
+        data, secs, lat, peak = time_stage(fn, data)
+        rows.append(_row(name, stage, len(texts), secs, peak, lat))
+        if stage == "stopword" and data != ref:
+            raise AssertionError(f"{name}: stopword_tokens berbeda dari StopWordRemover + split")
+
+    svc.clear()
+    _, secs, lat, peak = time_stage(_pipeline_one, texts)
+    rows.append(_row(name, "pipeline", len(texts), secs, peak, lat))
+
+    svc.clear()
+    gc.collect()
+    series = pd.Series(texts, dtype=object)
+    with RssSampler() as rss:
+        t0 = time.perf_counter()
+        preprocess_batch(series)
+        secs = time.perf_counter() - t0
+    rows.append(_row(name, "pipeline_batch", len(texts), secs, rss.peak))
+    return rows
+
+
+# ============================================================
+# Waktu impor
+# ============================================================
+_IMPORT_SNIPPET = "import time; t = time.perf_counter(); import {m}; print(time.perf_counter() - t)"
+
+
+def import_time_ms(module: str, runs: int = 3, root: str = ".") -> float:
+    """Waktu impor dingin `module` (ms, minimum dari `runs` proses baru)."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.path.abspath(root),
+                                                                   os.environ.get("PYTHONPATH")])))
+    best = float("inf")
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", _IMPORT_SNIPPET.format(m=module)],
+                             capture_output=True, text=True, env=env, check=True)
+        best = min(best, float(out.stdout.strip()) * 1000)
+    return best
+
+
+def check_imports(budget: dict[str, float] = IMPORT_BUDGET_MS, root: str = ".") -> list[dict]:
+    rows = []
+    for module, limit in budget.items():
+        ms = import_time_ms(module, root=root)
+        rows.append({"module": module, "ms": round(ms, 1), "budget_ms": limit, "ok": ms <= limit})
+    return rows
+
+
+# ============================================================
+# Baseline
+# ============================================================
+def compare(results: list[dict], baseline: list[dict],
+            tolerance: float = DEFAULT_TOLERANCE,
+            rss_tolerance: float = DEFAULT_RSS_TOLERANCE) -> list[dict]:
+    """
+    Bandingkan dengan baseline per (dataset, stage). Regresi bila throughput
+    turun lebih dari `tolerance` atau peak RSS naik lebih dari `rss_tolerance`.
+    """
+    base = {(r["dataset"], r["stage"]): r for r in baseline}
+    out = []
+    for r in results:
+        b = base.get((r["dataset"], r["stage"]))
+        if b is None or not b.get("reviews_per_s") or not r.get("reviews_per_s"):
+            continue
+        speed = r["reviews_per_s"] / b["reviews_per_s"]
+        rss = r["peak_rss_mb"] / b["peak_rss_mb"] if b.get("peak_rss_mb") else 1.0
+        out.append({
+            "dataset": r["dataset"],
+            "stage": r["stage"],
+            "speed_ratio": round(speed, 3),
+            "rss_ratio": round(rss, 3),
+            "regression": speed < 1 - tolerance or rss > 1 + rss_tolerance,
+        })
+    return out
+
+
+def _environment() -> dict:
+    return {
+        "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "seed": SEED,
+    }
+
+
+def _print_table(rows: list[dict]) -> None:
+    df = pd.DataFrame(rows)[["dataset", "stage", "n", "reviews_per_s", "p50_us", "p99_us", "peak_rss_mb"]]
+    print(df.to_string(index=False))
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="python -m sentinex.bench",
+        description="Benchmark throughput, latensi & memori tiap tahap pipeline.",
+    )
+    ap.add_argument("--root", default=".", help="folder repo berisi korpus (default: %(default)s)")
+    ap.add_argument("--sizes", type=int, nargs="*", default=DEFAULT_SIZES,
+                    help="ukuran korpus sintetis (default: %(default)s)")
+    ap.add_argument("--datasets", nargs="+", help="hanya jalankan korpus ini (mis. labelled synthetic_10k)")
+    ap.add_argument("-o", "--output", help="tulis hasil JSON ke file ini")
+    ap.add_argument("--baseline", help="JSON hasil sebelumnya untuk pembanding")
+    ap.add_argument("--save-baseline", help="simpan hasil sebagai baseline baru")
+    ap.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                    help="batas penurunan throughput (default: %(default)s)")
+    ap.add_argument("--rss-tolerance", type=float, default=DEFAULT_RSS_TOLERANCE,
+                    help="batas kenaikan peak RSS (default: %(default)s)")
+    ap.add_argument("--imports", action="store_true",
+                    help="hanya ukur waktu impor terhadap IMPORT_BUDGET_MS (exit 1 bila lewat)")
+    args = ap.parse_args(argv)
+
+    if args.imports:
+        rows = check_imports(root=args.root)
+        print(pd.DataFrame(rows).to_string(index=False))
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump({"environment": _environment(), "imports": rows}, f, indent=2)
+        return 0 if all(r["ok"] for r in rows) else 1
+
+    # benchmark tidak memakai/menimpa cache stem persisten; kamus kata dasar
+    # dibangun di luar pengukuran
+    svc = get_stemmer()
+    svc.path = None
+    svc.stemmer
+
+    datasets = build_datasets(args.root, args.sizes)
+    if args.datasets:
+        datasets = {k: v for k, v in datasets.items() if k in args.datasets}
+
+    results = []
+    for name, texts in datasets.items():
+        print(f"⏱  {name}: {len(texts)} ulasan", flush=True)
+        results.extend(bench_dataset(name, texts))
+
+    report = {"environment": _environment(), "results": results}
+    _print_table(results)
+
+    failed = False
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        report["baseline"] = os.path.abspath(args.baseline)
+        report["comparison"] = compare(results, baseline["results"], args.tolerance, args.rss_tolerance)
+        for c in report["comparison"]:
+            if c["regression"]:
+                failed = True
+                print(f"❌ REGRESI {c['dataset']}/{c['stage']}: throughput ×{c['speed_ratio']}, "
+                      f"RSS ×{c['rss_ratio']}")
+        if not failed:
+            print(f"✅ Tidak ada regresi dibanding baseline ({len(report['comparison'])} pengukuran)")
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print("✅ Saved:", path)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,190 @@
+"""
+Cache hasil pipeline (stem + sentimen) berbasis isi teks.
+
+Kunci = hash teks hasil `cleaning` + fingerprint konfigurasi pre-processing
+(pola cleaning, kamus normalisasi, daftar stopword). Entri juga mencatat
+fingerprint leksikon: bila leksikon POS/NEG berubah, `stem` tetap dipakai
+dan hanya sentimennya yang dihitung ulang. Perubahan kamus normalisasi /
+stopword otomatis membuat entri lama tidak terpakai lalu tergusur LRU.
+
+Fingerprint disimpan (memo) dan baru dihitung ulang bila kamus berubah:
+`Normalizer.version` / `Lexicon.version` naik setiap update (termasuk lewat
+`load_slang` / `load_lexicon`), daftar stopword & pola cleaning dicek
+berdasar objek dan panjangnya.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from . import preprocessing, sentiment
+from .lexicon import MATCHING_VERSION
+from .metrics import stage
+from .parallel import preprocess_parallel
+from .preprocessing import cleaning_series
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+_ENTRY_OVERHEAD = 200  # perkiraan overhead objek Python per entri (byte)
+
+_FP_MEMO: dict[str, tuple] = {}  # nama → (keadaan kamus, fingerprint)
+
+
+def _digest(obj) -> str:
+    raw = json.dumps(obj, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
+def _memo(name: str, state: tuple, compute) -> str:
+    hit = _FP_MEMO.get(name)
+    if hit is not None and hit[0] == state:
+        return hit[1]
+    fp = compute()
+    _FP_MEMO[name] = (state, fp)
+    return fp
+
+
+def preprocessing_fingerprint() -> str:
+    """Fingerprint konfigurasi yang menentukan `stem`."""
+    steps, norm, stops = preprocessing.CLEANING_STEPS, preprocessing.normalizer, preprocessing.stop_words
+    return _memo("preprocessing", (steps, len(steps), norm, norm.version, stops, len(stops)),
+                 lambda: _digest({
+                     "cleaning": steps,
+                     "norm": norm.to_dict(),
+                     "stopwords": sorted(set(stops)),
+                 }))
+
+
+def lexicon_fingerprint() -> str:
+    """Fingerprint leksikon yang menentukan `sentimen`."""
+    lex = sentiment.lexicon
+    return _memo("lexicon", (lex, lex.version),
+                 lambda: _digest({
+                     "matching": MATCHING_VERSION,
+                     "terms": dict(zip(lex.terms, lex.weights)),
+                     "profanity": sorted(lex.profanity),
+                 }))
+
+
+def text_key(clean: str) -> str:
+    return hashlib.blake2b(clean.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """Cache LRU {kunci: (stem, sentimen, fingerprint leksikon)} berbatas ukuran (byte)."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = int(max_bytes)
+        self._data: OrderedDict[str, tuple[str, str, str]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.relabeled = 0
+
+    @staticmethod
+    def _size(key: str, value: tuple[str, str, str]) -> int:
+        return len(key) + sum(len(v) for v in value) + _ENTRY_OVERHEAD
+
+    def get(self, key: str):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: tuple[str, str, str]) -> None:
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= self._size(key, old)
+            self._data[key] = value
+            self._bytes += self._size(key, value)
+            while self._bytes > self.max_bytes and self._data:
+                k, v = self._data.popitem(last=False)
+                self._bytes -= self._size(k, v)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "relabeled": self.relabeled,
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hit_rate": (self.hits / total) if total else 0.0,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+        self.hits = self.misses = self.relabeled = 0
+
+
+_CACHE = ResultCache()
+
+
+def get_result_cache() -> ResultCache:
+    """Cache hasil bersama untuk proses ini."""
+    return _CACHE
+
+
+def preprocess_cached(
+    texts,
+    workers: int | None = 1,
+    keep_intermediate: bool = False,
+    cache: ResultCache | None = None,
+    cleaned: bool = False,
+) -> pd.DataFrame:
+    """
+    Seperti `preprocess_parallel`, tetapi `stem`/`sentimen` diambil dari
+    cache bila teks (setelah cleaning) sudah pernah diproses dengan
+    konfigurasi yang sama. Teks duplikat dalam satu batch hanya diproses
+    sekali. Kolom antara tidak di-cache: keep_intermediate=True selalu
+    menjalankan pipeline penuh. cleaned=True: `texts` sudah hasil cleaning.
+    """
+    texts = texts if isinstance(texts, pd.Series) else pd.Series(list(texts), dtype=object)
+    if keep_intermediate:
+        return preprocess_parallel(texts, workers=workers, keep_intermediate=True, cleaned=cleaned)
+
+    cache = cache or _CACHE
+    with stage("cache_lookup", rows=len(texts)):
+        prep_fp, lex_fp = preprocessing_fingerprint(), lexicon_fingerprint()
+        clean = texts.astype(str) if cleaned else cleaning_series(texts)
+
+        results: dict[str, tuple[str, str]] = {}
+        miss_clean, relabel = [], []
+        for c in dict.fromkeys(clean.values):
+            key = text_key(prep_fp + "\x00" + c)
+            hit = cache.get(key)
+            if hit is None:
+                miss_clean.append(c)
+            elif hit[2] != lex_fp:
+                relabel.append((c, key, hit[0]))
+            else:
+                results[c] = (hit[0], hit[1])
+
+    if relabel:
+        labels = sentiment.deteksi_sentimen_batch([stem for _, _, stem in relabel])
+        for (c, key, stem), label in zip(relabel, labels):
+            cache.put(key, (stem, label, lex_fp))
+            results[c] = (stem, label)
+
+    if miss_clean:
+        # teks bersih diteruskan: cleaning tidak dijalankan dua kali
+        fresh = preprocess_parallel(pd.Series(miss_clean, dtype=object), workers=workers, cleaned=True)
+        for c, stem, label in zip(miss_clean, fresh["stem"], fresh["sentimen"]):
+            cache.put(text_key(prep_fp + "\x00" + c), (stem, label, lex_fp))
+            results[c] = (stem, label)
+
+    cache.hits += len(results) - len(miss_clean)
+    cache.misses += len(miss_clean)
+    cache.relabeled += len(relabel)
+
+    out = pd.DataFrame(index=texts.index)
+    out["stem"] = clean.map(lambda c: results[c][0])
+    out["sentimen"] = clean.map(lambda c: results[c][1])
+    return out
@@ -0,0 +1,134 @@
+"""
+Entry point baris perintah SENTINEX (tanpa Streamlit), untuk cron / batch job.
+
+Contoh:
+    python -m sentinex data_blibli.csv data_shopee.csv -c content -w 4 -o hasil.parquet
+
+Setiap CSV diproses per chunk (cleaning → normalisasi → stopword →
+stemming → deteksi sentimen) dan ditulis ke satu file keluaran
+(CSV, Parquet, atau Arrow IPC, dari ekstensi). Di akhir dicetak statistik throughput.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+import pandas as pd
+
+from .cache import get_result_cache
+from .dedup import DEFAULT_THRESHOLD, NearDupIndex
+from .metrics import get_metrics
+from .parallel import default_workers
+from .stemming import get_stemmer
+from .streaming import DEFAULT_CHUNK_ROWS, open_sink, process_csv_stream
+
+TEXT_CANDIDATES = ["content", "review", "text", "ulasan", "clean_text"]
+
+
+def find_text_column(path: str, column: str | None) -> str:
+    """Kolom teks: yang diminta, atau tebakan dari TEXT_CANDIDATES."""
+    cols = list(pd.read_csv(path, nrows=0).columns)
+    if column:
+        if column not in cols:
+            raise SystemExit(f"{path}: kolom '{column}' tidak ditemukan (ada: {', '.join(cols)})")
+        return column
+    lower_map = {c.lower(): c for c in cols}
+    for c in TEXT_CANDIDATES:
+        if c in lower_map:
+            return lower_map[c]
+    raise SystemExit(f"{path}: kolom teks tidak ditemukan, pakai --column")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="python -m sentinex",
+        description="Pre-processing & deteksi sentimen ulasan dari CSV (batch, tanpa UI).",
+    )
+    p.add_argument("inputs", nargs="+", help="file CSV masukan")
+    p.add_argument("-c", "--column", help="nama kolom teks (default: tebak otomatis)")
+    p.add_argument("-o", "--output", required=True, help="file keluaran .csv, .parquet, atau .arrow/.feather")
+    p.add_argument("-w", "--workers", type=int, default=default_workers(),
+                   help="jumlah proses worker (default: %(default)s)")
+    p.add_argument("--chunksize", type=int, default=DEFAULT_CHUNK_ROWS,
+                   help="baris per chunk (default: %(default)s)")
+    p.add_argument("--keep-intermediate", action="store_true",
+                   help="sertakan kolom clean, norm, stop, token")
+    p.add_argument("--model-app",
+                   help="tambahkan kolom prediksi_model dari bundle FastText + Bi-GRU "
+                        "(SENTINEX_MODEL_DIR) untuk aplikasi ini, mis. Shopee")
+    p.add_argument("--drop-english", action="store_true",
+                   help="buang ulasan berbahasa Inggris sebelum diproses")
+    p.add_argument("--near-dup", action="store_true",
+                   help="proses sekali per klaster ulasan (hampir) duplikat (MinHash/LSH); "
+                        "tambah kolom dup_cluster & dup_size")
+    p.add_argument("--dedup-threshold", type=float, default=DEFAULT_THRESHOLD,
+                   help="batas kemiripan Jaccard 4-gram (default: %(default)s)")
+    p.add_argument("--dedup-index", metavar="PATH",
+                   help="muat & simpan indeks near-duplicate di file JSON ini (inkremental antar-run)")
+    p.add_argument("--metrics", metavar="PATH",
+                   help="tulis metrik per tahap (format teks Prometheus) ke file ini")
+    p.add_argument("--log-metrics", action="store_true",
+                   help="cetak log JSON per tahap ke stderr")
+    return p
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.log_metrics:
+        logging.basicConfig(format="%(message)s")
+        logging.getLogger("sentinex.metrics").setLevel(logging.INFO)
+    multi = len(args.inputs) > 1
+    t0 = time.perf_counter()
+    total_rows = 0
+    dedup = None
+    if args.dedup_index:
+        dedup = NearDupIndex.load(args.dedup_index, threshold=args.dedup_threshold)
+    elif args.near_dup:
+        dedup = NearDupIndex(args.dedup_threshold)
+
+    with open_sink(args.output) as sink:
+        for path in args.inputs:
+            col = find_text_column(path, args.column)
+            info = process_csv_stream(
+                path, col, sink,
+                chunksize=args.chunksize,
+                workers=args.workers,
+                keep_intermediate=args.keep_intermediate,
+                model_app=args.model_app,
+                drop_english=args.drop_english,
+                dedup=dedup,
+                assign={"source": os.path.basename(path)} if multi else None,
+            )
+            total_rows += info["rows"]
+            rate = info["rows"] / info["seconds"] if info["seconds"] else 0.0
+            print(f"{path}: {info['rows']} baris, {info['chunks']} chunk, "
+                  f"{info['seconds']:.2f} s ({rate:,.0f} baris/s)"
+                  + (f", {info['dropped_english']} baris Inggris dibuang" if args.drop_english else "")
+                  + (f", {info['dedup_skipped']} baris duplikat memakai hasil klaster"
+                     if info["dedup_skipped"] is not None else ""))
+
+    get_stemmer().save()
+    elapsed = time.perf_counter() - t0
+    stem = get_stemmer().stats()
+    res = get_result_cache().stats()
+    print(f"Total: {total_rows} baris dalam {elapsed:.2f} s "
+          f"({total_rows / elapsed if elapsed else 0:,.0f} baris/s), workers={args.workers}")
+    print(f"Cache stem: hit rate {stem['hit_rate']:.1%} ({stem['size']} kata) | "
+          f"cache hasil: {res['hits']} hit / {res['misses']} miss")
+    if dedup is not None:
+        d = dedup.stats()
+        print(f"Dedup: {d['clusters']} klaster dari {d['members']} ulasan "
+              f"({d['dup_rate']:.1%} duplikat; {d['exact_hits']} identik, {d['near_hits']} mirip)")
+        if dedup.save():
+            print(f"Indeks dedup: {dedup.path}")
+    print(f"Output: {args.output}")
+    if args.metrics:
+        with open(args.metrics, "w", encoding="utf-8") as f:
+            f.write(get_metrics().to_prometheus())
+        print(f"Metrik: {args.metrics}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+"""
+Format kolumnar (Parquet / Arrow IPC) untuk hasil pipeline.
+
+Dibanding CSV:
+- label sentimen, nama aplikasi, dll. disimpan sebagai kolom kategori
+  (dictionary-encoded: teks unik sekali, baris berisi indeks int32);
+- `token` disimpan sebagai kolom list<string> asli, bukan teks "['a', 'b']";
+- kolom antara (clean, norm, stop, token) bisa dibuang saat menulis.
+
+`ChunkEncoder` menjaga skema & kamus kategori tetap di seluruh chunk
+sehingga bisa dipakai penulisan streaming (kamus hanya bertambah, ditulis
+sebagai dictionary delta di Arrow IPC). Kolom keluaran pipeline punya tipe
+tetap (`COLUMN_TYPES`); kolom lain mengikuti chunk pertama dengan tipe
+yang cukup lebar agar chunk berikutnya tetap bisa di-cast (kolom kosong →
+string, angka → float64 bila promote_numeric=True).
+
+Contoh konversi hasil lama:
+    python -m sentinex.columnar "3. Hasil Dari Pre-Processing/*.csv" -o hasil_parquet
+"""
+import argparse
+import ast
+import glob
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+CATEGORICAL_COLUMNS = ("sentimen", "label", "app", "aplikasi", "source", "prediksi_model",
+                       "status", "true", "pred")
+LIST_COLUMNS = ("token",)
+INTERMEDIATE_COLUMNS = ("clean", "norm", "stop", "token")
+# tipe Arrow kolom keluaran pipeline (bukan hasil tebakan pandas per chunk)
+COLUMN_TYPES = {"clean": "string", "norm": "string", "stop": "string", "stem": "string",
+                "dup_cluster": "int64", "dup_size": "int64"}
+EXTENSIONS = {
+    ".parquet": "parquet", ".pq": "parquet",
+    ".arrow": "arrow", ".feather": "arrow", ".ipc": "arrow",
+    ".csv": "csv",
+}
+
+
+def format_of(path: str) -> str:
+    """Format dari ekstensi file: parquet, arrow, atau csv (default)."""
+    return EXTENSIONS.get(os.path.splitext(str(path))[1].lower(), "csv")
+
+
+def require_pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError("Output Parquet/Arrow butuh pyarrow: pip install pyarrow") from e
+    return pa
+
+
+def ipc_options():
+    """Opsi penulisan Arrow IPC: buffer dikompres zstd, kamus kategori boleh bertambah antar batch."""
+    pa = require_pyarrow()
+    return pa.ipc.IpcWriteOptions(compression="zstd", emit_dictionary_deltas=True)
+
+
+def parse_tokens(value) -> list[str] | None:
+    """Token dari list, array, atau teks CSV lama "['a', 'b']"."""
+    if isinstance(value, list):
+        return value
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith("["):
+            return list(ast.literal_eval(value))
+        return value.split()
+    return None
+
+
+class _DictEncoder:
+    """Kamus kategori yang hanya bertambah (agar cocok dengan dictionary delta)."""
+
+    def __init__(self):
+        self.values: list[str] = []
+        self.index: dict[str, int] = {}
+
+    def encode(self, series: pd.Series):
+        pa = require_pyarrow()
+        s = series.astype("string")
+        for v in s.dropna().unique():
+            if v not in self.index:
+                self.index[v] = len(self.values)
+                self.values.append(v)
+        codes = s.map(self.index)
+        mask = codes.isna().to_numpy()
+        idx = pa.array(codes.fillna(0).astype("int32").to_numpy(), type=pa.int32(), mask=mask)
+        return pa.DictionaryArray.from_arrays(idx, pa.array(self.values, type=pa.string()))
+
+
+class ChunkEncoder:
+    """
+    DataFrame (per chunk) → pyarrow.Table dengan skema yang sama setiap chunk.
+
+    Skema ditetapkan dari chunk pertama, kecuali kolom di `types` (nama →
+    tipe Arrow) yang tipenya tetap. Kolom yang seluruhnya kosong di chunk
+    pertama menjadi string. promote_numeric=True menyimpan kolom angka
+    sebagai float64, karena pandas membaca kolom int yang memuat sel kosong
+    di chunk lain sebagai float.
+    """
+
+    def __init__(self, categorical=CATEGORICAL_COLUMNS, list_columns=LIST_COLUMNS,
+                 drop_intermediate: bool = False, types: dict | None = None,
+                 promote_numeric: bool = False):
+        self.categorical = set(categorical)
+        self.list_columns = set(list_columns)
+        self.drop = set(INTERMEDIATE_COLUMNS) if drop_intermediate else set()
+        self.types = dict(COLUMN_TYPES if types is None else types)
+        self.promote_numeric = promote_numeric
+        self.schema = None
+        self._dicts: dict[str, _DictEncoder] = {}
+
+    def _array(self, name: str, series: pd.Series, type_=None):
+        pa = require_pyarrow()
+        if name in self.categorical:
+            return self._dicts.setdefault(name, _DictEncoder()).encode(series)
+        if name in self.list_columns:
+            return pa.array([parse_tokens(v) for v in series], type=pa.list_(pa.string()))
+        if type_ is None and name in self.types:
+            type_ = pa.type_for_alias(self.types[name])
+        if type_ is not None and pa.types.is_string(type_):
+            return pa.array(series.astype("string"), type=pa.string(), from_pandas=True)
+        try:
+            arr = pa.array(series, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            if type_ is not None:
+                raise ValueError(f"Kolom '{name}' tidak bisa disimpan sebagai {type_}.") from None
+            return self._array(name, series, pa.string())  # objek campuran (teks & angka)
+        if type_ is None:
+            if pa.types.is_null(arr.type) or (len(arr) and arr.null_count == len(arr)):
+                return arr.cast(pa.string())
+            if self.promote_numeric and (pa.types.is_integer(arr.type) or pa.types.is_floating(arr.type)):
+                return arr.cast(pa.float64())
+            return arr
+        try:
+            return arr.cast(type_)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+            raise ValueError(f"Kolom '{name}' di chunk ini tidak cocok dengan tipe {type_} "
+                             f"dari chunk pertama: {e}") from e
+
+    def encode(self, df: pd.DataFrame):
+        pa = require_pyarrow()
+        if self.schema is None:
+            cols = [c for c in df.columns if c not in self.drop]
+            arrays = [self._array(c, df[c]) for c in cols]
+            self.schema = pa.schema([pa.field(str(c), a.type) for c, a in zip(cols, arrays)])
+        else:
+            df = df.reindex(columns=self.schema.names)
+            arrays = [self._array(f.name, df[f.name], f.type) for f in self.schema]
+        return pa.Table.from_arrays(arrays, schema=self.schema)
+
+
+def to_table(df: pd.DataFrame, drop_intermediate: bool = False):
+    return ChunkEncoder(drop_intermediate=drop_intermediate).encode(df)
+
+
+def write_frame(df: pd.DataFrame, path_or_buf, fmt: str | None = None,
+                drop_intermediate: bool = False) -> None:
+    """Tulis DataFrame ke CSV / Parquet / Arrow (format dari `fmt` atau ekstensi)."""
+    fmt = fmt or format_of(path_or_buf)
+    if fmt == "csv":
+        cols = [c for c in df.columns if not (drop_intermediate and c in INTERMEDIATE_COLUMNS)]
+        df[cols].to_csv(path_or_buf, index=False)
+        return
+    pa = require_pyarrow()
+    table = to_table(df, drop_intermediate)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, path_or_buf, compression="zstd")
+    else:
+        with pa.ipc.new_file(path_or_buf, table.schema, options=ipc_options()) as w:
+            w.write_table(table)
+
+
+def frame_bytes(df: pd.DataFrame, fmt: str, drop_intermediate: bool = False) -> bytes:
+    """Isi file hasil dalam memori (untuk tombol unduh)."""
+    import io
+
+    buf = io.BytesIO()
+    write_frame(df, buf, fmt, drop_intermediate)
+    return buf.getvalue()
+
+
+def read_frame(path, columns=None, nrows: int | None = None, fmt: str | None = None) -> pd.DataFrame:
+    """
+    Baca hasil CSV / Parquet / Arrow (path atau file upload ber-atribut `name`).
+    Kolom kategori menjadi dtype category, `token` menjadi list
+    (CSV lama: teks token di-parse).
+    """
+    fmt = fmt or format_of(getattr(path, "name", path))
+    if fmt == "csv":
+        df = pd.read_csv(path, usecols=columns, nrows=nrows)
+        for c in LIST_COLUMNS:
+            if c in df.columns:
+                df[c] = df[c].map(parse_tokens)
+        return df
+    pa = require_pyarrow()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        if nrows is not None:
+            batch = next(pq.ParquetFile(path).iter_batches(batch_size=nrows, columns=columns), None)
+            table = pa.Table.from_batches([batch]) if batch is not None else pq.read_table(path, columns=columns)
+        else:
+            table = pq.read_table(path, columns=columns)
+    else:
+        if isinstance(path, (str, os.PathLike)):
+            with pa.memory_map(str(path)) as src:
+                table = pa.ipc.open_file(src).read_all()
+        else:
+            table = pa.ipc.open_file(path).read_all()
+        if columns is not None:
+            table = table.select(columns)
+        if nrows is not None:
+            table = table.slice(0, nrows)
+    return table.to_pandas()
+
+
+# ============================================================
+# Konversi hasil lama (CSV → Parquet / Arrow)
+# ============================================================
+def convert(src: str, dst: str, drop_intermediate: bool = False) -> dict:
+    """Konversi satu file; kembalikan ukuran & waktu baca sebelum/sesudah."""
+    df = read_frame(src)
+    write_frame(df, dst, drop_intermediate=drop_intermediate)
+
+    def reload_seconds(path):
+        t0 = time.perf_counter()
+        read_frame(path)
+        return time.perf_counter() - t0
+
+    return {
+        "src": src,
+        "dst": dst,
+        "rows": len(df),
+        "src_bytes": os.path.getsize(src),
+        "dst_bytes": os.path.getsize(dst),
+        "src_read_s": reload_seconds(src),
+        "dst_read_s": reload_seconds(dst),
+    }
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m sentinex.columnar",
+                                 description="Konversi hasil CSV ke Parquet / Arrow IPC.")
+    ap.add_argument("inputs", nargs="+", help="file / pola glob CSV")
+    ap.add_argument("-o", "--out-dir", required=True)
+    ap.add_argument("-f", "--format", choices=["parquet", "arrow"], default="parquet")
+    ap.add_argument("--drop-intermediate", action="store_true",
+                    help="buang kolom clean, norm, stop, token")
+    args = ap.parse_args(argv)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    ext = ".parquet" if args.format == "parquet" else ".arrow"
+    paths = [p for pattern in args.inputs for p in sorted(glob.glob(pattern))]
+    for path in paths:
+        dst = os.path.join(args.out_dir, os.path.splitext(os.path.basename(path))[0] + ext)
+        r = convert(path, dst, args.drop_intermediate)
+        print(f"{os.path.basename(path)} → {os.path.basename(dst)}: {r['rows']} baris, "
+              f"{r['src_bytes'] / 1024:.0f} KB → {r['dst_bytes'] / 1024:.0f} KB "
+              f"(×{r['src_bytes'] / r['dst_bytes']:.1f} lebih kecil), baca ulang "
+              f"{r['src_read_s'] * 1000:.1f} ms → {r['dst_read_s'] * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,13 @@
+"""
+Konfigurasi lokasi file cache/penyimpanan lokal SENTINEX.
+"""
+import os
+
+# Folder cache bisa diganti lewat environment variable
+CACHE_DIR = os.environ.get("SENTINEX_CACHE_DIR", ".sentinex_cache")
+
+
+def cache_path(name: str) -> str:
+    """Path file di dalam folder cache (folder dibuat bila belum ada)."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, name)
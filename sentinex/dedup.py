@@ -0,0 +1,300 @@
+"""
+Indeks near-duplicate (MinHash + LSH) untuk ulasan hasil scraping.
+
+Banyak ulasan Play Store identik atau hampir identik ("mantap",
+"bagus banget", keluhan yang di-copy-paste). Indeks ini mengelompokkan
+teks hasil `cleaning()` ke klaster: pipeline penuh hanya dijalankan untuk
+satu perwakilan per klaster, lalu `stem`/`sentimen`-nya dipakai semua
+anggota.
+
+- Shingle: 4-gram karakter teks bersih (dihitung vektor dengan numpy).
+- Signature MinHash `num_perm` permutasi, LSH `bands` band; kandidat dari
+  bucket LSH lalu diverifikasi dengan Jaccard sebenarnya terhadap
+  perwakilan klaster (≥ `threshold`), jadi tidak ada penggabungan berantai.
+- Inkremental: teks baru dicocokkan ke klaster yang sudah ada; indeks dan
+  hasil per klaster bisa disimpan ke JSON lalu dipakai lagi pada scraping
+  berikutnya.
+- Ukuran klaster menghitung anggota unik (kunci anggota per baris, lihat
+  `member_keys`), sehingga file yang sama diproses ulang tidak menggelembungkan
+  `dup_size` maupun statistik duplikat.
+
+    idx = NearDupIndex.load(cache_path("neardup.json"))
+    hasil, info = preprocess_dedup(df["content"], idx)
+    idx.save()
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from .metrics import stage
+
+FORMAT_VERSION = 2
+DEFAULT_THRESHOLD = 0.85
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+SHINGLE = 4
+SEED = 1
+
+# MinHash h(x) = (a*x + b) mod p dengan p = 2^61 - 1. Shingle x < 2^32 dan
+# a, b < 2^32, sehingga a*x + b ≤ 2^64 - 2^32 tidak pernah overflow uint64
+# (a, b sampai 2^61 membuat a*x terpotong mod 2^64 sebelum mod p).
+_MERSENNE = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_COEF_LIMIT = 1 << 32
+_BASE = np.uint64(1_000_003)
+
+
+def shingle_hashes(text: str, k: int = SHINGLE) -> np.ndarray:
+    """Hash 32-bit unik dari k-gram karakter (teks pendek: seluruh teks satu shingle)."""
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    k = max(1, min(k, len(codes)))
+    n = len(codes) - k + 1
+    h = np.zeros(max(n, 1), dtype=np.uint64)
+    for j in range(k if len(codes) else 0):
+        h = h * _BASE + codes[j:j + n]
+    return np.unique(h & _MAX_HASH)
+
+
+def _short_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def member_keys(texts, ids=None, occurrences: Counter | None = None) -> list[str]:
+    """
+    Kunci anggota per baris: hash `ids` (mis. review id) bila ada; selain itu
+    hash teks mentah + urutan kemunculan teks itu (baris ke-n dengan teks
+    yang sama). `occurrences` dipakai bersama lintas chunk satu file agar
+    urutan tersebut berlanjut.
+    """
+    if ids is not None:
+        return [_short_hash(f"id\x00{i}") for i in ids]
+    occurrences = Counter() if occurrences is None else occurrences
+    keys = []
+    for t in texts:
+        h = _short_hash(f"tx\x00{t}")
+        keys.append(f"{h}#{occurrences[h]}")
+        occurrences[h] += 1
+    return keys
+
+
+def jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    inter = len(np.intersect1d(a, b, assume_unique=True))
+    return inter / (len(a) + len(b) - inter) if len(a) + len(b) else 1.0
+
+
+class NearDupIndex:
+    """Klaster near-duplicate inkremental + hasil pipeline per klaster."""
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = DEFAULT_NUM_PERM,
+                 bands: int = DEFAULT_BANDS, path: str | None = None):
+        if num_perm % bands:
+            raise ValueError("num_perm harus kelipatan bands")
+        self.threshold = float(threshold)
+        self.num_perm = int(num_perm)
+        self.bands = int(bands)
+        self.rows_per_band = self.num_perm // self.bands
+        self.path = path
+        rng = np.random.RandomState(SEED)
+        self._a = rng.randint(1, _COEF_LIMIT, size=self.num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, _COEF_LIMIT, size=self.num_perm, dtype=np.uint64)
+
+        self.reps: list[str] = []             # teks bersih perwakilan per klaster
+        self.sizes: list[int] = []            # jumlah anggota unik per klaster
+        self.members: list[set[str]] = []     # kunci anggota yang sudah dihitung
+        self.results: list[tuple | None] = []  # (stem, sentimen) per klaster
+        self.fingerprint: str | None = None   # konfigurasi pipeline saat hasil dihitung
+        self._exact: dict[str, int] = {}
+        self._buckets: list[dict[bytes, list[int]]] = [{} for _ in range(self.bands)]
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.near_hits = 0
+
+    def __len__(self) -> int:
+        return len(self.reps)
+
+    # ------------------------------------------------------------
+    # MinHash / LSH
+    # ------------------------------------------------------------
+    def signature(self, shingles: np.ndarray) -> np.ndarray:
+        """MinHash `num_perm` nilai (32-bit bawah dari (a*x + b) mod 2^61-1)."""
+        h = (self._a[:, None] * shingles[None, :] + self._b[:, None]) % _MERSENNE
+        return (h & _MAX_HASH).min(axis=1)
+
+    def _band_keys(self, sig: np.ndarray) -> list[bytes]:
+        r = self.rows_per_band
+        return [sig[i * r:(i + 1) * r].tobytes() for i in range(self.bands)]
+
+    def _add_cluster(self, clean: str, keys: list[bytes]) -> int:
+        cid = len(self.reps)
+        self.reps.append(clean)
+        self.sizes.append(0)
+        self.members.append(set())
+        self.results.append(None)
+        self._exact[clean] = cid
+        for bucket, key in zip(self._buckets, keys):
+            bucket.setdefault(key, []).append(cid)
+        return cid
+
+    def _match(self, clean: str) -> int:
+        """Klaster untuk satu teks bersih (klaster baru bila tidak ada yang cukup mirip)."""
+        cid = self._exact.get(clean)
+        if cid is not None:
+            self.exact_hits += 1
+            return cid
+        sh = shingle_hashes(clean)
+        keys = self._band_keys(self.signature(sh))
+        candidates = {c for bucket, key in zip(self._buckets, keys) for c in bucket.get(key, ())}
+        best, best_sim = None, self.threshold
+        for c in sorted(candidates):
+            sim = jaccard(sh, shingle_hashes(self.reps[c]))
+            if sim >= best_sim:
+                best, best_sim = c, sim
+        if best is None:
+            return self._add_cluster(clean, keys)
+        self.near_hits += 1
+        return best
+
+    def assign(self, cleans, keys=None) -> np.ndarray:
+        """
+        ID klaster per teks bersih. Ukuran klaster hanya bertambah untuk
+        kunci anggota (`keys`, default `member_keys(cleans)`) yang belum
+        pernah dihitung di klaster itu.
+        """
+        cleans = list(cleans)
+        keys = member_keys(cleans) if keys is None else list(keys)
+        with self._lock:
+            ids = np.fromiter((self._match(c) for c in cleans), dtype=np.int64, count=len(cleans))
+            for cid, key in zip(ids.tolist(), keys):
+                members = self.members[cid]
+                if key not in members:
+                    members.add(key)
+                    self.sizes[cid] += 1
+        return ids
+
+    def stats(self) -> dict:
+        members = sum(self.sizes)
+        return {
+            "clusters": len(self.reps),
+            "members": members,
+            "duplicates": members - len(self.reps),
+            "exact_hits": self.exact_hits,
+            "near_hits": self.near_hits,
+            "largest": max(self.sizes, default=0),
+            "dup_rate": (members - len(self.reps)) / members if members else 0.0,
+        }
+
+    def top_clusters(self, n: int = 10) -> pd.DataFrame:
+        """Klaster terbesar: perwakilan, ukuran, sentimen."""
+        order = np.argsort(self.sizes)[::-1][:n]
+        return pd.DataFrame({
+            "dup_cluster": order,
+            "perwakilan": [self.reps[i] for i in order],
+            "anggota": [self.sizes[i] for i in order],
+            "sentimen": [self.results[i][1] if self.results[i] else None for i in order],
+        })
+
+    # ------------------------------------------------------------
+    # Persistensi
+    # ------------------------------------------------------------
+    def save(self, path: str | None = None) -> str | None:
+        """Simpan klaster + hasil ke JSON (signature dihitung ulang saat dimuat)."""
+        path = path or self.path
+        if not path:
+            return None
+        with self._lock:
+            data = {
+                "version": FORMAT_VERSION,
+                "threshold": self.threshold, "num_perm": self.num_perm, "bands": self.bands,
+                "fingerprint": self.fingerprint,
+                "reps": self.reps, "sizes": self.sizes, "results": self.results,
+                "members": [sorted(m) for m in self.members],
+            }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str, threshold: float | None = None) -> "NearDupIndex":
+        """Muat indeks dari JSON; file tidak ada / versi atau parameter beda → indeks kosong."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        # versi 1 belum menyimpan kunci anggota: klaster & hasil tetap dipakai
+        if data.get("version") not in (1, FORMAT_VERSION) or (
+                threshold is not None and data["threshold"] != threshold):
+            return cls(threshold if threshold is not None else DEFAULT_THRESHOLD, path=path)
+
+        idx = cls(data["threshold"], data["num_perm"], data["bands"], path=path)
+        idx.fingerprint = data.get("fingerprint")
+        members = data.get("members") or [[] for _ in data["reps"]]
+        for clean, size, res, keys in zip(data["reps"], data["sizes"], data["results"], members):
+            cid = idx._add_cluster(clean, idx._band_keys(idx.signature(shingle_hashes(clean))))
+            idx.sizes[cid] = size
+            idx.members[cid] = set(keys)
+            idx.results[cid] = tuple(res) if res else None
+        return idx
+
+
+# ============================================================
+# Pipeline dengan fan-out per klaster
+# ============================================================
+def preprocess_dedup(texts, index: NearDupIndex | None = None, workers: int | None = 1,
+                     member_ids=None, occurrences: Counter | None = None):
+    """
+    Seperti `preprocess_cached`, tetapi pipeline hanya dijalankan sekali per
+    klaster near-duplicate; hasilnya disalin ke seluruh anggota.
+    Kembalikan (DataFrame stem, sentimen, dup_cluster, dup_size, statistik batch).
+    `dup_size` = ukuran klaster di indeks setelah batch ini. `member_ids`
+    (mis. review id) / `occurrences` menentukan kunci anggota (lihat `member_keys`).
+    """
+    from .cache import lexicon_fingerprint, preprocess_cached, preprocessing_fingerprint
+    from .preprocessing import cleaning_series
+
+    texts = texts if isinstance(texts, pd.Series) else pd.Series(list(texts), dtype=object)
+    index = index if index is not None else NearDupIndex()
+    n = len(texts)
+
+    with stage("dedup", rows=n):
+        clean = cleaning_series(texts)
+        exact0, near0 = index.exact_hits, index.near_hits
+        keys = member_keys(texts.tolist(), member_ids, occurrences)
+        ids = index.assign(clean.tolist(), keys)
+        fp = preprocessing_fingerprint() + ":" + lexicon_fingerprint()
+        if index.fingerprint != fp:
+            index.results = [None] * len(index.results)
+            index.fingerprint = fp
+
+        # perwakilan yang perlu diproses: anggota pertama klaster di batch ini
+        first = pd.Series(np.arange(n)).groupby(ids).first()
+        todo = [(cid, pos) for cid, pos in first.items() if index.results[cid] is None]
+
+    if todo:
+        reps = clean.iloc[[pos for _, pos in todo]].reset_index(drop=True)
+        hasil = preprocess_cached(reps, workers=workers, cleaned=True)
+        for (cid, _), stem, label in zip(todo, hasil["stem"], hasil["sentimen"]):
+            index.results[cid] = (stem, label)
+
+    out = pd.DataFrame(index=texts.index)
+    out["stem"] = [index.results[c][0] for c in ids]
+    out["sentimen"] = [index.results[c][1] for c in ids]
+    out["dup_cluster"] = ids
+    out["dup_size"] = [index.sizes[c] for c in ids]
+    info = {
+        "rows": n,
+        "clusters": int(len(first)),
+        "processed": len(todo),
+        "exact_dup": index.exact_hits - exact0,
+        "near_dup": index.near_hits - near0,
+        "skipped": n - len(todo),
+    }
+    return out, info
@@ -0,0 +1,156 @@
+"""
+Penyimpanan vektor FastText yang sudah dihitung (memory-mapped).
+
+Model `.bin` FastText cukup dibaca sekali untuk mengekspor vektor semua
+kata korpus (termasuk kata OOV, yang vektornya diturunkan dari subword)
+ke satu folder:
+
+    meta.json     dim, dtype, jumlah kata, sumber
+    vocab.json    daftar kata; posisi = nomor baris di vectors.npy
+    vectors.npy   matriks (n_kata, dim) float32 / float16
+
+`vectors.npy` dibuka dengan `np.load(mmap_mode="r")`, sehingga beberapa
+worker memakai page memori yang sama tanpa memuat salinan model sendiri,
+dan matriks embedding dibentuk dengan satu operasi indeks.
+"""
+import json
+import os
+import shutil
+import threading
+
+import numpy as np
+
+META_FILE = "meta.json"
+VOCAB_FILE = "vocab.json"
+VECTORS_FILE = "vectors.npy"
+
+_STORES: dict = {}
+_STORES_LOCK = threading.Lock()
+
+
+class EmbeddingStore:
+    """Vektor kata read-only dari folder hasil `export_store`."""
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        with open(os.path.join(path, VOCAB_FILE), encoding="utf-8") as f:
+            self.words: list[str] = json.load(f)
+        self.path = path
+        self.dim = int(self.meta["dim"])
+        self.index = {w: i for i, w in enumerate(self.words)}
+        self.vectors = np.load(os.path.join(path, VECTORS_FILE), mmap_mode="r")
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.index
+
+    def lookup(self, words) -> np.ndarray:
+        """Matriks float32 (len(words), dim); kata yang tidak ada → vektor nol."""
+        words = list(words)
+        rows = np.fromiter((self.index.get(w, -1) for w in words), dtype=np.int64, count=len(words))
+        found = rows >= 0
+        out = np.zeros((len(words), self.dim), dtype=np.float32)
+        out[found] = self.vectors[rows[found]]
+        return out
+
+    def embedding_matrix(self, tokenizer) -> np.ndarray:
+        """Setara `build_embedding_matrix`: baris 0 (padding) nol, baris i = kata ber-indeks i."""
+        emb = np.zeros((len(tokenizer.word_index) + 1, self.dim), dtype=np.float32)
+        if tokenizer.word_index:
+            words, idx = zip(*tokenizer.word_index.items())
+            emb[list(idx)] = self.lookup(words)
+        return emb
+
+    def missing(self, words) -> list[str]:
+        return [w for w in words if w not in self.index]
+
+
+def export_store(ft_model, words, path: str, dtype: str = "float32",
+                 source: str | None = None, extra: dict | None = None) -> str:
+    """
+    Hitung vektor `words` dari model FastText (objek atau path `.bin`) dan
+    simpan sebagai store di `path` (`extra` ikut dicatat di meta.json).
+    Folder ditulis utuh lalu di-rename, sehingga store yang setengah jadi
+    tidak pernah terbaca.
+    """
+    if dtype not in ("float32", "float16"):
+        raise ValueError("dtype harus 'float32' atau 'float16'")
+    if isinstance(ft_model, (str, os.PathLike)):
+        import fasttext
+
+        source = source or os.fspath(ft_model)
+        ft_model = fasttext.load_model(os.fspath(ft_model))
+
+    words = list(dict.fromkeys(words))
+    dim = ft_model.get_dimension()
+    vectors = np.empty((len(words), dim), dtype=dtype)
+    for i, w in enumerate(words):
+        vectors[i] = ft_model.get_word_vector(w)
+
+    tmp = path.rstrip("/\\") + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    np.save(os.path.join(tmp, VECTORS_FILE), vectors)
+    with open(os.path.join(tmp, VOCAB_FILE), "w", encoding="utf-8") as f:
+        json.dump(words, f, ensure_ascii=False)
+    with open(os.path.join(tmp, META_FILE), "w", encoding="utf-8") as f:
+        json.dump({"dim": dim, "dtype": dtype, "size": len(words), "source": source, **(extra or {})},
+                  f, ensure_ascii=False, indent=2)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+    with _STORES_LOCK:
+        _STORES.pop(os.path.abspath(path), None)
+    return path
+
+
+def extend_store(ft_model, words, path: str) -> list[str]:
+    """
+    Tambahkan ke store yang sudah ada hanya kata `words` yang belum
+    tercakup (vektor lama disalin apa adanya, tidak dihitung ulang).
+    Kembalikan daftar kata baru.
+    """
+    store = EmbeddingStore(path)
+    new_words = list(dict.fromkeys(store.missing(words)))
+    if not new_words:
+        return []
+    if isinstance(ft_model, (str, os.PathLike)):
+        import fasttext
+
+        ft_model = fasttext.load_model(os.fspath(ft_model))
+
+    dtype = store.meta.get("dtype", "float32")
+    vectors = np.empty((len(store) + len(new_words), store.dim), dtype=dtype)
+    vectors[:len(store)] = store.vectors
+    for i, w in enumerate(new_words, start=len(store)):
+        vectors[i] = ft_model.get_word_vector(w)
+
+    tmp = path.rstrip("/\\") + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    np.save(os.path.join(tmp, VECTORS_FILE), vectors)
+    with open(os.path.join(tmp, VOCAB_FILE), "w", encoding="utf-8") as f:
+        json.dump(store.words + new_words, f, ensure_ascii=False)
+    with open(os.path.join(tmp, META_FILE), "w", encoding="utf-8") as f:
+        json.dump({**store.meta, "size": len(vectors)}, f, ensure_ascii=False, indent=2)
+    del store
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+    with _STORES_LOCK:
+        _STORES.pop(os.path.abspath(path), None)
+    return new_words
+
+
+def store_exists(path: str) -> bool:
+    return all(os.path.exists(os.path.join(path, f)) for f in (META_FILE, VOCAB_FILE, VECTORS_FILE))
+
+
+def open_store(path: str) -> EmbeddingStore:
+    """EmbeddingStore bersama per proses untuk folder `path`."""
+    path = os.path.abspath(path)
+    with _STORES_LOCK:
+        if path not in _STORES:
+            _STORES[path] = EmbeddingStore(path)
+        return _STORES[path]
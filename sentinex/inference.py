@@ -0,0 +1,236 @@
+"""
+Inferensi model FastText + Bi-GRU (hasil notebook "Pelatihan Model") di CPU.
+
+Struktur bundle (satu folder):
+
+    bundle.json              {"apps": {"Blibli": "blibli", ...}, "default": "Blibli"}
+    blibli/config.json       max_len, classes, emb_dim, vocab_size, units, oov_token
+    blibli/vocab.json        word_index Tokenizer Keras
+    blibli/model.weights.h5  bobot Bi-GRU (model.save_weights)
+
+Tokenisasi meniru `Tokenizer.texts_to_sequences` Keras tanpa TensorFlow.
+Model dibangun ulang dengan panjang input variabel (None) lalu bobotnya
+dimuat, sehingga prediksi bisa dikelompokkan per panjang sekuens: teks
+pendek tidak perlu di-pad sampai `max_len` (p95).
+"""
+import json
+import os
+import threading
+
+import numpy as np
+
+BUNDLE_FILE = "bundle.json"
+WEIGHTS_FILE = "model.weights.h5"
+KERAS_FILTERS = '!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n'
+DEFAULT_BATCH_SIZE = 256
+BUCKET_STEP = 8  # panjang sekuens dibulatkan ke kelipatan ini
+
+
+def default_model_dir() -> str:
+    return os.environ.get("SENTINEX_MODEL_DIR", "models")
+
+
+def _tf():
+    """Impor TensorFlow dalam mode CPU saja."""
+    os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+    import tensorflow as tf
+
+    try:
+        tf.config.set_visible_devices([], "GPU")
+    except (RuntimeError, ValueError):
+        pass  # device sudah diinisialisasi
+    return tf
+
+
+def build_bigru(vocab_size: int, emb_dim: int, n_classes: int, units: int = 64):
+    """Arsitektur sama dengan `make_bigru_model` di notebook, panjang input bebas."""
+    tf = _tf()
+    from tensorflow.keras.layers import Bidirectional, Dense, Dropout, Embedding, GRU, Input
+    from tensorflow.keras.models import Model
+
+    inp = Input(shape=(None,), dtype="int32")
+    x = Embedding(input_dim=vocab_size, output_dim=emb_dim, trainable=False, mask_zero=True)(inp)
+    x = Bidirectional(GRU(units, return_sequences=False))(x)
+    x = Dropout(0.3)(x)
+    out = Dense(n_classes, activation="softmax")(x)
+    model = Model(inp, out)
+    model.trainable = False
+    return model, tf
+
+
+class KerasStyleTokenizer:
+    """Versi ringan `Tokenizer.texts_to_sequences` (lower, filter tanda baca, split spasi)."""
+
+    def __init__(self, word_index: dict[str, int], oov_token: str | None = "<OOV>"):
+        self.word_index = word_index
+        self.oov_index = word_index.get(oov_token) if oov_token else None
+        self._table = str.maketrans({c: " " for c in KERAS_FILTERS})
+
+    def text_to_sequence(self, text: str) -> list[int]:
+        words = [w for w in str(text).lower().translate(self._table).split(" ") if w]
+        wi, oov = self.word_index, self.oov_index
+        if oov is None:
+            return [wi[w] for w in words if w in wi]
+        return [wi.get(w, oov) for w in words]
+
+    def texts_to_sequences(self, texts) -> list[list[int]]:
+        return [self.text_to_sequence(t) for t in texts]
+
+
+class AppModel:
+    """Tokenizer + Bi-GRU satu aplikasi."""
+
+    def __init__(self, folder: str):
+        with open(os.path.join(folder, "config.json"), encoding="utf-8") as f:
+            self.config = json.load(f)
+        with open(os.path.join(folder, "vocab.json"), encoding="utf-8") as f:
+            word_index = json.load(f)
+        self.folder = folder
+        self.max_len = int(self.config["max_len"])
+        self.classes = list(self.config["classes"])
+        self.tokenizer = KerasStyleTokenizer(word_index, self.config.get("oov_token", "<OOV>"))
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        with self._lock:
+            if self._model is None:
+                cfg = self.config
+                model, tf = build_bigru(
+                    int(cfg["vocab_size"]), int(cfg["emb_dim"]), len(self.classes),
+                    int(cfg.get("units", 64)),
+                )
+                model.load_weights(os.path.join(self.folder, WEIGHTS_FILE))
+                # graph sekali per bentuk batch, tanpa overhead model.predict
+                self._predict_fn = tf.function(lambda x: model(x, training=False), reduce_retracing=True)
+                self._model = model
+            return self._model
+
+    def predict_proba(self, texts, batch_size: int = DEFAULT_BATCH_SIZE) -> np.ndarray:
+        """
+        Probabilitas kelas untuk banyak teks. Teks diurutkan per panjang
+        sekuens lalu diproses per micro-batch yang hanya di-pad sampai
+        panjang terpanjang di bucket-nya (maks. `max_len`, truncating post).
+        """
+        seqs = [s[:self.max_len] for s in self.tokenizer.texts_to_sequences(texts)]
+        n = len(seqs)
+        probs = np.zeros((n, len(self.classes)), dtype=np.float32)
+        if n == 0:
+            return probs
+        self.model  # pastikan model & fungsi prediksi siap
+
+        lengths = np.fromiter((len(s) for s in seqs), dtype=np.int64, count=n)
+        order = np.argsort(lengths, kind="stable")
+        start = 0
+        while start < n:
+            # batch berisi teks dengan panjang ter-bucket yang sama
+            bucket = -(-max(int(lengths[order[start]]), 1) // BUCKET_STEP) * BUCKET_STEP
+            end = start
+            while end < n and end - start < batch_size and lengths[order[end]] <= bucket:
+                end += 1
+            idx = order[start:end]
+            width = min(bucket, self.max_len)
+            x = np.zeros((len(idx), width), dtype=np.int32)  # padding="post"
+            for row, i in enumerate(idx):
+                s = seqs[i]
+                x[row, :len(s)] = s
+            probs[idx] = self._predict_fn(x).numpy()
+            start = end
+        return probs
+
+    def predict(self, texts, batch_size: int = DEFAULT_BATCH_SIZE) -> list[str]:
+        probs = self.predict_proba(texts, batch_size)
+        return [self.classes[i] for i in probs.argmax(axis=1)]
+
+
+class ModelBundle:
+    """Kumpulan model per aplikasi (dimuat lazily, sekali per proses)."""
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, BUNDLE_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.path = path
+        self.folders: dict[str, str] = meta["apps"]
+        self.default_app: str = meta.get("default") or next(iter(self.folders))
+        self._apps: dict[str, AppModel] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def apps(self) -> list[str]:
+        return list(self.folders)
+
+    def get(self, app: str | None = None) -> AppModel:
+        app = app or self.default_app
+        if app not in self.folders:
+            raise KeyError(f"Model untuk aplikasi '{app}' tidak ada (tersedia: {', '.join(self.apps)})")
+        with self._lock:
+            if app not in self._apps:
+                self._apps[app] = AppModel(os.path.join(self.path, self.folders[app]))
+            return self._apps[app]
+
+    def predict(self, texts, app: str | None = None, batch_size: int = DEFAULT_BATCH_SIZE) -> list[str]:
+        """Label sentimen untuk banyak teks memakai model aplikasi `app`."""
+        if isinstance(texts, str):
+            texts = [texts]
+        return self.get(app).predict(list(texts), batch_size)
+
+    def predict_one(self, text: str, app: str | None = None) -> str:
+        return self.predict([text], app)[0]
+
+
+_BUNDLES: dict[str, ModelBundle] = {}
+_BUNDLES_LOCK = threading.Lock()
+
+
+def bundle_available(path: str | None = None) -> bool:
+    return os.path.exists(os.path.join(path or default_model_dir(), BUNDLE_FILE))
+
+
+def load_bundle(path: str | None = None) -> ModelBundle:
+    """ModelBundle bersama per proses untuk folder `path`."""
+    path = os.path.abspath(path or default_model_dir())
+    with _BUNDLES_LOCK:
+        if path not in _BUNDLES:
+            _BUNDLES[path] = ModelBundle(path)
+        return _BUNDLES[path]
+
+
+# ============================================================
+# Ekspor bundle (dipanggil dari notebook / skrip pelatihan)
+# ============================================================
+def save_app_bundle(path: str, app: str, tokenizer, model, max_len: int, classes,
+                    emb_dim: int, units: int = 64, default: bool = False) -> str:
+    """
+    Simpan tokenizer Keras + bobot Bi-GRU satu aplikasi ke bundle `path`
+    dan daftarkan di bundle.json. Kembalikan folder aplikasi.
+    """
+    folder = app.lower()
+    app_dir = os.path.join(path, folder)
+    os.makedirs(app_dir, exist_ok=True)
+
+    with open(os.path.join(app_dir, "vocab.json"), "w", encoding="utf-8") as f:
+        json.dump(tokenizer.word_index, f, ensure_ascii=False)
+    with open(os.path.join(app_dir, "config.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "max_len": int(max_len),
+            "classes": [str(c) for c in classes],
+            "emb_dim": int(emb_dim),
+            "vocab_size": len(tokenizer.word_index) + 1,
+            "units": int(units),
+            "oov_token": tokenizer.oov_token,
+        }, f, ensure_ascii=False, indent=2)
+    model.save_weights(os.path.join(app_dir, WEIGHTS_FILE))
+
+    meta_path = os.path.join(path, BUNDLE_FILE)
+    meta = {"apps": {}, "default": None}
+    if os.path.exists(meta_path):
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+    meta["apps"][app] = folder
+    if default or not meta.get("default"):
+        meta["default"] = app
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    return app_dir
@@ -0,0 +1,281 @@
+"""
+Filter bahasa Inggris (pengganti `Series.apply(is_english)` di CELL 5).
+
+Setiap teks diputuskan bertahap:
+1. Kasus jelas diputuskan murah dari rasio kata fungsi / kata ulasan
+   Indonesia vs Inggris (mis. "barang sampai cepat" → ID,
+   "easy to use, good app" → EN).
+2. Hanya teks yang ambigu (kata Indonesia & Inggris seimbang, atau tidak
+   ada kata yang dikenal) yang diteruskan ke `langdetect` (seed 0).
+
+Keputusan di-cache per hash teks, teks duplikat hanya diputuskan sekali,
+dan teks ambigu dalam jumlah besar dibagi ke beberapa proses.
+`strict=True` melewati tahap 1 sehingga hasilnya sama persis dengan CELL 5.
+"""
+import atexit
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+MIN_PARALLEL_TEXTS = 500    # teks ambigu di bawah ini dideteksi serial
+DEFAULT_CACHE_SIZE = 200_000
+
+ID_WORDS = frozenset("""
+ada adalah agak agar aja aj akan aku anda apa apakah apk aplikasi atau ayo
+bagaimana bagus baik banget bgt banyak bantu barang baru bayar beli belum benar
+berapa bisa blm bnyk boleh buat buruk cepat cuma dah dalam dan dapat dari deh
+dengan di dia dong dpt dulu emang enak engga enggak gak ga gimana gitu hanya
+harga harus hrs ini itu jadi jangan jd jelek juga jg kalau kalo kami kamu kan
+karena kasih kecewa kenapa kok kurang ke kembali ketika kirim lagi lah lama
+lambat lebih lg makasih mana mantap mantul masih mau membantu mudah murah
+nya nggak ngga ok oke pada paket para pelayanan pengiriman penjual produk puas
+pun saja saat sampai sangat satu saya sdh sekali selalu semoga sempurna sih
+sama sampe sering sudah suka tapi tdk tak terima terus tetap tidak tolong
+toko trus udah untuk utk walau yang yg
+""".split())
+
+EN_WORDS = frozenset("""
+a about after all also am an and any app apps are as at bad be been best but by
+can cannot could customer delivery did do does dont easy even every excellent
+fast for from get give good great has have help how i if in is it its just like
+love me more most much my need nice no not now of on one only or our please
+really recommend recommended service shopping should so some such thank thanks
+that the their them then there they this to too use useful very was we well
+were what when which why will with worst would you your
+""".split())
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+_POOL: tuple[int, ProcessPoolExecutor] | None = None  # (workers, pool)
+_POOL_LOCK = threading.Lock()
+
+
+# ============================================================
+# Tahap 1: klasifikasi cepat
+# ============================================================
+def quick_decide(text: str) -> bool | None:
+    """
+    True (Inggris) / False (bukan Inggris) untuk kasus jelas, None bila
+    ambigu. Teks < 3 karakter dan teks tanpa huruf dianggap bukan Inggris
+    (sama dengan CELL 5: langdetect gagal → False).
+    """
+    t = str(text).strip()
+    if len(t) < 3:
+        return False
+    words = _WORD_RE.findall(t.lower())
+    if not words:
+        return False
+    n_id = sum(w in ID_WORDS for w in words)
+    n_en = sum(w in EN_WORDS for w in words)
+    if n_id and not n_en:
+        return False
+    if n_en >= 2 and not n_id and n_en * 5 >= len(words) * 2:
+        return True
+    if n_id >= 2 and n_id >= 2 * n_en:
+        return False
+    if n_en >= 3 and n_en >= 3 * n_id:
+        return True
+    return None
+
+
+# ============================================================
+# Tahap 2: langdetect (hanya untuk teks ambigu)
+# ============================================================
+def _detect_english(texts: list[str]) -> list[bool]:
+    from langdetect import DetectorFactory, detect
+
+    DetectorFactory.seed = 0
+    out = []
+    for text in texts:
+        t = str(text).strip()
+        try:
+            out.append(len(t) >= 3 and detect(t) == "en")
+        except Exception:
+            out.append(False)
+    return out
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Pool spawn ringan (tanpa Sastrawi) khusus langdetect."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None or _POOL[0] != workers:
+            if _POOL is not None:
+                _POOL[1].shutdown(wait=False)
+            _POOL = (workers, ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")))
+        return _POOL[1]
+
+
+def shutdown_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL[1].shutdown(wait=False, cancel_futures=True)
+            _POOL = None
+
+
+atexit.register(shutdown_pool)
+
+
+def _detect_many(texts: list[str], workers: int) -> list[bool]:
+    if workers <= 1 or len(texts) < MIN_PARALLEL_TEXTS:
+        return _detect_english(texts)
+    size = -(-len(texts) // (workers * 4))
+    chunks = [texts[i:i + size] for i in range(0, len(texts), size)]
+    out: list[bool] = []
+    for part in _get_pool(workers).map(_detect_english, chunks):
+        out.extend(part)
+    return out
+
+
+# ============================================================
+# API
+# ============================================================
+class LanguageFilter:
+    """Filter bahasa Inggris dengan cache keputusan per hash teks."""
+
+    def __init__(self, strict: bool = False, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.strict = strict
+        self.maxsize = maxsize
+        self._cache: OrderedDict[bytes, bool] = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts = {"texts": 0, "cached": 0, "quick": 0, "detector": 0}
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def is_english_many(self, texts, workers: int = 1) -> list[bool]:
+        """Keputusan Inggris (True) / bukan (False) untuk banyak teks, urutan tetap."""
+        texts = [str(t) for t in texts]
+        keys = [self._key(t) for t in texts]
+        decided: dict[bytes, bool] = {}
+        pending: dict[bytes, str] = {}
+        n_cached = n_quick = 0
+
+        with self._lock:
+            for k, t in zip(keys, texts):
+                if k in decided or k in pending:
+                    continue
+                hit = self._cache.get(k)
+                if hit is not None:
+                    self._cache.move_to_end(k)
+                    decided[k] = hit
+                    n_cached += 1
+                    continue
+                quick = None if self.strict else quick_decide(t)
+                if quick is None:
+                    pending[k] = t
+                else:
+                    decided[k] = quick
+                    n_quick += 1
+
+        if pending:
+            decided.update(zip(pending, _detect_many(list(pending.values()), workers)))
+
+        with self._lock:
+            for k, v in decided.items():
+                self._cache[k] = v
+                self._cache.move_to_end(k)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+            self._counts["texts"] += len(texts)
+            self._counts["cached"] += n_cached
+            self._counts["quick"] += n_quick
+            self._counts["detector"] += len(pending)
+        return [decided[k] for k in keys]
+
+    def is_english(self, text: str) -> bool:
+        return self.is_english_many([text])[0]
+
+    def stats(self) -> dict:
+        return dict(self._counts, size=len(self._cache))
+
+
+_FILTERS: dict[bool, LanguageFilter] = {}
+
+
+def get_language_filter(strict: bool = False) -> LanguageFilter:
+    """LanguageFilter bersama per proses (satu untuk mode cepat, satu untuk strict)."""
+    if strict not in _FILTERS:
+        _FILTERS[strict] = LanguageFilter(strict=strict)
+    return _FILTERS[strict]
+
+
+def active_filters() -> dict[bool, LanguageFilter]:
+    """Filter yang sudah dibuat di proses ini ({strict: LanguageFilter})."""
+    return dict(_FILTERS)
+
+
+def english_mask(texts, workers: int = 1, strict: bool = False) -> pd.Series:
+    """Mask boolean (True = Inggris) dengan index yang sama dengan `texts`."""
+    texts = texts if isinstance(texts, pd.Series) else pd.Series(list(texts), dtype=object)
+    flags = get_language_filter(strict).is_english_many(texts.astype(str), workers=workers)
+    return pd.Series(flags, index=texts.index, dtype=bool)
+
+
+def split_english(df: pd.DataFrame, text_col: str, workers: int = 1,
+                  strict: bool = False) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """(df_id, df_en): baris bukan Inggris dan baris Inggris, urutan asli."""
+    mask_en = english_mask(df[text_col], workers=workers, strict=strict)
+    return df.loc[~mask_en].copy(), df.loc[mask_en].copy()
+
+
+def filter_csv(path: str, out_dir: str, app: str, text_col: str,
+               workers: int = 1, strict: bool = False) -> dict:
+    """
+    Pisahkan CSV seperti CELL 5: tulis `<app>_idonly.csv` dan
+    `<app>_removed_english.csv` ke `out_dir`, kembalikan ringkasan
+    (path & jumlah baris) untuk meta.json.
+    """
+    df = pd.read_csv(path)
+    df_id, df_en = split_english(df, text_col, workers=workers, strict=strict)
+    out_id = os.path.join(out_dir, f"{app.lower()}_idonly.csv")
+    out_en = os.path.join(out_dir, f"{app.lower()}_removed_english.csv")
+    df_id.to_csv(out_id, index=False)
+    df_en.to_csv(out_en, index=False)
+    return {
+        "idonly_path": out_id,
+        "removed_en_path": out_en,
+        "n_total": int(len(df)),
+        "n_removed_en": int(len(df_en)),
+        "n_used_id": int(len(df_id)),
+    }
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(
+        prog="python -m sentinex.langfilter",
+        description="Pisahkan ulasan berbahasa Inggris (format _idonly / _removed_english CELL 5).",
+    )
+    ap.add_argument("inputs", nargs="+", help="CSV per aplikasi, format APP=path.csv")
+    ap.add_argument("-c", "--column", default="content", help="kolom teks (default: %(default)s)")
+    ap.add_argument("-o", "--out-dir", required=True)
+    ap.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--strict", action="store_true", help="selalu pakai langdetect (sama persis CELL 5)")
+    args = ap.parse_args(argv)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    for item in args.inputs:
+        app, _, path = item.partition("=")
+        if not path:
+            raise SystemExit(f"Format masukan harus APP=path.csv: {item}")
+        info = filter_csv(path, args.out_dir, app, args.column, args.workers, args.strict)
+        print(f"🧹 {app}: total={info['n_total']} | EN dibuang={info['n_removed_en']} | "
+              f"ID dipakai={info['n_used_id']}")
+    print(json.dumps(get_language_filter(args.strict).stats()))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
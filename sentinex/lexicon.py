@@ -0,0 +1,165 @@
+"""
+Mesin skor leksikon sentimen berbasis indeks token.
+
+Leksikon dibangun sekali menjadi indeks hash: kata tunggal → entri, dan
+token pertama frasa → daftar frasa (mis. "tidak sesuai"). Setiap teks
+dipindai satu kali per token sehingga biaya tidak tumbuh mengikuti ukuran
+leksikon, dan hanya kata utuh yang cocok ("ok" tidak lagi cocok di
+dalam "tokopedia").
+"""
+import csv
+from typing import NamedTuple
+
+# naik bila aturan pencocokan berubah (ikut fingerprint cache hasil sentimen)
+MATCHING_VERSION = 2  # 2: frasa terpanjang menggantikan kata penyusunnya
+
+
+class Score(NamedTuple):
+    positive: float
+    negative: float
+    profane: bool
+
+
+class Lexicon:
+    """
+    Leksikon berbobot: bobot > 0 = positif, bobot < 0 = negatif.
+    Setiap entri dihitung paling banyak sekali per teks.
+    """
+
+    def __init__(self, entries: dict[str, float] | None = None, profanity=()):
+        self.weights: list[float] = []
+        self.terms: list[str] = []
+        self._words: dict[str, int] = {}
+        self._phrases: dict[str, list[tuple[tuple[str, ...], int]]] = {}
+        self.profanity: set[str] = set()
+        self.version = 0  # naik setiap leksikon berubah (fingerprint cache)
+        if entries:
+            self.add(entries)
+        self.add_profanity(profanity)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def add(self, entries: dict[str, float]) -> "Lexicon":
+        """Tambah / timpa entri {kata atau frasa: bobot}."""
+        for term, weight in entries.items():
+            key = tuple(str(term).strip().lower().split())
+            if not key:
+                continue
+            text = " ".join(key)
+            idx = self._index_of(key)
+            if idx is None:
+                idx = len(self.terms)
+                self.terms.append(text)
+                self.weights.append(float(weight))
+                if len(key) == 1:
+                    self._words[key[0]] = idx
+                else:
+                    self._phrases.setdefault(key[0], []).append((key[1:], idx))
+            else:
+                self.weights[idx] = float(weight)
+        self.version += 1
+        return self
+
+    def add_profanity(self, words) -> "Lexicon":
+        """Kata kasar: bila muncul, teks langsung dianggap Negatif."""
+        self.profanity.update(str(w).strip().lower() for w in words if str(w).strip())
+        self.version += 1
+        return self
+
+    def _index_of(self, key: tuple[str, ...]) -> int | None:
+        if len(key) == 1:
+            return self._words.get(key[0])
+        for tail, idx in self._phrases.get(key[0], ()):
+            if tail == key[1:]:
+                return idx
+        return None
+
+    # ------------------------------------------------------------
+    # Konstruktor
+    # ------------------------------------------------------------
+    @classmethod
+    def from_lists(cls, pos, neg, profanity=()) -> "Lexicon":
+        """Leksikon tanpa bobot: kata positif = +1, kata negatif = -1."""
+        lex = cls({w: 1.0 for w in pos}, profanity)
+        return lex.add({w: -1.0 for w in neg})
+
+    @classmethod
+    def from_file(cls, path: str, encoding: str = "utf-8") -> "Lexicon":
+        """
+        Muat leksikon berbobot dari CSV/TSV dua kolom (kata, bobot),
+        mis. format InSet `positive.tsv` / `negative.tsv`. Baris yang
+        bobotnya bukan angka (header) dilewati.
+        """
+        delimiter = "\t" if path.lower().endswith(".tsv") else ","
+        entries = {}
+        with open(path, newline="", encoding=encoding) as f:
+            for row in csv.reader(f, delimiter=delimiter):
+                if len(row) < 2:
+                    continue
+                try:
+                    entries[row[0]] = float(row[1])
+                except ValueError:
+                    continue
+        return cls(entries)
+
+    def update(self, other: "Lexicon") -> "Lexicon":
+        """Gabungkan leksikon lain ke leksikon ini."""
+        self.add(dict(zip(other.terms, other.weights)))
+        return self.add_profanity(other.profanity)
+
+    # ------------------------------------------------------------
+    # Skor
+    # ------------------------------------------------------------
+    def score(self, text: str) -> Score:
+        """
+        Skor satu teks dalam satu lintasan token. Frasa terpanjang yang
+        cocok menggantikan kata penyusunnya ("tidak sesuai" tidak ikut
+        menghitung "sesuai"); kata kasar dicek di semua token.
+        """
+        tokens = text.lower().split()
+        words, phrases, weights = self._words, self._phrases, self.weights
+        seen: set[int] = set()
+        profane = not self.profanity.isdisjoint(tokens)
+        i, n = 0, len(tokens)
+        while i < n:
+            tok = tokens[i]
+            best, size = None, 0
+            for tail, idx in phrases.get(tok, ()):
+                if len(tail) > size and tuple(tokens[i + 1:i + 1 + len(tail)]) == tail:
+                    best, size = idx, len(tail)
+            if best is None:
+                best = words.get(tok)
+            if best is not None:
+                seen.add(best)
+            i += 1 + size
+
+        pos = neg = 0.0
+        for idx in seen:
+            w = weights[idx]
+            if w > 0:
+                pos += w
+            else:
+                neg -= w
+        return Score(pos, neg, profane)
+
+    def score_many(self, texts) -> list[Score]:
+        """Skor banyak teks sekaligus."""
+        return [self.score(t) for t in texts]
+
+    @staticmethod
+    def decide(score: Score) -> str:
+        """Skor → label Positif / Negatif / Netral."""
+        if score.profane:
+            return "Negatif"
+        if score.positive > score.negative:
+            return "Positif"
+        elif score.negative > score.positive:
+            return "Negatif"
+        return "Netral"
+
+    def label(self, text: str) -> str:
+        return self.decide(self.score(text))
+
+    def label_many(self, texts) -> list[str]:
+        return [self.decide(s) for s in self.score_many(texts)]
@@ -0,0 +1,128 @@
+"""
+Load generator untuk `sentinex.api` (asyncio, koneksi keep-alive).
+
+Mengirim `-n` permintaan dengan `-c` koneksi bersamaan memakai teks ulasan
+dari korpus berlabel, lalu melaporkan throughput, latensi p50/p95/p99/maks
+dan jumlah respons per status (503 = ditolak backpressure).
+
+Contoh:
+    python -m sentinex.loadgen --url http://127.0.0.1:8000 -c 64 -n 5000
+    python -m sentinex.loadgen --endpoint /sentiment/batch --batch-size 100 -n 200
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from .bench import CORPORA, load_corpus
+
+
+async def _request(reader, writer, host: str, path: str, payload: dict) -> tuple[int, dict]:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    data = await reader.readexactly(length) if length else b"{}"
+    return status, json.loads(data)
+
+
+async def _client(url, path: str, jobs: asyncio.Queue, latencies: list, statuses: Counter,
+                  server_ms: list) -> None:
+    reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+    try:
+        while True:
+            try:
+                payload = jobs.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            t0 = time.perf_counter()
+            status, data = await _request(reader, writer, url.netloc, path, payload)
+            latencies.append(time.perf_counter() - t0)
+            statuses[status] += 1
+            if status == 200:
+                server_ms.append(data["timings"])
+    finally:
+        writer.close()
+
+
+async def run_load(url: str, endpoint: str, texts: list[str], n: int, concurrency: int,
+                   batch_size: int = 1, seed: int = 0) -> dict:
+    """Jalankan beban lalu kembalikan ringkasan (throughput & latensi dalam ms)."""
+    rng = random.Random(seed)
+    jobs: asyncio.Queue = asyncio.Queue()
+    for _ in range(n):
+        if endpoint == "/sentiment/batch":
+            jobs.put_nowait({"texts": rng.choices(texts, k=batch_size)})
+        else:
+            jobs.put_nowait({"text": rng.choice(texts)})
+
+    parsed = urlsplit(url)
+    latencies, statuses, server = [], Counter(), []
+    t0 = time.perf_counter()
+    await asyncio.gather(*[
+        _client(parsed, endpoint, jobs, latencies, statuses, server)
+        for _ in range(min(concurrency, n))
+    ])
+    elapsed = time.perf_counter() - t0
+
+    lat = np.array(latencies) * 1000
+    texts_per_req = batch_size if endpoint == "/sentiment/batch" else 1
+    ok = statuses.get(200, 0)
+    return {
+        "endpoint": endpoint,
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "requests_per_s": round(len(latencies) / elapsed, 1),
+        "texts_per_s": round(ok * texts_per_req / elapsed, 1),
+        "latency_ms": {
+            q: round(float(np.percentile(lat, p)), 2) if len(lat) else None
+            for q, p in (("p50", 50), ("p95", 95), ("p99", 99), ("max", 100))
+        },
+        "mean_batch_size": round(float(np.mean([s["batch_size"] for s in server])), 1) if server else None,
+        "mean_queue_ms": round(float(np.mean([s["queue_ms"] for s in server])), 2) if server else None,
+        "status": dict(statuses),
+    }
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m sentinex.loadgen",
+                                 description="Uji beban HTTP API SENTINEX di localhost.")
+    ap.add_argument("--url", default="http://127.0.0.1:8000")
+    ap.add_argument("--endpoint", default="/sentiment",
+                    choices=["/sentiment", "/preprocess", "/sentiment/batch"])
+    ap.add_argument("-n", "--requests", type=int, default=2000)
+    ap.add_argument("-c", "--concurrency", type=int, default=32)
+    ap.add_argument("--batch-size", type=int, default=50, help="teks per permintaan /sentiment/batch")
+    ap.add_argument("--root", default=".", help="folder repo berisi korpus berlabel")
+    ap.add_argument("-o", "--output", help="simpan ringkasan JSON ke file ini")
+    args = ap.parse_args(argv)
+
+    texts = load_corpus(CORPORA["labelled"], args.root) or ["aplikasi bagus, pengiriman cepat"]
+    report = asyncio.run(run_load(args.url, args.endpoint, texts, args.requests,
+                                  args.concurrency, args.batch_size))
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0 if report["status"].get(200, 0) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,170 @@
+"""
+Instrumentasi tahap pipeline: waktu, jumlah baris, selisih memori.
+
+    with stage("cleaning", rows=len(texts)):
+        ...
+
+Setiap tahap menambah akumulator per nama (jumlah panggilan, baris,
+detik, selisih RSS). Hasilnya bisa dibaca sebagai tabel (`snapshot`),
+diekspor ke format teks Prometheus (`to_prometheus`) dan dicatat sebagai
+log JSON lewat logger `sentinex.metrics` (level INFO).
+
+Di worker process pool, metrik dikumpulkan lalu dikirim balik bersama
+hasil chunk (`drain` → `merge`), sehingga detiknya adalah total waktu
+CPU worker, bukan waktu dinding.
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("sentinex.metrics")
+
+_FIELDS = ("calls", "rows", "seconds", "max_seconds", "rss_delta")
+
+
+def rss_bytes() -> int:
+    """RSS proses saat ini (byte); di luar Linux: puncak RSS seumur proses."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource
+
+        # ru_maxrss: KB di Linux, byte di macOS
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+class StageRecord:
+    __slots__ = ("rows",)
+
+    def __init__(self, rows: int = 0):
+        self.rows = rows
+
+
+class Metrics:
+    """Akumulator metrik per tahap (thread-safe)."""
+
+    def __init__(self):
+        self._stages: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, rows: int = 0, rss_delta: int = 0) -> None:
+        with self._lock:
+            s = self._stages.setdefault(name, dict.fromkeys(_FIELDS, 0))
+            s["calls"] += 1
+            s["rows"] += int(rows)
+            s["seconds"] += seconds
+            s["max_seconds"] = max(s["max_seconds"], seconds)
+            s["rss_delta"] += int(rss_delta)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({"stage": name, "seconds": round(seconds, 6),
+                                    "rows": int(rows), "rss_delta": int(rss_delta)}))
+
+    @contextmanager
+    def stage(self, name: str, rows: int = 0):
+        """Ukur blok `with`; jumlah baris bisa diisi belakangan lewat `.rows`."""
+        rec = StageRecord(rows)
+        rss0 = rss_bytes()
+        t0 = time.perf_counter()
+        try:
+            yield rec
+        finally:
+            self.record(name, time.perf_counter() - t0, rec.rows, rss_bytes() - rss0)
+
+    def merge(self, stages: dict[str, dict]) -> None:
+        """Tambahkan hasil `drain()` dari proses lain."""
+        with self._lock:
+            for name, other in stages.items():
+                s = self._stages.setdefault(name, dict.fromkeys(_FIELDS, 0))
+                for key in ("calls", "rows", "seconds", "rss_delta"):
+                    s[key] += other[key]
+                s["max_seconds"] = max(s["max_seconds"], other["max_seconds"])
+
+    def snapshot(self) -> dict[str, dict]:
+        """{tahap: {calls, rows, seconds, max_seconds, rss_delta, rows_per_s}}, urutan pertama kali tercatat."""
+        with self._lock:
+            out = {name: dict(s) for name, s in self._stages.items()}
+        for s in out.values():
+            s["rows_per_s"] = s["rows"] / s["seconds"] if s["seconds"] and s["rows"] else None
+        return out
+
+    def drain(self) -> dict[str, dict]:
+        """Ambil lalu kosongkan akumulator (untuk dikirim dari worker)."""
+        with self._lock:
+            out, self._stages = self._stages, {}
+        return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+
+    def to_prometheus(self, prefix: str = "sentinex") -> str:
+        """Ekspor format teks Prometheus (tahap + statistik cache)."""
+        lines = []
+
+        def metric(name, kind, help_, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                lab = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"{prefix}_{name}{{{lab}}} {value:g}" if lab else f"{prefix}_{name} {value:g}")
+
+        snap = self.snapshot()
+        for field, name, help_ in [
+            ("calls", "stage_calls_total", "Jumlah eksekusi tahap"),
+            ("rows", "stage_rows_total", "Jumlah baris yang diproses tahap"),
+            ("seconds", "stage_seconds_total", "Total waktu tahap (detik)"),
+            ("rss_delta", "stage_rss_delta_bytes_total", "Total selisih RSS selama tahap (byte)"),
+        ]:
+            metric(name, "counter", help_, [({"stage": k}, v[field]) for k, v in snap.items()])
+        metric("stage_max_seconds", "gauge", "Waktu eksekusi tahap terlama (detik)",
+               [({"stage": k}, v["max_seconds"]) for k, v in snap.items()])
+
+        caches = cache_stats()
+        metric("cache_hit_ratio", "gauge", "Rasio hit cache",
+               [({"cache": k}, v["hit_rate"]) for k, v in caches.items()])
+        metric("cache_entries", "gauge", "Jumlah entri cache",
+               [({"cache": k}, v["size"]) for k, v in caches.items()])
+        metric("process_rss_bytes", "gauge", "RSS proses (byte)", [({}, rss_bytes())])
+        return "\n".join(lines) + "\n"
+
+
+def cache_stats() -> dict[str, dict]:
+    """Hit rate & ukuran cache stem, cache hasil, dan filter bahasa (bila sudah dipakai)."""
+    from . import langfilter
+    from .cache import get_result_cache
+    from .stemming import get_stemmer
+
+    stem = get_stemmer().stats()
+    res = get_result_cache().stats()
+    out = {
+        "stem": {"hits": stem["hits"], "misses": stem["misses"], "hit_rate": stem["hit_rate"],
+                 "size": stem["size"]},
+        "result": {"hits": res["hits"], "misses": res["misses"], "hit_rate": res["hit_rate"],
+                   "size": res["entries"]},
+    }
+    for strict, lf in langfilter.active_filters().items():
+        s = lf.stats()
+        out["langfilter_strict" if strict else "langfilter"] = {
+            "hits": s["cached"], "misses": s["texts"] - s["cached"],
+            "hit_rate": s["cached"] / s["texts"] if s["texts"] else 0.0, "size": s["size"],
+        }
+    return out
+
+
+_METRICS = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """Registry metrik bersama untuk proses ini."""
+    return _METRICS
+
+
+def stage(name: str, rows: int = 0):
+    """Ukur satu tahap di registry bersama: `with stage("stemming", rows=n): ...`."""
+    return _METRICS.stage(name, rows)
@@ -0,0 +1,122 @@
+"""
+Normalisasi slang → kata baku dalam satu lintasan per teks.
+
+Pencocokan dilakukan per token (hash lookup), bukan substring, sehingga
+"ga" tidak lagi mengubah "harga" dan biaya per ulasan tidak bertambah
+walaupun kamus berisi puluhan ribu entri. Entri multi-kata
+(mis. "gak papa") dicocokkan secara greedy terpanjang.
+"""
+import csv
+import json
+
+
+class Normalizer:
+    """Kamus slang → baku dengan lookup per token."""
+
+    def __init__(self, mapping: dict[str, str] | None = None):
+        self.words: dict[str, str] = {}
+        self.phrases: dict[tuple[str, ...], str] = {}
+        self.max_phrase = 1
+        self.version = 0  # naik setiap kamus berubah (fingerprint cache)
+        if mapping:
+            self.update(mapping)
+
+    def __len__(self) -> int:
+        return len(self.words) + len(self.phrases)
+
+    def update(self, mapping: dict[str, str]) -> "Normalizer":
+        """Tambah / timpa entri kamus."""
+        for slang, baku in mapping.items():
+            key = str(slang).strip().lower().split()
+            if not key:
+                continue
+            if len(key) == 1:
+                self.words[key[0]] = str(baku).strip()
+            else:
+                self.phrases[tuple(key)] = str(baku).strip()
+                self.max_phrase = max(self.max_phrase, len(key))
+        self.version += 1
+        return self
+
+    def to_dict(self) -> dict[str, str]:
+        """Kembalikan kamus dalam bentuk {slang: baku}."""
+        data = dict(self.words)
+        data.update({" ".join(k): v for k, v in self.phrases.items()})
+        return data
+
+    # ------------------------------------------------------------
+    # Muat kamus dari file
+    # ------------------------------------------------------------
+    @classmethod
+    def from_csv(cls, path: str, slang_col: str = "slang", baku_col: str = "formal",
+                 encoding: str = "utf-8", header: bool = True) -> "Normalizer":
+        """
+        Muat kamus dari CSV. Secara default baris pertama wajib header yang
+        memuat kolom `slang_col` dan `baku_col`; bila tidak ada, ValueError
+        (baris pertama tidak pernah diam-diam dianggap entri kamus).
+        header=False: file tanpa header, dua kolom pertama = (slang, baku)
+        dan baris pertama ikut dimuat. Entri pertama yang menang bila ganda.
+        """
+        mapping = {}
+        with open(path, newline="", encoding=encoding) as f:
+            reader = csv.reader(f)
+            if header:
+                first = next(reader, None)
+                if first is None:
+                    return cls()
+                lower = [h.strip().lower() for h in first]
+                if slang_col not in lower or baku_col not in lower:
+                    raise ValueError(
+                        f"{path}: header harus memuat kolom '{slang_col}' dan '{baku_col}' "
+                        f"(ditemukan: {first}); untuk file tanpa header pakai header=False")
+                i, j = lower.index(slang_col), lower.index(baku_col)
+            else:
+                i, j = 0, 1
+            for row in reader:
+                if len(row) > max(i, j) and row[i].strip():
+                    mapping.setdefault(row[i], row[j])
+        return cls(mapping)
+
+    @classmethod
+    def from_json(cls, path: str, encoding: str = "utf-8") -> "Normalizer":
+        """Muat kamus dari JSON berbentuk objek {slang: baku}."""
+        with open(path, encoding=encoding) as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"{path}: kamus JSON harus berupa objek {{slang: baku}}")
+        return cls(data)
+
+    @classmethod
+    def from_file(cls, path: str) -> "Normalizer":
+        """Pilih loader sesuai ekstensi (.json atau .csv)."""
+        if path.lower().endswith(".json"):
+            return cls.from_json(path)
+        return cls.from_csv(path)
+
+    # ------------------------------------------------------------
+    # Normalisasi
+    # ------------------------------------------------------------
+    def normalize(self, text: str) -> str:
+        """
+        Ganti token slang dengan bentuk baku. Spasi di awal/akhir teks
+        dipertahankan (token kosong dilewati begitu saja).
+        """
+        tokens = text.split(" ")
+        words = self.words
+        if not self.phrases:
+            return " ".join([words.get(t, t) for t in tokens])
+
+        out, i, n = [], 0, len(tokens)
+        while i < n:
+            for size in range(min(self.max_phrase, n - i), 1, -1):
+                baku = self.phrases.get(tuple(tokens[i:i + size]))
+                if baku is not None:
+                    out.append(baku)
+                    i += size
+                    break
+            else:
+                out.append(words.get(tokens[i], tokens[i]))
+                i += 1
+        return " ".join(out)
+
+    __call__ = normalize
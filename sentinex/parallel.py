@@ -0,0 +1,126 @@
+"""
+Eksekusi pipeline pre-processing + sentimen secara paralel (multi-proses).
+
+Data dipecah menjadi chunk, diproses di process pool yang worker-nya
+menyiapkan stopword remover & stemmer Sastrawi sekali saja, lalu hasilnya
+digabung kembali sesuai urutan baris asli. Metrik dan kata baru di cache
+stem worker ikut dikirim balik dan digabung ke proses induk. Input kecil tetap diproses
+serial karena biaya kirim data ke worker lebih besar daripada untungnya.
+"""
+import atexit
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .metrics import get_metrics
+from .preprocessing import preprocess_batch
+from .stemming import get_stemmer, init_worker_stemmer
+
+MIN_PARALLEL_ROWS = 2000   # di bawah ini selalu serial
+MIN_CHUNK_ROWS = 500
+CHUNKS_PER_WORKER = 4      # beberapa chunk per worker agar beban seimbang
+
+
+def default_workers() -> int:
+    """Jumlah worker default: SENTINEX_WORKERS atau jumlah core CPU."""
+    env = os.environ.get("SENTINEX_WORKERS")
+    if env:
+        return max(1, int(env))
+    return os.cpu_count() or 1
+
+
+# ============================================================
+# Sisi worker
+# ============================================================
+def _init_worker() -> None:
+    """Siapkan stemmer sekali per worker (cache stem tidak disimpan worker, lihat `_process_chunk`)."""
+    init_worker_stemmer()
+
+
+def _process_chunk(args) -> tuple[pd.DataFrame, dict, list]:
+    """Proses satu chunk; metrik tahap & entri cache stem baru worker ikut dikembalikan."""
+    index, texts, keep_intermediate, cleaned = args
+    df = preprocess_batch(pd.Series(texts, index=index, dtype=object), keep_intermediate, cleaned)
+    return df, get_metrics().drain(), get_stemmer().drain_new()
+
+
+# ============================================================
+# Pool bersama (dipakai ulang antar-pemanggilan)
+# ============================================================
+_POOLS: dict[int, ProcessPoolExecutor] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool dengan `workers` proses. Memakai konteks "spawn" karena
+    Streamlit menjalankan skrip di thread (fork + thread tidak aman).
+    """
+    with _POOLS_LOCK:
+        pool = _POOLS.get(workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+            _POOLS[workers] = pool
+        return pool
+
+
+def shutdown_pools() -> None:
+    with _POOLS_LOCK:
+        for pool in _POOLS.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _POOLS.clear()
+
+
+atexit.register(shutdown_pools)
+
+
+# ============================================================
+# API
+# ============================================================
+def preprocess_parallel(
+    texts,
+    workers: int | None = None,
+    keep_intermediate: bool = False,
+    chunksize: int | None = None,
+    min_rows: int = MIN_PARALLEL_ROWS,
+    cleaned: bool = False,
+) -> pd.DataFrame:
+    """
+    Sama seperti `preprocess_batch`, tetapi dijalankan di process pool.
+    - workers  : jumlah proses (default: `default_workers()`)
+    - chunksize: baris per chunk (default: dibagi rata ke worker)
+    - min_rows : input lebih kecil dari ini diproses serial
+    - cleaned  : `texts` sudah melewati cleaning
+    Urutan & index baris hasil sama dengan input.
+    """
+    texts = texts if isinstance(texts, pd.Series) else pd.Series(list(texts), dtype=object)
+    workers = workers or default_workers()
+    n = len(texts)
+    if workers <= 1 or n < max(min_rows, 2):
+        return preprocess_batch(texts, keep_intermediate, cleaned)
+
+    if chunksize is None:
+        chunksize = max(MIN_CHUNK_ROWS, math.ceil(n / (workers * CHUNKS_PER_WORKER)))
+    values = texts.astype(str).tolist()
+    index = texts.index
+    jobs = [
+        (index[i:i + chunksize], values[i:i + chunksize], keep_intermediate, cleaned)
+        for i in range(0, n, chunksize)
+    ]
+
+    # executor.map mempertahankan urutan chunk
+    parts = []
+    stemmer = get_stemmer()  # disimpan saat proses induk keluar
+    for df, worker_metrics, stems in get_pool(workers).map(_process_chunk, jobs):
+        parts.append(df)
+        get_metrics().merge(worker_metrics)
+        stemmer.merge(stems)
+    return pd.concat(parts)
@@ -0,0 +1,198 @@
+"""
+Pre-processing teks ulasan: cleaning → normalisasi → stopword → token → stemming.
+
+Berisi fungsi per-teks (dipakai mode Input Teks) dan `preprocess_batch`
+untuk banyak teks sekaligus (dipakai mode Upload CSV).
+"""
+import os
+import re
+
+import pandas as pd
+from Sastrawi.StopWordRemover.StopWordRemoverFactory import (
+    StopWordRemoverFactory, StopWordRemover, ArrayDictionary
+)
+
+from .metrics import stage
+from .normalizer import Normalizer
+from .sentiment import deteksi_sentimen_batch
+from .stemming import get_stemmer
+
+# ============================================================
+# 1) Kamus Normalisasi & Stopword
+# ============================================================
+norm = {
+    "nggak": "tidak", "gak": "tidak", "ga": "tidak", "ngga": "tidak", "tdk": "tidak",
+    "yg": "yang", "dr": "dari", "dgn": "dengan", "utk": "untuk", "tp": "tapi",
+    "bgt": "banget", "bngt": "banget", "bkn": "bukan", "aja": "saja", "aj": "saja",
+    "krn": "karena", "krna": "karena", "sm": "sama", "bgus": "bagus", "trnyata": "ternyata",
+    "km": "kamu", "kmu": "kamu", "sy": "saya", "gw": "saya", "ane": "saya",
+}
+normalizer = Normalizer(norm)
+
+
+def load_slang(path: str) -> int:
+    """
+    Tambahkan kamus slang eksternal (CSV/JSON) ke normalizer.
+    Entri pada `norm` tetap diutamakan. Kembalikan ukuran kamus.
+    `normalizer.version` ikut naik, sehingga fingerprint di
+    `sentinex.cache` dihitung ulang.
+    """
+    normalizer.update(Normalizer.from_file(path).to_dict())
+    normalizer.update(norm)
+    return len(normalizer)
+
+
+# Kamus slang besar opsional (mis. colloquial-indonesian-lexicon.csv)
+if os.environ.get("SENTINEX_SLANG_PATH"):
+    load_slang(os.environ["SENTINEX_SLANG_PATH"])
+
+# Tambahan stopword (kode asli, tanpa entri ganda)
+more_stop_words = [
+    "ada", "adalah", "adanya", "akan", "amat", "an", "anda", "andalah", "antara", "apa", "apaan",
+    "apakah", "apalagi", "bagi", "bahkan", "bagaimana", "bahwa", "bahwasanya", "baik", "beberapa",
+    "bagian", "banyak", "baru", "bawah", "berikut", "berbagai", "bersama", "bersama-sama", "bisa",
+    "boleh", "bukan", "kepada", "kalian", "kami", "kamu", "karena", "dari", "daripada", "dalam",
+    "dengan", "di", "dia", "dirimu", "juga", "jika", "lagi", "lain", "lalu", "mana", "maka", "atau",
+    "telah", "kemudian", "kalau", "sedang", "dan", "tapi", "dapat", "itu", "saja", "hanya", "lebih",
+    "setiap", "sangat", "sudah", "ini", "pada", "tetapi",
+]
+
+stop_words = StopWordRemoverFactory().get_stop_words()
+stop_words.extend(more_stop_words)
+new_array = ArrayDictionary(stop_words)
+stop_words_remover_new = StopWordRemover(new_array)
+
+# Set beku untuk lookup O(1); ArrayDictionary melewatkan kata kosong/spasi
+STOPWORDS = frozenset(w for w in stop_words if w and w.strip())
+_OTHER_WS = re.compile(r"[^\S ]")
+
+
+# ============================================================
+# 2) Fungsi Pre-processing (6 langkah)
+# ============================================================
+# Pola cleaning (urutan penting, dipakai versi per-teks & versi batch)
+CLEANING_STEPS = [
+    # Hapus mention, hashtag, link
+    (r'@[A-Za-z0-9_]+', ' '),
+    (r'#\w+', ' '),
+    (r'https?://\S+|www\.\S+', ' '),
+    # Hapus angka
+    (r'\d+', ' '),
+    # Hapus ekspresi tidak penting seperti 'hehe', 'wkwk', 'haha', dan kata promosi
+    (r'\b(hehe|wkwk|haha|promosi|promo|diskon|gratis ongkir|voucher|cashback)\b', ' '),
+    # Hapus simbol, tanda baca, dan emoji
+    (r'[^\w\s]', ' '),
+    # Ganti huruf berulang (baguuuus → bagus)
+    (r'(.)\1{2,}', r'\1'),
+    # Hapus spasi berlebih
+    (r'\s+', ' '),
+]
+_CLEANING_RE = [(re.compile(p), r) for p, r in CLEANING_STEPS]
+
+
+def cleaning(text):
+    for pattern, repl in _CLEANING_RE:
+        text = pattern.sub(repl, text)
+    # Ubah ke huruf kecil
+    return text.lower().strip()
+
+def normalisasi(str_text: str) -> str:
+    """Ganti slang → baku berdasar kamus norm (per kata, satu lintasan)."""
+    return normalizer.normalize(str_text)
+
+def _remove_stopwords(str_text: str) -> list[str]:
+    """
+    Sama persis dengan `StopWordRemover.remove` Sastrawi sebelum di-join:
+    list diubah sambil diiterasi, sehingga kata setelah stopword yang
+    dihapus ikut terlewat dan `list.remove` membuang kemunculan pertama.
+    Bedanya hanya lookup ke frozenset, bukan ke list ±200 kata.
+    """
+    words = str_text.split(" ")
+    i = 0
+    while i < len(words):
+        w = words[i]
+        if w in STOPWORDS:
+            words.remove(w)
+        i += 1
+    return words
+
+def stopword(str_text: str) -> str:
+    """Hapus stopword (Sastrawi + tambahan)."""
+    return " ".join(_remove_stopwords(str_text))
+
+def stopword_tokens(str_text: str) -> list[str]:
+    """`stopword(x).split()` dalam satu langkah, tanpa string antara."""
+    words = _remove_stopwords(str_text)
+    if _OTHER_WS.search(str_text):  # tab/newline dll.: ikuti str.split() persis
+        return " ".join(words).split()
+    return [w for w in words if w]
+
+def stopword_tokens_batch(texts) -> list[list[str]]:
+    """`stopword_tokens` untuk banyak teks; teks yang sama hanya diproses sekali."""
+    seen: dict[str, list[str]] = {}
+    out = []
+    for t in texts:
+        toks = seen.get(t)
+        if toks is None:
+            toks = seen[t] = stopword_tokens(t)
+        out.append(toks)
+    return out
+
+def stemming(tokens: list[str]) -> str:
+    """Stemming token (Sastrawi + cache kata → stem) lalu gabung kembali sebagai string."""
+    return get_stemmer().stem_tokens(tokens)
+
+
+# ============================================================
+# 3) Pipeline batch (banyak teks sekaligus)
+# ============================================================
+def cleaning_series(texts: pd.Series) -> pd.Series:
+    """Versi vektor dari `cleaning` memakai operasi `.str` pandas."""
+    s = texts.astype(str)
+    for pattern, repl in _CLEANING_RE:
+        s = s.str.replace(pattern, repl, regex=True)
+    return s.str.lower().str.strip()
+
+
+def preprocess_batch(texts, keep_intermediate: bool = False, cleaned: bool = False) -> pd.DataFrame:
+    """
+    Jalankan seluruh pipeline untuk banyak teks → DataFrame.
+
+    Kolom hasil: `stem`, `sentimen` (+ `clean`, `norm`, `stop`, `token`
+    bila keep_intermediate=True). Index mengikuti input bila input Series.
+    Setiap token unik di batch hanya di-stem sekali.
+    cleaned=True: `texts` sudah hasil `cleaning_series`, tahap cleaning dilewati.
+    """
+    texts = texts if isinstance(texts, pd.Series) else pd.Series(list(texts), dtype=object)
+    out = pd.DataFrame(index=texts.index)
+    n = len(texts)
+
+    with stage("cleaning", rows=n):
+        clean = texts.astype(str) if cleaned else cleaning_series(texts)
+    with stage("normalisasi", rows=n):
+        norm_s = clean.map(lambda x: normalisasi(" " + x + " "))
+    with stage("stopword", rows=n):
+        if keep_intermediate:
+            stop = norm_s.map(stopword)
+            token = stop.str.split()
+            out["clean"], out["norm"], out["stop"], out["token"] = clean, norm_s, stop, token
+            del stop
+        else:
+            token = pd.Series(stopword_tokens_batch(norm_s.tolist()), index=texts.index, dtype=object)
+    del clean, norm_s
+
+    # Stem per kata unik, lalu petakan kembali ke setiap baris
+    with stage("stemming", rows=n):
+        vocab = {w for toks in token for w in toks}
+        stems = get_stemmer().stem_many(vocab)
+        stem = token.map(lambda toks: " ".join([stems[w] for w in toks]))
+    if not keep_intermediate:
+        del token
+
+    # Sentimen dihitung sekali per teks stem unik
+    with stage("sentimen", rows=n):
+        uniq = stem.unique()
+        labels = dict(zip(uniq, deteksi_sentimen_batch(uniq)))
+        out["stem"] = stem
+        out["sentimen"] = stem.map(labels)
+    return out
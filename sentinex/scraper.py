@@ -0,0 +1,307 @@
+"""
+Scraping ulasan Google Play per halaman (continuation token) yang bisa
+dilanjutkan (resume) dan dijalankan untuk beberapa aplikasi sekaligus.
+
+- Setiap halaman langsung disimpan ke checkpoint (JSONL + state JSON),
+  sehingga scraping yang gagal di tengah jalan bisa dilanjutkan dan
+  permintaan `count` yang lebih kecil cukup memakai data yang sudah ada.
+- Beberapa package diproses paralel dengan thread pool berbatas; semua
+  permintaan ke host yang sama melewati rate limiter bersama.
+- Client bisa diganti (mis. `StubPlayClient` lokal untuk tes): cukup
+  objek dengan method `fetch_page(package_id, lang, country, sort_key,
+  count, filter_score, token) -> (list[dict], token | None)`.
+"""
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from .config import cache_path
+
+PAGE_SIZE = 200            # batas per halaman dari Google Play
+DEFAULT_MAX_AGE = 6 * 3600  # checkpoint lebih tua dari ini dianggap basi
+GPLAY_HOST = "play.google.com"
+
+# Package ID 4 aplikasi yang dianalisis
+PACKAGES = {
+    "Blibli": "blibli.mobile.commerce",
+    "Tokopedia": "com.tokopedia.tkpd",
+    "Lazada": "com.lazada.android",
+    "Shopee": "com.shopee.id",
+}
+
+COLUMNS = ["review_id", "user", "rating", "date", "text"]
+
+
+# ============================================================
+# Client Google Play
+# ============================================================
+class ScraperCompatError(RuntimeError):
+    """Versi google_play_scraper terpasang tidak cocok dengan adapter ini."""
+
+
+class GooglePlayClient:
+    """
+    Adapter tipis di atas `google_play_scraper.reviews`.
+
+    Melanjutkan halaman butuh `_ContinuationToken` (API privat library);
+    pemakaiannya hanya ada di `_continuation` dan `_token_of`, yang
+    melempar `ScraperCompatError` bila bentuknya berubah, alih-alih diam-diam
+    berhenti setelah halaman pertama.
+    """
+
+    host = GPLAY_HOST
+
+    def fetch_page(self, package_id, lang, country, sort_key, count, filter_score, token):
+        from google_play_scraper import Sort, reviews
+
+        sort = Sort.NEWEST if str(sort_key).upper() == "NEWEST" else Sort.MOST_RELEVANT
+        cont = self._continuation(token, lang, country, sort, count, filter_score) if token else None
+        result, cont = reviews(
+            package_id,
+            lang=lang,
+            country=country,
+            sort=sort,
+            count=count,
+            filter_score_with=filter_score,
+            continuation_token=cont,
+        )
+        return result, self._token_of(cont)
+
+    @staticmethod
+    def _continuation(token, lang, country, sort, count, filter_score):
+        """Token string → objek continuation google_play_scraper."""
+        try:
+            from google_play_scraper.features.reviews import _ContinuationToken
+
+            return _ContinuationToken(token, lang, country, sort, count, filter_score, None)
+        except (ImportError, TypeError) as e:
+            raise ScraperCompatError(
+                f"google_play_scraper tidak lagi menyediakan _ContinuationToken yang dikenal: {e}"
+            ) from e
+
+    @staticmethod
+    def _token_of(cont) -> str | None:
+        """Objek continuation → token string (None = halaman terakhir)."""
+        if cont is None:
+            return None
+        if not hasattr(cont, "token"):
+            raise ScraperCompatError(
+                f"continuation token {type(cont).__name__} tidak punya atribut 'token'"
+            )
+        return cont.token
+
+
+class StubPlayClient:
+    """
+    Client lokal tanpa jaringan (tes / demo offline) dengan antarmuka yang
+    sama: ulasan diambil dari `reviews` {package_id: [ulasan mentah]},
+    token = posisi halaman berikutnya. Setiap panggilan dicatat di `calls`
+    (package_id, count, token, waktu); `fail_after` = gagal setelah N panggilan.
+    """
+
+    def __init__(self, reviews: dict, host: str = "stub.local", fail_after: int | None = None):
+        self.reviews = reviews
+        self.host = host
+        self.fail_after = fail_after
+        self.calls: list[tuple] = []
+        self._lock = threading.Lock()
+
+    def fetch_page(self, package_id, lang, country, sort_key, count, filter_score, token):
+        with self._lock:
+            self.calls.append((package_id, count, token, time.monotonic()))
+            if self.fail_after is not None and len(self.calls) > self.fail_after:
+                raise ConnectionError("stub: koneksi terputus")
+        items = [r for r in self.reviews.get(package_id, [])
+                 if filter_score is None or r.get("score") == filter_score]
+        start = int(token or 0)
+        page = items[start:start + count]
+        end = start + len(page)
+        return page, (str(end) if page and end < len(items) else None)
+
+    @staticmethod
+    def make_reviews(package_id: str, n: int) -> list[dict]:
+        """`n` ulasan mentah sintetis (terbaru dulu) berformat google_play_scraper."""
+        now = pd.Timestamp("2026-01-01")
+        return [
+            {
+                "reviewId": f"{package_id}-{i}",
+                "userName": f"user{i}",
+                "score": i % 5 + 1,
+                "at": (now - pd.Timedelta(minutes=i)).to_pydatetime(),
+                "content": f"ulasan {i} untuk {package_id}",
+            }
+            for i in range(n)
+        ]
+
+
+# ============================================================
+# Rate limiter per host
+# ============================================================
+class HostRateLimiter:
+    """Token bucket per host: maksimal `rate` permintaan/detik (burst `burst`)."""
+
+    def __init__(self, rate: float = 2.0, burst: int = 2):
+        self.rate = float(rate)
+        self.burst = int(burst)
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host: str) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                tokens, last = self._buckets.get(host, (self.burst, now))
+                tokens = min(self.burst, tokens + (now - last) * self.rate)
+                if tokens >= 1:
+                    self._buckets[host] = (tokens - 1, now)
+                    return
+                self._buckets[host] = (tokens, now)
+                wait = (1 - tokens) / self.rate
+            time.sleep(wait)
+
+
+DEFAULT_LIMITER = HostRateLimiter()
+
+
+# ============================================================
+# Checkpoint
+# ============================================================
+def _checkpoint_base(package_id, lang, country, sort_key, filter_score) -> str:
+    key = f"{package_id}_{lang}_{country}_{str(sort_key).upper()}_{filter_score or 'all'}"
+    return cache_path(os.path.join("scrape", re.sub(r"[^\w.-]", "_", key)))
+
+
+def serialize_review(r: dict) -> dict:
+    """Ulasan mentah google_play_scraper → dict kolom COLUMNS (tanggal ISO)."""
+    at = r.get("at")
+    return {
+        "review_id": r.get("reviewId"),
+        "user": r.get("userName"),
+        "rating": r.get("score"),
+        "date": at.isoformat() if hasattr(at, "isoformat") else at,
+        "text": r.get("content"),
+    }
+
+
+class _Checkpoint:
+    """Ulasan yang sudah diambil (JSONL) + state (token, selesai, waktu mulai)."""
+
+    def __init__(self, base: str):
+        os.makedirs(os.path.dirname(base), exist_ok=True)
+        self.rows_path = base + ".jsonl"
+        self.state_path = base + ".state.json"
+
+    def load(self, max_age: float) -> tuple[list[dict], dict]:
+        if not os.path.exists(self.state_path):
+            return [], {}
+        with open(self.state_path, encoding="utf-8") as f:
+            state = json.load(f)
+        if time.time() - state.get("started", 0) > max_age:
+            self.reset()
+            return [], {}
+        rows = []
+        if os.path.exists(self.rows_path):
+            with open(self.rows_path, encoding="utf-8") as f:
+                rows = [json.loads(line) for line in f if line.strip()]
+        # baris bisa lebih banyak dari state bila proses berhenti di antara dua penulisan
+        n = state.get("n", len(rows))
+        if len(rows) > n:
+            rows = rows[:n]
+            with open(self.rows_path, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in rows)
+        return rows, state
+
+    def append(self, rows: list[dict], state: dict) -> None:
+        with open(self.rows_path, "a", encoding="utf-8") as f:
+            for r in rows:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.state_path)
+
+    def reset(self) -> None:
+        for p in (self.rows_path, self.state_path):
+            if os.path.exists(p):
+                os.remove(p)
+
+
+# ============================================================
+# API
+# ============================================================
+def to_frame(rows: list[dict]) -> pd.DataFrame:
+    """Daftar ulasan → DataFrame kolom review_id, user, rating, date, text (terbaru dulu)."""
+    df = pd.DataFrame(rows, columns=COLUMNS)
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df.sort_values("date", ascending=False, inplace=True, ignore_index=True)
+    return df
+
+
+def scrape_reviews(
+    package_id: str,
+    lang: str = "id",
+    country: str = "id",
+    count: int = 500,
+    sort_key: str = "NEWEST",
+    filter_score: int | None = None,
+    page_size: int = PAGE_SIZE,
+    client=None,
+    limiter: HostRateLimiter | None = None,
+    resume: bool = True,
+    max_age: float = DEFAULT_MAX_AGE,
+    on_page=None,
+) -> pd.DataFrame:
+    """
+    Ambil hingga `count` ulasan per halaman `page_size`.
+    Progres disimpan setiap halaman; bila `resume=True`, checkpoint yang
+    belum basi (≤ max_age detik) dipakai ulang/dilanjutkan.
+    on_page(package_id, jumlah_terkumpul) dipanggil tiap halaman selesai.
+    """
+    client = client or GooglePlayClient()
+    limiter = limiter or DEFAULT_LIMITER
+    host = getattr(client, "host", GPLAY_HOST)
+    ckpt = _Checkpoint(_checkpoint_base(package_id, lang, country, sort_key, filter_score))
+
+    rows, state = ckpt.load(max_age) if resume else ([], {})
+    if not resume:
+        ckpt.reset()
+    if not state:
+        state = {"started": time.time(), "token": None, "done": False, "n": 0}
+
+    count = int(count)
+    while len(rows) < count and not state["done"]:
+        limiter.acquire(host)
+        size = min(page_size, count - len(rows))
+        page, token = client.fetch_page(
+            package_id, lang, country, sort_key, size, filter_score, state["token"]
+        )
+        new_rows = [serialize_review(r) for r in page]
+        rows.extend(new_rows)
+        state.update(token=token, n=len(rows), done=(not page or not token))
+        ckpt.append(new_rows, state)
+        if on_page is not None:
+            on_page(package_id, len(rows))
+
+    return to_frame(rows[:count])
+
+
+def scrape_many(
+    package_ids,
+    max_workers: int = 4,
+    **kwargs,
+) -> dict[str, pd.DataFrame]:
+    """
+    Scrape beberapa package secara bersamaan (thread pool berbatas).
+    `package_ids` boleh list atau dict {nama_app: package_id}.
+    Argumen lain diteruskan ke `scrape_reviews`.
+    """
+    if not isinstance(package_ids, dict):
+        package_ids = {p: p for p in package_ids}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(package_ids)))) as ex:
+        futures = {name: ex.submit(scrape_reviews, pkg, **kwargs) for name, pkg in package_ids.items()}
+        return {name: fut.result() for name, fut in futures.items()}
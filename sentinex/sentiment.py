@@ -0,0 +1,47 @@
+"""
+Deteksi sentimen berbasis leksikon sederhana (Positif / Negatif / Netral).
+"""
+import os
+
+from .lexicon import Lexicon
+
+# ============================================================
+# 3) Deteksi Sentimen (leksikon sederhana)
+# ============================================================
+POS = [
+    "bagus", "mantap", "cepat", "murah", "puas", "baik", "keren", "nyaman", "top", "recommended",
+    "memuaskan", "senang", "lancar", "hebat", "ok", "oke", "terbaik", "worth", "rapi", "tepat"
+]
+NEG = [
+    "buruk", "jelek", "lambat", "lemot", "mahal", "kecewa", "mengecewakan", "error", "rusak",
+    "bohong", "tidak sesuai", "susah", "parah", "tolol", "bangsat", "goblok", "sampah", "payah",
+    "ngehang", "hang", "lag", "crash", "bug", "refund", "komplain"
+]
+KASAR = ["tolol", "bangsat", "goblok", "sampah"]
+
+lexicon = Lexicon.from_lists(POS, NEG, KASAR)
+
+
+def load_lexicon(path: str) -> int:
+    """
+    Tambahkan leksikon berbobot eksternal (CSV/TSV kata,bobot — mis. InSet).
+    Entri bawaan POS/NEG tetap diutamakan. Kembalikan ukuran leksikon.
+    """
+    lexicon.update(Lexicon.from_file(path))
+    lexicon.update(Lexicon.from_lists(POS, NEG, KASAR))
+    return len(lexicon)
+
+
+# Leksikon eksternal opsional, beberapa path dipisah os.pathsep
+for _path in filter(None, os.environ.get("SENTINEX_LEXICON_PATH", "").split(os.pathsep)):
+    load_lexicon(_path)
+
+
+def deteksi_sentimen(teks: str) -> str:
+    """Label sentimen satu teks (kata kasar → langsung Negatif)."""
+    return lexicon.label(teks)
+
+
+def deteksi_sentimen_batch(texts) -> list[str]:
+    """Label sentimen banyak teks sekaligus."""
+    return lexicon.label_many(texts)
@@ -0,0 +1,220 @@
+"""
+Layanan stemming Sastrawi yang dibuat sekali per proses + cache kata → stem.
+
+- Stemmer Sastrawi (kamus kata dasar) hanya dibangun sekali (lazy).
+- Hasil stem disimpan di cache LRU berbatas (default 100.000 kata).
+- Cache bisa disimpan ke / dimuat dari file JSON agar kosakata yang
+  berulang (mis. "kebutuhan" → "butuh") tidak di-stem ulang antar-run.
+- Counter hit/miss tersedia lewat `stats()`.
+- Worker process pool tidak menyimpan file sendiri; kata baru yang
+  di-stem worker dikirim balik (`drain_new`) lalu digabung ke service
+  proses induk (`merge`) yang menyimpannya saat keluar.
+"""
+import atexit
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from .config import cache_path
+
+DEFAULT_MAXSIZE = 100_000
+CACHE_FORMAT_VERSION = 1
+
+
+class SetDictionary:
+    """
+    Kamus kata dasar untuk Stemmer Sastrawi berbasis set.
+    ArrayDictionary bawaan menyimpan list sehingga setiap `contains`
+    memindai ~30 ribu kata; di sini lookup O(1).
+    """
+
+    def __init__(self, words):
+        self.words = frozenset(w for w in words if w and w.strip())
+
+    def contains(self, word: str) -> bool:
+        return word in self.words
+
+    def count(self) -> int:
+        return len(self.words)
+
+
+class StemmerService:
+    """Pembungkus stemmer Sastrawi dengan cache LRU kata → stem."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, path: str | None = None):
+        self.maxsize = int(maxsize)
+        self.path = path
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._stemmer = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.track_new = False           # catat kata baru untuk `drain_new` (worker)
+        self._new: dict[str, str] = {}
+
+    # ------------------------------------------------------------
+    # Stemmer Sastrawi (dibangun sekali)
+    # ------------------------------------------------------------
+    @property
+    def stemmer(self):
+        """Stemmer Sastrawi tanpa cache bawaan (cache dikelola di sini)."""
+        if self._stemmer is None:
+            from Sastrawi.Stemmer.Stemmer import Stemmer
+            from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+
+            words = StemmerFactory().get_words()
+            self._stemmer = Stemmer(SetDictionary(words))
+        return self._stemmer
+
+    # ------------------------------------------------------------
+    # Stemming
+    # ------------------------------------------------------------
+    def stem_word(self, word: str) -> str:
+        """Stem satu kata; hasil diambil dari cache bila sudah pernah dihitung."""
+        with self._lock:
+            stem = self._cache.get(word)
+            if stem is not None:
+                self._cache.move_to_end(word)
+                self.hits += 1
+                return stem
+            self.misses += 1
+
+        stem = self.stemmer.stem(word)
+        with self._lock:
+            self._put(word, stem)
+            if self.track_new:
+                self._new[word] = stem
+        return stem
+
+    def stem_tokens(self, tokens: list[str]) -> str:
+        """Stem daftar token lalu gabung kembali sebagai string."""
+        return " ".join(self.stem_word(w) for w in tokens)
+
+    def stem_many(self, words) -> dict[str, str]:
+        """Stem kumpulan kata unik → dict {kata: stem}."""
+        return {w: self.stem_word(w) for w in set(words)}
+
+    def _put(self, word: str, stem: str) -> None:
+        self._cache[word] = stem
+        self._cache.move_to_end(word)
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    def drain_new(self) -> list[tuple[str, str]]:
+        """Ambil & kosongkan entri yang di-stem sejak drain terakhir (track_new=True)."""
+        with self._lock:
+            entries, self._new = list(self._new.items()), {}
+        return entries
+
+    def merge(self, entries) -> int:
+        """Gabungkan entri (kata, stem) dari worker ke cache; kembalikan jumlah kata baru."""
+        added = 0
+        with self._lock:
+            for word, stem in entries:
+                added += word not in self._cache
+                self._put(word, stem)
+        return added
+
+    # ------------------------------------------------------------
+    # Statistik
+    # ------------------------------------------------------------
+    def stats(self) -> dict:
+        """Counter cache: hits, misses, size, maxsize, hit_rate."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._cache),
+            "maxsize": self.maxsize,
+            "hit_rate": (self.hits / total) if total else 0.0,
+        }
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self) -> None:
+        """Kosongkan cache (stemmer Sastrawi tetap dipakai ulang)."""
+        with self._lock:
+            self._cache.clear()
+        self.reset_stats()
+
+    # ------------------------------------------------------------
+    # Persistensi
+    # ------------------------------------------------------------
+    def save(self, path: str | None = None) -> str | None:
+        """Simpan cache ke file JSON (urutan LRU dipertahankan)."""
+        path = path or self.path
+        if not path:
+            return None
+        with self._lock:
+            entries = list(self._cache.items())
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_FORMAT_VERSION, "entries": entries}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        return path
+
+    def load(self, path: str | None = None) -> int:
+        """Muat cache dari file JSON; kembalikan jumlah entri yang dimuat."""
+        path = path or self.path
+        if not path or not os.path.exists(path):
+            return 0
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        if data.get("version") != CACHE_FORMAT_VERSION:
+            return 0
+
+        with self._lock:
+            for word, stem in data.get("entries", []):
+                self._put(word, stem)
+        return len(self._cache)
+
+
+# ============================================================
+# Instance bersama (satu per proses)
+# ============================================================
+_SERVICE: StemmerService | None = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def _new_service() -> StemmerService:
+    path = os.environ.get("SENTINEX_STEM_CACHE") or cache_path("stem_cache.json")
+    maxsize = int(os.environ.get("SENTINEX_STEM_CACHE_SIZE", DEFAULT_MAXSIZE))
+    service = StemmerService(maxsize=maxsize, path=path)
+    service.load()
+    return service
+
+
+def get_stemmer() -> StemmerService:
+    """
+    StemmerService bersama untuk proses ini.
+    Cache dimuat dari SENTINEX_STEM_CACHE (default: <cache>/stem_cache.json)
+    dan disimpan otomatis saat proses berakhir.
+    """
+    global _SERVICE
+    with _SERVICE_LOCK:
+        if _SERVICE is None:
+            _SERVICE = _new_service()
+            atexit.register(_SERVICE.save)
+        return _SERVICE
+
+
+def init_worker_stemmer() -> StemmerService:
+    """
+    Siapkan StemmerService untuk proses worker: cache persisten hanya dimuat
+    (tidak disimpan saat keluar, agar worker tidak saling menimpa file) dan
+    stemmer Sastrawi langsung dibangun. Kata baru dicatat agar bisa dikirim
+    ke proses induk lewat `drain_new`.
+    """
+    global _SERVICE
+    with _SERVICE_LOCK:
+        _SERVICE = _new_service()
+        _SERVICE.track_new = True
+    _SERVICE.stemmer  # bangun kamus kata dasar sekarang, bukan di chunk pertama
+    return _SERVICE
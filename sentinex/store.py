@@ -0,0 +1,295 @@
+"""
+Penyimpanan ulasan lokal (SQLite) dengan dedup, untuk scraping inkremental.
+
+Setiap ulasan disimpan sekali per (package, kunci ulasan). Kunci = reviewId
+dari Google Play, atau hash (user, tanggal, teks) bila reviewId tidak ada.
+Tabel juga menyimpan hasil `stem` & `sentimen`, sehingga:
+- scraping berikutnya berhenti begitu mencapai high-water mark (ulasan
+  terbaru yang sudah tersimpan), dan
+- hanya baris baru yang dilewatkan ke pipeline pre-processing.
+Bila satu sinkronisasi terpotong `max_new`, token halaman berikutnya
+disimpan sebagai kursor backfill (tabel `sync_cursors`) dan dilanjutkan
+pada sinkronisasi berikutnya sampai celahnya tertutup.
+Opsional (dedup=True): baris baru dicocokkan ke indeks near-duplicate
+(`sentinex.dedup`) yang ikut disimpan; kolom `dup_cluster` berisi klasternya.
+"""
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from .config import cache_path
+from .cache import preprocess_cached
+from .dedup import NearDupIndex, preprocess_dedup
+from .scraper import (
+    COLUMNS, DEFAULT_LIMITER, GPLAY_HOST, PAGE_SIZE, GooglePlayClient, serialize_review
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    package_id TEXT NOT NULL,
+    review_key TEXT NOT NULL,
+    review_id  TEXT,
+    user       TEXT,
+    rating     INTEGER,
+    date       TEXT,
+    text       TEXT,
+    stem       TEXT,
+    sentimen   TEXT,
+    scraped_at TEXT NOT NULL,
+    dup_cluster INTEGER,
+    PRIMARY KEY (package_id, review_key)
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_pkg_date ON reviews (package_id, date);
+CREATE TABLE IF NOT EXISTS sync_cursors (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    package_id TEXT NOT NULL,
+    token      TEXT NOT NULL,
+    floor      TEXT,
+    created_at TEXT NOT NULL
+);
+"""
+
+
+def review_key(row: dict) -> str:
+    """reviewId bila ada, jika tidak sha1(user|tanggal|teks)."""
+    if row.get("review_id"):
+        return str(row["review_id"])
+    raw = f"{row.get('user')}|{row.get('date')}|{row.get('text')}"
+    return "h:" + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class ReviewStore:
+    """Penyimpanan ulasan per package di satu file SQLite."""
+
+    def __init__(self, path: str | None = None):
+        self.path = path or cache_path("reviews.sqlite")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        cols = {r[1] for r in self._conn.execute("PRAGMA table_info(reviews)")}
+        if "dup_cluster" not in cols:  # file lama sebelum ada dedup
+            self._conn.execute("ALTER TABLE reviews ADD COLUMN dup_cluster INTEGER")
+        self._dedup: NearDupIndex | None = None
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def dedup_index(self) -> NearDupIndex:
+        """Indeks near-duplicate milik penyimpanan ini (dimuat sekali, disimpan di sebelah file SQLite)."""
+        if self._dedup is None:
+            self._dedup = NearDupIndex.load(self.path + ".neardup.json")
+        return self._dedup
+
+    # ------------------------------------------------------------
+    # Baca
+    # ------------------------------------------------------------
+    def high_water_mark(self, package_id: str) -> str | None:
+        """Tanggal (ISO) ulasan terbaru yang sudah tersimpan."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(date) FROM reviews WHERE package_id = ?", (package_id,)
+            ).fetchone()
+        return row[0]
+
+    def has_keys(self, package_id: str, keys) -> set[str]:
+        """Subset `keys` yang sudah ada di penyimpanan."""
+        keys = list(keys)
+        if not keys:
+            return set()
+        marks = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT review_key FROM reviews WHERE package_id = ? AND review_key IN ({marks})",
+                [package_id, *keys],
+            ).fetchall()
+        return {r[0] for r in rows}
+
+    def cursors(self, package_id: str) -> list[tuple[int, str, str | None]]:
+        """Kursor backfill (id, token, floor) yang belum selesai, celah terbaru dulu."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, token, floor FROM sync_cursors WHERE package_id = ? ORDER BY id DESC",
+                (package_id,),
+            ).fetchall()
+
+    def load(self, package_id: str | None = None, limit: int | None = None,
+             rating: int | None = None) -> pd.DataFrame:
+        """Ulasan tersimpan (terbaru dulu) + kolom stem & sentimen; `rating` menyaring skor 1..5."""
+        sql = "SELECT package_id, " + ", ".join(COLUMNS) + ", stem, sentimen, dup_cluster FROM reviews"
+        where, params = [], []
+        if package_id is not None:
+            where.append("package_id = ?")
+            params.append(package_id)
+        if rating is not None:
+            where.append("rating = ?")
+            params.append(int(rating))
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY date DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            df = pd.read_sql_query(sql, self._conn, params=params)
+        df["date"] = pd.to_datetime(df["date"], errors="coerce")
+        return df
+
+    # ------------------------------------------------------------
+    # Tulis
+    # ------------------------------------------------------------
+    def add(self, package_id: str, rows: list[dict]) -> int:
+        """Simpan ulasan yang belum ada; kembalikan jumlah baris baru."""
+        now = datetime.now(timezone.utc).isoformat()
+        data = [
+            (package_id, review_key(r), r.get("review_id"), r.get("user"), r.get("rating"),
+             r.get("date"), r.get("text"), now)
+            for r in rows
+        ]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO reviews "
+                "(package_id, review_key, review_id, user, rating, date, text, scraped_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                data,
+            )
+            return self._conn.total_changes - before
+
+    def add_cursor(self, package_id: str, token: str, floor: str | None) -> None:
+        """
+        Catat celah yang belum terambil: lanjutkan dari `token` sampai
+        bertemu ulasan tersimpan / ulasan lebih lama dari `floor`.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sync_cursors (package_id, token, floor, created_at) VALUES (?, ?, ?, ?)",
+                (package_id, token, floor, now),
+            )
+
+    def update_cursor(self, cursor_id: int, token: str | None) -> None:
+        """Geser kursor ke `token`; None = celah sudah tertutup (kursor dihapus)."""
+        with self._lock, self._conn:
+            if token is None:
+                self._conn.execute("DELETE FROM sync_cursors WHERE id = ?", (cursor_id,))
+            else:
+                self._conn.execute("UPDATE sync_cursors SET token = ? WHERE id = ?", (token, cursor_id))
+
+    def process_pending(self, package_id: str | None = None, workers: int = 1,
+                        batch_rows: int = 10_000, dedup: bool = False) -> int:
+        """
+        Jalankan pipeline hanya untuk baris yang belum punya `stem`.
+        dedup=True: pipeline sekali per klaster near-duplicate (lihat `dedup_index`).
+        """
+        sql = "SELECT package_id, review_key, text FROM reviews WHERE stem IS NULL"
+        params: list = []
+        if package_id is not None:
+            sql += " AND package_id = ?"
+            params.append(package_id)
+        sql += " LIMIT ?"
+
+        done = 0
+        while True:
+            with self._lock:
+                pending = pd.read_sql_query(sql, self._conn, params=[*params, batch_rows])
+            if pending.empty:
+                break
+            if dedup:
+                hasil, _ = preprocess_dedup(
+                    pending["text"].fillna(""), self.dedup_index(), workers=workers,
+                    member_ids=(pending["package_id"] + "\x00" + pending["review_key"]).tolist(),
+                )
+                clusters = hasil["dup_cluster"].astype(int).tolist()
+            else:
+                hasil = preprocess_cached(pending["text"].fillna(""), workers=workers)
+                clusters = [None] * len(hasil)
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "UPDATE reviews SET stem = ?, sentimen = ?, dup_cluster = ? "
+                    "WHERE package_id = ? AND review_key = ?",
+                    zip(hasil["stem"], hasil["sentimen"], clusters,
+                        pending["package_id"], pending["review_key"]),
+                )
+            done += len(pending)
+        if dedup:
+            self.dedup_index().save()
+        return done
+
+
+# ============================================================
+# Sinkronisasi inkremental dari Google Play
+# ============================================================
+def sync_package(
+    store: ReviewStore,
+    package_id: str,
+    lang: str = "id",
+    country: str = "id",
+    max_new: int = 10_000,
+    page_size: int = PAGE_SIZE,
+    client=None,
+    limiter=None,
+    workers: int = 1,
+    dedup: bool = False,
+) -> dict:
+    """
+    Ambil hanya ulasan yang lebih baru dari high-water mark (urut NEWEST),
+    simpan yang belum ada, lalu proses baris baru saja.
+    dedup=True: baris baru yang (hampir) sama dengan ulasan tersimpan
+    memakai hasil klasternya tanpa pipeline ulang.
+    Bila kuota `max_new` habis sebelum data lama tercapai, posisi terakhir
+    disimpan (`ReviewStore.add_cursor`) dan sinkronisasi berikutnya
+    melanjutkannya setelah mengambil ulasan terbaru.
+    Kembalikan statistik: fetched, new, processed, duplicates, backfill_pending
+    (jumlah celah yang belum tertutup).
+    """
+    client = client or GooglePlayClient()
+    limiter = limiter or DEFAULT_LIMITER
+    host = getattr(client, "host", GPLAY_HOST)
+    hwm = store.high_water_mark(package_id)
+    pending = store.cursors(package_id)
+
+    def scan(token, floor, budget):
+        """Ambil halaman dari `token`; kembalikan (fetched, new, token lanjutan atau None bila selesai)."""
+        fetched = new = 0
+        while new < budget:
+            limiter.acquire(host)
+            page, next_token = client.fetch_page(
+                package_id, lang, country, "NEWEST", min(page_size, budget - new), None, token
+            )
+            rows = [serialize_review(r) for r in page]
+            fetched += len(rows)
+            known = store.has_keys(package_id, [review_key(r) for r in rows])
+            fresh = [r for r in rows if review_key(r) not in known]
+            new += store.add(package_id, fresh)
+
+            # Berhenti begitu halaman menyentuh data lama
+            reached_old = bool(known) or (
+                floor is not None and any(r["date"] is not None and r["date"] < floor for r in rows)
+            )
+            if reached_old or not page or not next_token:
+                return fetched, new, None
+            token = next_token
+        return fetched, new, token
+
+    # 1) ulasan terbaru sampai high-water mark
+    fetched, new, token = scan(None, hwm, max_new)
+    if token is not None:  # terpotong max_new: sisa celah diambil pada sync berikutnya
+        store.add_cursor(package_id, token, hwm)
+
+    # 2) lanjutkan celah dari sinkronisasi sebelumnya dengan sisa kuota
+    for cursor_id, cursor_token, floor in pending:
+        if new >= max_new:
+            break
+        f, n, cursor_token = scan(cursor_token, floor, max_new - new)
+        fetched += f
+        new += n
+        store.update_cursor(cursor_id, cursor_token)
+
+    before = store.dedup_index().stats() if dedup else None
+    processed = store.process_pending(package_id, workers=workers, dedup=dedup)
+    duplicates = store.dedup_index().stats()["duplicates"] - before["duplicates"] if dedup else 0
+    return {"fetched": fetched, "new": new, "processed": processed, "duplicates": duplicates,
+            "backfill_pending": len(store.cursors(package_id))}
@@ -0,0 +1,249 @@
+"""
+Pemrosesan CSV secara streaming (per chunk) untuk file yang lebih besar
+dari memori.
+
+CSV dibaca per chunk, tiap chunk dilewatkan ke pipeline pre-processing +
+sentimen, lalu hasilnya langsung ditulis (append) ke file keluaran.
+Pemakaian memori bergantung pada ukuran chunk, bukan ukuran file.
+"""
+import math
+import os
+import time
+from collections import Counter
+from typing import Callable
+
+import pandas as pd
+
+from .cache import preprocess_cached
+from .columnar import INTERMEDIATE_COLUMNS, ChunkEncoder, format_of, ipc_options, require_pyarrow
+from .dedup import NearDupIndex, preprocess_dedup
+from .inference import load_bundle
+from .langfilter import english_mask
+from .metrics import stage
+
+DEFAULT_CHUNK_ROWS = 10_000
+_BLOCK = 1 << 20
+
+
+def count_lines(src) -> int:
+    """Hitung jumlah baris (perkiraan jumlah record) tanpa memuat file ke memori."""
+    if isinstance(src, (str, os.PathLike)):
+        with open(src, "rb") as f:
+            return count_lines(f)
+    pos = src.tell()
+    n, last = 0, b"\n"
+    for block in iter(lambda: src.read(_BLOCK), b""):
+        n += block.count(b"\n")
+        last = block[-1:]
+    src.seek(pos)
+    return n + (last != b"\n")
+
+
+def estimate_chunks(src, chunksize: int = DEFAULT_CHUNK_ROWS) -> int:
+    """Perkiraan jumlah chunk (baris header tidak dihitung)."""
+    return max(1, math.ceil(max(count_lines(src) - 1, 0) / chunksize))
+
+
+# ============================================================
+# Tujuan penulisan (CSV / Parquet / Arrow) per chunk
+# ============================================================
+class Sink:
+    """Dasar tujuan penulisan: `columns` terisi setelah chunk pertama ditulis."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.columns: list[str] | None = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvSink(Sink):
+    """Tulis chunk DataFrame ke satu file CSV (header hanya sekali)."""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._f = open(path, "w", encoding="utf-8", newline="")
+
+    def write(self, df: pd.DataFrame) -> None:
+        header = self.columns is None
+        if header:
+            self.columns = list(df.columns)
+        else:
+            df = df.reindex(columns=self.columns)
+        df.to_csv(self._f, index=False, header=header)
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class ParquetSink(Sink):
+    """
+    Tulis chunk DataFrame ke satu file Parquet (butuh pyarrow).
+    Skema mengikuti `sentinex.columnar`: kolom label/aplikasi sebagai
+    kategori (dictionary), `token` sebagai list<string>. Kolom angka asli
+    disimpan sebagai float64 agar chunk yang memuat sel kosong tetap cocok.
+    """
+
+    def __init__(self, path: str, drop_intermediate: bool = False):
+        require_pyarrow()
+        super().__init__(path)
+        self._encoder = ChunkEncoder(drop_intermediate=drop_intermediate, promote_numeric=True)
+        self._writer = None
+
+    def _open(self, schema):
+        import pyarrow.parquet as pq
+
+        return pq.ParquetWriter(self.path, schema, compression="zstd")
+
+    def write(self, df: pd.DataFrame) -> None:
+        table = self._encoder.encode(df)
+        if self._writer is None:
+            self.columns = list(table.column_names)
+            self._writer = self._open(table.schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+class ArrowSink(ParquetSink):
+    """Tulis chunk ke satu file Arrow IPC / Feather v2 (zstd; kamus kategori ditulis sebagai delta)."""
+
+    def _open(self, schema):
+        pa = require_pyarrow()
+        return pa.ipc.new_file(self.path, schema, options=ipc_options())
+
+
+def open_sink(path: str, drop_intermediate: bool = False) -> Sink:
+    """
+    Pilih format keluaran dari ekstensi: .parquet/.pq → Parquet,
+    .arrow/.feather/.ipc → Arrow IPC, selain itu CSV.
+    """
+    fmt = format_of(path)
+    if fmt == "parquet":
+        return ParquetSink(path, drop_intermediate)
+    if fmt == "arrow":
+        return ArrowSink(path, drop_intermediate)
+    return CsvSink(path)
+
+
+# ============================================================
+# Streaming
+# ============================================================
+def empty_result(text_col: str, keep_intermediate: bool = False, with_model: bool = False,
+                 with_dedup: bool = False, assign: dict | None = None) -> pd.DataFrame:
+    """DataFrame 0 baris dengan kolom keluaran `process_csv_stream`."""
+    cols = [text_col, *(INTERMEDIATE_COLUMNS if keep_intermediate else ()),
+            "stem", "sentimen"]
+    df = pd.DataFrame({c: pd.Series(dtype=object) for c in cols})
+    if with_dedup:
+        df["dup_cluster"] = pd.Series(dtype="int64")
+        df["dup_size"] = pd.Series(dtype="int64")
+    if with_model:
+        df["prediksi_model"] = pd.Series(dtype=object)
+    for name in assign or {}:
+        df[name] = pd.Series(dtype=object)
+    return df
+
+
+def process_csv_stream(
+    src,
+    text_col: str,
+    out,
+    chunksize: int = DEFAULT_CHUNK_ROWS,
+    workers: int = 1,
+    keep_intermediate: bool = False,
+    on_chunk: Callable[[int, int, int], None] | None = None,
+    assign: dict | None = None,
+    model_app: str | None = None,
+    drop_english: bool = False,
+    dedup: NearDupIndex | None = None,
+) -> dict:
+    """
+    Proses CSV `src` (path atau file biner) per chunk → tulis ke `out`
+    (path file keluaran atau sink dari `open_sink`).
+    Kolom asli dipertahankan, ditambah `stem`, `sentimen` (dan kolom antara
+    bila keep_intermediate=True) serta kolom konstan dari `assign`.
+    Bila `model_app` diisi, kolom `prediksi_model` berisi prediksi model
+    FastText + Bi-GRU aplikasi tersebut (lihat sentinex.inference).
+    drop_english=True membuang baris berbahasa Inggris (sentinex.langfilter)
+    sebelum diproses.
+    Bila `dedup` (NearDupIndex) diisi, pipeline dijalankan sekali per klaster
+    near-duplicate dan keluaran mendapat kolom `dup_cluster` & `dup_size`
+    (ukuran klaster saat chunk ditulis); indeks bertambah lintas chunk.
+    Diabaikan bila keep_intermediate=True.
+    on_chunk(chunk_ke, perkiraan_total_chunk, baris_selesai) dipanggil
+    setiap satu chunk selesai (mis. untuk progress bar).
+    Kembalikan statistik: rows, chunks, seconds, dropped_english,
+    dedup_processed & dedup_skipped (baris yang memakai hasil klaster).
+    """
+    total = estimate_chunks(src, chunksize)
+    t0 = time.perf_counter()
+    rows = chunks = dropped = processed = 0
+    use_dedup = dedup is not None and not keep_intermediate
+    occurrences = Counter()  # kunci anggota dedup berlanjut lintas chunk
+
+    sink = open_sink(out) if isinstance(out, (str, os.PathLike)) else out
+    try:
+        try:
+            reader = iter(pd.read_csv(src, chunksize=chunksize))
+        except pd.errors.EmptyDataError:  # file 0 byte: tanpa header sama sekali
+            reader = iter(())
+        while True:
+            with stage("csv_parse") as rec:
+                chunk = next(reader, None)
+                rec.rows = 0 if chunk is None else len(chunk)
+            if chunk is None:
+                break
+            if text_col not in chunk.columns:
+                raise KeyError(f"Kolom '{text_col}' tidak ditemukan.")
+            if drop_english:
+                with stage("langfilter", rows=len(chunk)):
+                    mask_en = english_mask(chunk[text_col].astype(str), workers=workers)
+                dropped += int(mask_en.sum())
+                chunk = chunk.loc[~mask_en]
+            if use_dedup:
+                hasil, info = preprocess_dedup(chunk[text_col], dedup, workers=workers,
+                                               occurrences=occurrences)
+                processed += info["processed"]
+            else:
+                hasil = preprocess_cached(chunk[text_col], workers=workers,
+                                          keep_intermediate=keep_intermediate)
+            chunk = chunk.drop(columns=hasil.columns, errors="ignore").join(hasil)
+            if model_app is not None:
+                with stage("model_predict", rows=len(chunk)):
+                    chunk["prediksi_model"] = (load_bundle().predict(chunk[text_col].astype(str),
+                                                                     app=model_app)
+                                               if len(chunk) else pd.Series(dtype=object))
+            if assign:
+                chunk = chunk.assign(**assign)
+            with stage("write", rows=len(chunk)):
+                sink.write(chunk)
+
+            chunks += 1
+            rows += len(chunk)
+            if on_chunk is not None:
+                on_chunk(chunks, max(total, chunks), rows)
+        if sink.columns is None:
+            # tidak ada satu chunk pun: tetap tulis file kosong berskema agar bisa dibaca
+            sink.write(empty_result(text_col, keep_intermediate, model_app is not None,
+                                    use_dedup, assign))
+    finally:
+        if sink is not out:
+            sink.close()
+
+    return {"rows": rows, "chunks": chunks, "seconds": time.perf_counter() - t0,
+            "dropped_english": dropped,
+            "dedup_processed": processed if use_dedup else None,
+            "dedup_skipped": rows - processed if use_dedup else None}
@@ -0,0 +1,792 @@
+"""
+Orkestrator k-fold FastText + Bi-GRU (pengganti loop CELL 7 notebook).
+
+Setiap pasangan (aplikasi, fold) adalah satu job yang dijalankan di
+process pool CPU. Hasil tiap job disimpan ke folder `folds/` sehingga
+job yang sudah selesai dilewati saat dijalankan ulang (resume). Setelah
+semua job selesai, hasil digabung menjadi file yang sama dengan CELL 7:
+
+    tabel_evaluasi_5fold_per_app.csv
+    bukti_true_vs_pred_per_fold.csv
+    confusion_matrix_fold1.json
+    confusion_matrix_sum.json
+
+Mode inkremental (`--incremental`) untuk data berlabel yang bertambah:
+aplikasi yang isi datanya (hash teks + label) tidak berubah dilewati;
+aplikasi yang berubah tidak melatih ulang FastText maupun Bi-GRU dari
+nol. Baris lama tetap di fold-nya, baris baru dibagi ke fold secara
+stratified; vocabulary & matriks embedding tiap fold diperluas dengan
+token baru saja, bobot Bi-GRU fold sebelumnya dimuat lalu di-fine-tune
+beberapa epoch. Setelah itu evaluasi dijalankan ulang, file CELL 7 &
+rekap diperbarui, dan `laporan_inkremental.csv` membandingkan metrik &
+waktu dengan pelatihan penuh.
+
+Contoh:
+    python -m sentinex.training --meta cell_05_filter_english/meta.json \\
+        --fasttext-dir cell_06_fasttext --out-dir cell_07_kfold_train_eval --workers 4
+    python -m sentinex.training ... --incremental --finetune-epochs 3 --compare-full cek_penuh
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import time
+import warnings
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from .columnar import read_frame
+from .embeddings import export_store, extend_store, open_store, store_exists
+from .inference import KerasStyleTokenizer
+
+APPS = ["Tokopedia", "Shopee", "Lazada", "Blibli"]
+K = 5
+SEED = 42
+FOLD_DIR = "folds"
+STATE_FILE = "incremental_state.json"
+REPORT_FILE = "laporan_inkremental.csv"
+FINETUNE_EPOCHS = 3
+FINETUNE_LR = 5e-4
+
+
+# ============================================================
+# Komponen model (sama dengan notebook)
+# ============================================================
+class FittedTokenizer(KerasStyleTokenizer):
+    """
+    Setara `Tokenizer(oov_token="<OOV>").fit_on_texts(texts)` Keras:
+    indeks kata diurutkan menurut frekuensi (seri → urutan kemunculan).
+    """
+
+    def __init__(self, texts=(), oov_token: str = "<OOV>"):
+        super().__init__({}, oov_token)
+        vocab = self._by_frequency(texts)
+        if oov_token:
+            vocab = [oov_token] + vocab
+        self.word_index = {w: i for i, w in enumerate(vocab, start=1)}
+        self.oov_index = self.word_index.get(oov_token) if oov_token else None
+        self.oov_token = oov_token
+
+    def _by_frequency(self, texts) -> list[str]:
+        counts = Counter()
+        for t in texts:
+            counts.update(w for w in str(t).lower().translate(self._table).split(" ") if w)
+        return [w for w, _ in sorted(counts.items(), key=lambda kv: kv[1], reverse=True)]
+
+    @classmethod
+    def from_vocab(cls, word_index: dict[str, int], oov_token: str = "<OOV>") -> "FittedTokenizer":
+        tok = cls((), oov_token)
+        tok.word_index = dict(word_index)
+        tok.oov_index = tok.word_index.get(oov_token) if oov_token else None
+        return tok
+
+    def extend(self, texts) -> list[str]:
+        """
+        Tambahkan kata `texts` yang belum ada di akhir indeks (urut frekuensi);
+        indeks kata lama tidak berubah. Kembalikan kata baru.
+        """
+        new_words = [w for w in self._by_frequency(texts) if w not in self.word_index]
+        start = len(self.word_index) + 1
+        self.word_index.update((w, i) for i, w in enumerate(new_words, start=start))
+        return new_words
+
+
+def pad_post(seqs, max_len: int) -> np.ndarray:
+    """pad_sequences(..., padding="post", truncating="post")."""
+    x = np.zeros((len(seqs), max_len), dtype=np.int32)
+    for i, s in enumerate(seqs):
+        s = s[:max_len]
+        x[i, :len(s)] = s
+    return x
+
+
+def calc_maxlen_p95(texts, tok, clamp_min=20, clamp_max=200):
+    seqs = tok.texts_to_sequences(texts)
+    lens = [len(s) for s in seqs if len(s) > 0]
+    max_len = int(np.percentile(lens, 95)) if lens else 50
+    return max(clamp_min, min(max_len, clamp_max))
+
+
+def make_bigru_model(vocab_size, emb_dim, emb_matrix, max_len, n_classes):
+    import tensorflow as tf
+    from tensorflow.keras.layers import Input, Embedding, Bidirectional, GRU, Dense, Dropout
+    from tensorflow.keras.models import Model
+
+    inp = Input(shape=(max_len,))
+    x = Embedding(
+        input_dim=vocab_size,
+        output_dim=emb_dim,
+        embeddings_initializer=tf.keras.initializers.Constant(emb_matrix),
+        trainable=False,
+        mask_zero=True
+    )(inp)
+    x = Bidirectional(GRU(64, return_sequences=False))(x)
+    x = Dropout(0.3)(x)
+    out = Dense(n_classes, activation="softmax")(x)
+    model = Model(inp, out)
+    model.compile(optimizer="adam", loss="sparse_categorical_crossentropy", metrics=["accuracy"])
+    return model
+
+
+# ============================================================
+# Sisi worker
+# ============================================================
+_DATA: dict = {}
+
+
+def _init_worker(threads: int) -> None:
+    """Batasi thread TensorFlow per worker agar N worker tidak berebut core."""
+    os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+    import tensorflow as tf
+
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def load_app_data(meta: dict):
+    """
+    Teks, label (ter-encode) dan kelas satu aplikasi (di-cache per proses;
+    file yang berubah — ukuran / waktu ubah lain — dibaca ulang).
+    """
+    from sklearn.preprocessing import LabelEncoder
+
+    st = os.stat(meta["idonly_path"])
+    key = (meta["idonly_path"], meta["text_col"], meta["label_col"], st.st_size, st.st_mtime_ns)
+    if key not in _DATA:
+        df = read_frame(meta["idonly_path"], columns=[meta["text_col"], meta["label_col"]])
+        X_text = df[meta["text_col"]].astype(str).values
+        le = LabelEncoder()
+        y = le.fit_transform(df[meta["label_col"]].astype(str).values)
+        _DATA[key] = (X_text, y, list(le.classes_))
+    return _DATA[key]
+
+
+def fold_indices(y, k: int = K):
+    from sklearn.model_selection import StratifiedKFold
+
+    skf = StratifiedKFold(n_splits=k, shuffle=True, random_state=SEED)
+    return list(skf.split(np.zeros(len(y)), y))
+
+
+def fold_result_path(out_dir: str, app: str, fold_i: int) -> str:
+    return os.path.join(out_dir, FOLD_DIR, f"{app.lower()}_fold{fold_i}.json")
+
+
+def fold_model_paths(out_dir: str, app: str, fold_i: int) -> tuple[str, str]:
+    """(bobot Bi-GRU, vocabulary) fold untuk warm-start di run inkremental berikutnya."""
+    base = os.path.join(out_dir, FOLD_DIR, f"{app.lower()}_fold{fold_i}")
+    return base + ".weights.h5", base + ".vocab.json"
+
+
+def clear_folds(out_dir: str, app: str) -> int:
+    """Hapus hasil & model semua fold `app` (split-nya berganti); kembalikan jumlah file."""
+    folder = os.path.join(out_dir, FOLD_DIR)
+    prefix = f"{app.lower()}_fold"
+    removed = 0
+    for name in os.listdir(folder) if os.path.isdir(folder) else ():
+        if name.startswith(prefix) and name[len(prefix):len(prefix) + 1].isdigit():
+            os.remove(os.path.join(folder, name))
+            removed += 1
+    return removed
+
+
+# ------------------------------------------------------------
+# Pembagian fold yang stabil saat data bertambah
+# ------------------------------------------------------------
+def row_keys(meta: dict) -> list[str]:
+    """Hash pendek (teks, label) per baris; dipakai untuk mengenali baris lama."""
+    X_text, y, classes = load_app_data(meta)
+    return [hashlib.blake2b(f"{t}\x00{classes[c]}".encode("utf-8"), digest_size=8).hexdigest()
+            for t, c in zip(X_text, y)]
+
+
+def data_hash(keys) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for key in keys:
+        h.update(key.encode("ascii"))
+    return h.hexdigest()
+
+
+def split_path(out_dir: str, app: str) -> str:
+    return os.path.join(out_dir, FOLD_DIR, f"{app.lower()}_split.json")
+
+
+def load_split(out_dir: str, app: str) -> dict | None:
+    try:
+        with open(split_path(out_dir, app), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_split(out_dir: str, app: str, keys, folds) -> None:
+    path = split_path(out_dir, app)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"keys": list(keys), "fold": [int(x) for x in folds]}, f)
+    os.replace(tmp, path)
+
+
+def assign_folds(keys, y, k: int = K, previous: dict | None = None) -> np.ndarray:
+    """
+    Nomor fold (1..k) per baris. Tanpa `previous`: StratifiedKFold seperti
+    CELL 7. Dengan `previous` (split lama): baris lama tetap di fold-nya,
+    baris baru masuk ke fold yang jumlah labelnya paling sedikit.
+    """
+    folds = np.zeros(len(keys), dtype=np.int64)
+    if previous is None:
+        for fold_i, (_, te_idx) in enumerate(fold_indices(y, k), start=1):
+            folds[te_idx] = fold_i
+        return folds
+
+    old: dict[str, list[int]] = {}  # dibalik: pop() mengembalikan baris duplikat sesuai urutan
+    for key, fold_i in zip(reversed(previous["keys"]), reversed(previous["fold"])):
+        old.setdefault(key, []).append(fold_i)
+    for i, key in enumerate(keys):
+        if old.get(key):
+            folds[i] = old[key].pop()
+
+    counts = np.zeros((int(y.max()) + 1 if len(y) else 0, k + 1), dtype=np.int64)
+    kept = folds > 0
+    np.add.at(counts, (y[kept], folds[kept]), 1)
+    for i in np.flatnonzero(~kept):
+        fold_i = int(np.argmin(counts[y[i], 1:])) + 1
+        folds[i] = fold_i
+        counts[y[i], fold_i] += 1
+    return folds
+
+
+def fold_split(meta: dict, out_dir: str, k: int, fold_i: int):
+    """(train_idx, test_idx) dari split tersimpan; tanpa split → StratifiedKFold."""
+    _, y, _ = load_app_data(meta)
+    split = load_split(out_dir, meta["app"])
+    if split is None or len(split["fold"]) != len(y):
+        return fold_indices(y, k)[fold_i - 1]
+    folds = np.asarray(split["fold"])
+    return np.flatnonzero(folds != fold_i), np.flatnonzero(folds == fold_i)
+
+
+# ------------------------------------------------------------
+# Latih / fine-tune satu fold
+# ------------------------------------------------------------
+def warm_start_model(vocab_path: str, weights_path: str, texts, store, n_classes: int):
+    """
+    Bi-GRU fold sebelumnya dengan vocabulary yang diperluas token baru
+    dari `texts`: baris embedding lama diambil dari bobot tersimpan, hanya
+    baris token baru yang dibaca dari store; bobot GRU & Dense disalin.
+    Kembalikan (model, tokenizer, max_len, token baru).
+    """
+    import tensorflow as tf
+    from tensorflow.keras.layers import Embedding
+
+    with open(vocab_path, encoding="utf-8") as f:
+        prev = json.load(f)
+    max_len = int(prev["max_len"])
+    old_size = int(prev["vocab_size"])
+    old = make_bigru_model(old_size, store.dim, np.zeros((old_size, store.dim), dtype=np.float32),
+                           max_len, n_classes)
+    with warnings.catch_warnings():
+        # state optimizer run sebelumnya sengaja tidak dipakai (fine-tune memakai Adam baru)
+        warnings.filterwarnings("ignore", message="Skipping variable loading for optimizer")
+        old.load_weights(weights_path)
+
+    tok = FittedTokenizer.from_vocab(prev["word_index"], prev.get("oov_token", "<OOV>"))
+    new_words = tok.extend(texts)
+    old_emb = next(layer for layer in old.layers if isinstance(layer, Embedding)).get_weights()[0]
+    emb_matrix = np.vstack([old_emb, store.lookup(new_words)])
+
+    model = make_bigru_model(len(tok.word_index) + 1, store.dim, emb_matrix, max_len, n_classes)
+    for src, dst in zip(old.layers, model.layers):
+        if not isinstance(dst, Embedding):
+            dst.set_weights(src.get_weights())
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=FINETUNE_LR),
+                  loss="sparse_categorical_crossentropy", metrics=["accuracy"])
+    return model, tok, max_len, new_words
+
+
+def run_fold(meta: dict, emb_path: str, fold_i: int, k: int, out_dir: str,
+             finetune_epochs: int | None = None) -> dict:
+    """
+    Latih & evaluasi satu fold, simpan hasilnya, kembalikan ringkasan.
+    `finetune_epochs`: warm-start dari bobot fold sebelumnya lalu fine-tune
+    sebanyak itu (None → latih dari nol seperti CELL 7).
+    """
+    import tensorflow as tf
+    from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
+    from sklearn.metrics import accuracy_score, precision_recall_fscore_support, confusion_matrix
+
+    t0 = time.perf_counter()
+    app = meta["app"]
+    random.seed(SEED)
+    np.random.seed(SEED)
+    tf.random.set_seed(SEED)
+
+    X_text, y, classes = load_app_data(meta)
+    n_classes = len(classes)
+    tr_idx, te_idx = fold_split(meta, out_dir, k, fold_i)
+    X_tr_text, X_te_text = X_text[tr_idx], X_text[te_idx]
+    y_tr, y_te = y[tr_idx], y[te_idx]
+
+    store = open_store(emb_path)
+    emb_dim = store.dim
+    weights_path, vocab_path = fold_model_paths(out_dir, app, fold_i)
+
+    if finetune_epochs:
+        model, tok, max_len, new_words = warm_start_model(vocab_path, weights_path, X_tr_text,
+                                                          store, n_classes)
+        X_tr = pad_post(tok.texts_to_sequences(X_tr_text), max_len)
+        es = EarlyStopping(monitor="val_loss", patience=1, restore_best_weights=True, verbose=0)
+        model.fit(X_tr, y_tr, validation_split=0.1, epochs=finetune_epochs, batch_size=64,
+                  callbacks=[es], verbose=0)
+    else:
+        tok = FittedTokenizer(X_tr_text)
+        new_words = list(tok.word_index)
+        max_len = calc_maxlen_p95(X_tr_text, tok)
+        X_tr = pad_post(tok.texts_to_sequences(X_tr_text), max_len)
+
+        vocab_size = len(tok.word_index) + 1
+        emb_matrix = store.embedding_matrix(tok)
+        model = make_bigru_model(vocab_size, emb_dim, emb_matrix, max_len, n_classes)
+
+        es  = EarlyStopping(monitor="val_loss", patience=3, restore_best_weights=True, verbose=0)
+        rlr = ReduceLROnPlateau(monitor="val_loss", factor=0.5, patience=1, min_lr=1e-5, verbose=0)
+        model.fit(X_tr, y_tr, validation_split=0.1, epochs=20, batch_size=64,
+                  callbacks=[es, rlr], verbose=0)
+    X_te = pad_post(tok.texts_to_sequences(X_te_text), max_len)
+
+    y_pred = np.argmax(model.predict(X_te, verbose=0), axis=1)
+    acc = accuracy_score(y_te, y_pred)
+    p, r, f1, _ = precision_recall_fscore_support(y_te, y_pred, average="macro", zero_division=0)
+    cm = confusion_matrix(y_te, y_pred, labels=np.arange(n_classes))
+
+    result = {
+        "app": app,
+        "fold": fold_i,
+        "classes": classes,
+        "mode": "inkremental" if finetune_epochs else "penuh",
+        "train_rows": int(len(tr_idx)),
+        "new_tokens": len(new_words),
+        "metrics": {
+            "aplikasi": app,
+            "fold": fold_i,
+            "accuracy": float(acc),
+            "precision_macro": float(p),
+            "recall_macro": float(r),
+            "f1_macro": float(f1),
+        },
+        "cm": cm.tolist(),
+        "preds": [
+            {
+                "aplikasi": app,
+                "fold": fold_i,
+                "text": X_te_text[i],
+                "true": classes[y_te[i]],
+                "pred": classes[y_pred[i]],
+                "status": "BENAR" if y_te[i] == y_pred[i] else "SALAH",
+            }
+            for i in range(len(y_te))
+        ],
+        "seconds": time.perf_counter() - t0,
+    }
+
+    # bobot + vocabulary ditulis sebelum hasil fold, agar fold yang
+    # tercatat selesai selalu bisa di-warm-start
+    tmp_weights = weights_path[:-len(".weights.h5")] + ".tmp.weights.h5"
+    model.save_weights(tmp_weights)
+    os.replace(tmp_weights, weights_path)
+    with open(vocab_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"word_index": tok.word_index, "oov_token": tok.oov_token, "max_len": max_len,
+                   "vocab_size": len(tok.word_index) + 1, "classes": classes}, f, ensure_ascii=False)
+    os.replace(vocab_path + ".tmp", vocab_path)
+
+    tf.keras.backend.clear_session()
+
+    # tulis atomik: file hanya ada bila fold benar-benar selesai
+    path = fold_result_path(out_dir, app, fold_i)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False)
+    os.replace(tmp, path)
+    return {"app": app, "fold": fold_i, "f1": float(f1), "acc": float(acc), "seconds": result["seconds"],
+            "mode": result["mode"], "new_tokens": len(new_words)}
+
+
+# ============================================================
+# Penggabungan hasil (format sama dengan CELL 7)
+# ============================================================
+def merge_results(out_dir: str, apps, k: int = K) -> dict:
+    fold_rows, pred_rows = [], []
+    cm_fold1, cm_sum = {}, {}
+    for app in apps:
+        total = None
+        for fold_i in range(1, k + 1):
+            with open(fold_result_path(out_dir, app, fold_i), encoding="utf-8") as f:
+                res = json.load(f)
+            cm = np.array(res["cm"], dtype=np.int64)
+            total = cm if total is None else total + cm
+            if fold_i == 1:
+                cm_fold1[app] = {"classes": res["classes"], "cm": res["cm"]}
+            fold_rows.append(res["metrics"])
+            pred_rows.extend(res["preds"])
+        cm_sum[app] = {"classes": res["classes"], "cm_sum": total.tolist()}
+
+    paths = {
+        "folds": os.path.join(out_dir, "tabel_evaluasi_5fold_per_app.csv"),
+        "preds": os.path.join(out_dir, "bukti_true_vs_pred_per_fold.csv"),
+        "cm_fold1": os.path.join(out_dir, "confusion_matrix_fold1.json"),
+        "cm_sum": os.path.join(out_dir, "confusion_matrix_sum.json"),
+    }
+    pd.DataFrame(fold_rows).to_csv(paths["folds"], index=False)
+    pd.DataFrame(pred_rows).to_csv(paths["preds"], index=False)
+    with open(paths["cm_fold1"], "w") as f:
+        json.dump(cm_fold1, f, ensure_ascii=False, indent=2)
+    with open(paths["cm_sum"], "w") as f:
+        json.dump(cm_sum, f, ensure_ascii=False, indent=2)
+    return paths
+
+
+def write_recaps(out_dir: str, preds_path: str) -> dict:
+    """Rekap CELL 10 dari log prediksi (REKAP_BENAR_SALAH, REKAP_ERROR, rekap per aplikasi)."""
+    from .aggregate import evaluate_predictions
+
+    agg = evaluate_predictions([preds_path])
+    paths = {
+        "rekap_status": os.path.join(out_dir, "REKAP_BENAR_SALAH_PER_APLIKASI.csv"),
+        "rekap_error": os.path.join(out_dir, "REKAP_ERROR_TRUE_TO_PRED.csv"),
+        "rekap": os.path.join(out_dir, "rekap_aplikasi.csv"),
+    }
+    agg.status_table().to_csv(paths["rekap_status"], index=False)
+    agg.error_table().to_csv(paths["rekap_error"], index=False)
+    agg.recap_table().round(4).to_csv(paths["rekap"], index=False)
+    return paths
+
+
+def fold_summary(out_dir: str, app: str, k: int = K) -> dict | None:
+    """Rata-rata metrik fold + total detik satu aplikasi (None bila ada fold yang belum ada)."""
+    rows = []
+    for fold_i in range(1, k + 1):
+        try:
+            with open(fold_result_path(out_dir, app, fold_i), encoding="utf-8") as f:
+                res = json.load(f)
+        except OSError:
+            return None
+        rows.append({**res["metrics"], "seconds": res["seconds"], "new_tokens": res.get("new_tokens", 0)})
+    df = pd.DataFrame(rows)
+    out = df[["accuracy", "precision_macro", "recall_macro", "f1_macro", "new_tokens"]].mean().to_dict()
+    out["seconds"] = float(df["seconds"].sum())
+    return out
+
+
+# ------------------------------------------------------------
+# State run inkremental (hash data per aplikasi)
+# ------------------------------------------------------------
+def load_state(out_dir: str) -> dict:
+    try:
+        with open(os.path.join(out_dir, STATE_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(out_dir: str, state: dict) -> None:
+    path = os.path.join(out_dir, STATE_FILE)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def _record_state(state: dict, out_dir: str, app: str, meta: dict, keys, k: int,
+                  fasttext_dir: str, mode: str) -> None:
+    _, _, classes = load_app_data(meta)
+    summary = fold_summary(out_dir, app, k) or {}
+    prev = state.get(app, {})
+    state[app] = {
+        "data_hash": data_hash(keys),
+        "rows": len(keys),
+        "classes": classes,
+        "k": k,
+        "ft_mtime": os.path.getmtime(fasttext_path(fasttext_dir, app)),
+        "mode": mode,
+        "full_seconds": summary.get("seconds") if mode == "penuh" else prev.get("full_seconds"),
+        "updated": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+# ============================================================
+# Orkestrator
+# ============================================================
+def fasttext_path(fasttext_dir: str, app: str) -> str:
+    return os.path.join(fasttext_dir, f"{app.lower()}_fasttext.bin")
+
+
+def embedding_store_path(fasttext_dir: str, app: str) -> str:
+    return os.path.join(fasttext_dir, f"{app.lower()}_embeddings")
+
+
+def ensure_embedding_store(meta: dict, fasttext_dir: str, app: str, dtype: str = "float32") -> str:
+    """
+    Ekspor vektor semua kata korpus `app` dari `<app>_fasttext.bin` ke
+    store memory-mapped (sekali, di proses utama). Store diekspor ulang
+    bila model .bin lebih baru atau dtype berbeda; kata korpus yang belum
+    tercakup (data baru) cukup ditambahkan ke store yang ada.
+    """
+    ft_path = fasttext_path(fasttext_dir, app)
+    path = embedding_store_path(fasttext_dir, app)
+    X_text, _, _ = load_app_data(meta)
+    words = list(FittedTokenizer(X_text).word_index)
+
+    if store_exists(path):
+        store = open_store(path)
+        fresh = (store.meta.get("source_mtime") == os.path.getmtime(ft_path)
+                 and store.meta.get("dtype") == dtype)
+        if fresh:
+            new_words = extend_store(ft_path, words, path)
+            if new_words:
+                print(f"✅ {app}: embedding store +{len(new_words)} kata baru -> {path}")
+            return path
+    export_store(ft_path, words, path, dtype=dtype,
+                 extra={"source_mtime": os.path.getmtime(ft_path)})
+    print(f"✅ {app}: embedding store {len(words)} kata ({dtype}) -> {path}")
+    return path
+
+
+def _run_jobs(jobs, workers: int, threads: int) -> list[dict]:
+    results = []
+    if not jobs:
+        return results
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(jobs)),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(threads,),
+    ) as ex:
+        futures = [ex.submit(run_fold, *job) for job in jobs]
+        for fut in as_completed(futures):
+            r = fut.result()
+            results.append(r)
+            print(f"{r['app']} | fold {r['fold']} | {r['mode']} | acc={r['acc']:.4f} f1={r['f1']:.4f} "
+                  f"({r['seconds']:.0f} s)")
+    return results
+
+
+def run_cv(
+    meta: dict,
+    fasttext_dir: str,
+    out_dir: str,
+    apps=APPS,
+    k: int = K,
+    workers: int | None = None,
+    threads_per_worker: int | None = None,
+    force: bool = False,
+    emb_dtype: str = "float32",
+) -> dict:
+    """
+    Jalankan semua job (app, fold) yang belum punya hasil, lalu gabungkan.
+    meta: isi meta.json CELL 5 ({app: {idonly_path, text_col, label_col, ...}}).
+    Worker membaca vektor dari embedding store (lihat sentinex.embeddings),
+    bukan dari model .bin FastText.
+    Hasil fold hanya dipakai ulang bila split tersimpan masih cocok dengan
+    data; bila data berubah, split dibuat ulang dan semua fold aplikasi itu
+    dilatih ulang (hasil dua split berbeda tidak pernah dicampur).
+    """
+    os.makedirs(os.path.join(out_dir, FOLD_DIR), exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    threads = threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+
+    jobs, skipped, trained = [], 0, {}
+    for app in apps:
+        app_meta = dict(meta[app], app=app)
+        keys = row_keys(app_meta)
+        split = load_split(out_dir, app)
+        if (force or split is None or split["keys"] != keys or len(split["fold"]) != len(keys)
+                or max(split["fold"], default=k) != k):
+            clear_folds(out_dir, app)
+            save_split(out_dir, app, keys, assign_folds(keys, load_app_data(app_meta)[1], k))
+        todo = [i for i in range(1, k + 1) if not os.path.exists(fold_result_path(out_dir, app, i))]
+        skipped += k - len(todo)
+        if not todo:
+            continue
+        ensure_embedding_store(app_meta, fasttext_dir, app, dtype=emb_dtype)
+        jobs += [(app_meta, embedding_store_path(fasttext_dir, app), i, k, out_dir) for i in todo]
+        trained[app] = keys
+
+    print(f"Job: {len(jobs)} dijalankan, {skipped} dilewati (sudah ada) | "
+          f"workers={workers}, thread/worker={threads}")
+    t0 = time.perf_counter()
+    _run_jobs(jobs, workers, threads)
+
+    paths = merge_results(out_dir, apps, k)
+    if trained:
+        state = load_state(out_dir)
+        for app, keys in trained.items():
+            _record_state(state, out_dir, app, dict(meta[app], app=app), keys, k, fasttext_dir, "penuh")
+        save_state(out_dir, state)
+    print(f"✅ Selesai dalam {time.perf_counter() - t0:.0f} s")
+    for p in paths.values():
+        print("✅ Saved:", p)
+    return paths
+
+
+def run_incremental(
+    meta: dict,
+    fasttext_dir: str,
+    out_dir: str,
+    apps=APPS,
+    k: int = K,
+    workers: int | None = None,
+    threads_per_worker: int | None = None,
+    finetune_epochs: int = FINETUNE_EPOCHS,
+    emb_dtype: str = "float32",
+    compare_full: str | None = None,
+) -> pd.DataFrame:
+    """
+    Perbarui hasil k-fold setelah data berlabel bertambah/berubah.
+
+    Per aplikasi: hash data sama dengan run sebelumnya → dilewati; berubah
+    dan semua fold punya bobot + vocabulary tersimpan (kelas, k, dan model
+    FastText tetap) → warm-start + fine-tune `finetune_epochs` epoch;
+    selain itu → latih penuh. FastText tidak dilatih ulang: vektor token
+    baru diturunkan dari subword model .bin yang ada.
+
+    `compare_full`: folder untuk pelatihan penuh pembanding (aplikasi yang
+    berubah saja) agar metrik & waktu bisa dibandingkan.
+    Kembalikan tabel laporan (juga ditulis ke `laporan_inkremental.csv`).
+    """
+    os.makedirs(os.path.join(out_dir, FOLD_DIR), exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    threads = threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+    state = load_state(out_dir)
+
+    t0 = time.perf_counter()
+    jobs, plan, keys_of = [], {}, {}
+    for app in apps:
+        app_meta = dict(meta[app], app=app)
+        _, y, classes = load_app_data(app_meta)
+        keys = keys_of[app] = row_keys(app_meta)
+        prev = state.get(app)
+        before = fold_summary(out_dir, app, k)
+        row = {"aplikasi": app, "baris_sebelum": prev["rows"] if prev else None, "baris": len(keys)}
+        if before is not None:
+            row.update({"accuracy_sebelum": before["accuracy"], "f1_sebelum": before["f1_macro"]})
+
+        if prev and prev["data_hash"] == data_hash(keys) and prev["k"] == k and before is not None:
+            plan[app] = {**row, "mode": "dilewati", "baris_baru": 0}
+            continue
+
+        split = load_split(out_dir, app)
+        warm = (
+            prev is not None and before is not None and split is not None
+            and prev["classes"] == classes and prev["k"] == k
+            and prev.get("ft_mtime") == os.path.getmtime(fasttext_path(fasttext_dir, app))
+            and all(os.path.exists(p) for i in range(1, k + 1) for p in fold_model_paths(out_dir, app, i))
+        )
+        new_rows = sum((Counter(keys) - Counter(split["keys"])).values()) if split else len(keys)
+        save_split(out_dir, app, keys, assign_folds(keys, y, k, split if warm else None))
+        emb_path = ensure_embedding_store(app_meta, fasttext_dir, app, dtype=emb_dtype)
+        for fold_i in range(1, k + 1):
+            jobs.append((app_meta, emb_path, fold_i, k, out_dir, finetune_epochs if warm else None))
+        plan[app] = {**row, "mode": "inkremental" if warm else "penuh", "baris_baru": new_rows}
+
+    for app, row in plan.items():
+        print(f"{app}: {row['mode']} ({row['baris']} baris, {row['baris_baru']} baru)")
+    print(f"Job: {len(jobs)} | workers={workers}, thread/worker={threads}")
+    _run_jobs(jobs, workers, threads)
+
+    paths = merge_results(out_dir, apps, k)
+    paths.update(write_recaps(out_dir, paths["preds"]))
+    for app, row in plan.items():
+        if row["mode"] != "dilewati":
+            _record_state(state, out_dir, app, dict(meta[app], app=app), keys_of[app], k,
+                          fasttext_dir, row["mode"])
+    save_state(out_dir, state)
+    wall = time.perf_counter() - t0
+
+    for app, row in plan.items():
+        after = fold_summary(out_dir, app, k)
+        row.update({
+            "token_baru_per_fold": after["new_tokens"] if row["mode"] == "inkremental" else None,
+            "accuracy": after["accuracy"],
+            "f1_macro": after["f1_macro"],
+            "detik": after["seconds"] if row["mode"] != "dilewati" else 0.0,
+            "detik_penuh_terakhir": state.get(app, {}).get("full_seconds"),
+        })
+
+    changed = [app for app, row in plan.items() if row["mode"] != "dilewati"]
+    full_wall = None
+    if compare_full and changed:
+        print(f"\nPembanding: latih penuh {', '.join(changed)} -> {compare_full}")
+        t1 = time.perf_counter()
+        run_cv(meta, fasttext_dir, compare_full, apps=changed, k=k, workers=workers,
+               threads_per_worker=threads, force=True, emb_dtype=emb_dtype)
+        full_wall = time.perf_counter() - t1
+        for app in changed:
+            full = fold_summary(compare_full, app, k)
+            plan[app].update({"accuracy_penuh": full["accuracy"], "f1_penuh": full["f1_macro"],
+                              "detik_penuh": full["seconds"]})
+
+    report = pd.DataFrame(list(plan.values()))
+    ref = report["detik_penuh"] if "detik_penuh" in report else report["detik_penuh_terakhir"]
+    detik = report["detik"].where(report["detik"] > 0)
+    report["percepatan"] = pd.to_numeric(ref, errors="coerce") / detik
+    for col in ("baris_sebelum", "baris", "baris_baru"):
+        report[col] = report[col].astype("Int64")
+    report = pd.concat([report, pd.DataFrame([{
+        "aplikasi": "SEMUA (wall)", "detik": wall,
+        **({"detik_penuh": full_wall, "percepatan": full_wall / wall} if full_wall else {}),
+    }])], ignore_index=True)
+    paths["laporan"] = os.path.join(out_dir, REPORT_FILE)
+    report.to_csv(paths["laporan"], index=False, float_format="%.4f")
+
+    print()
+    print(report.round(4).to_string(index=False))
+    for p in paths.values():
+        print("✅ Saved:", p)
+    return report
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="python -m sentinex.training",
+        description="K-fold FastText + Bi-GRU paralel per (aplikasi, fold), bisa di-resume.",
+    )
+    ap.add_argument("--meta", required=True, help="meta.json hasil CELL 5")
+    ap.add_argument("--fasttext-dir", required=True, help="folder <app>_fasttext.bin (CELL 6)")
+    ap.add_argument("--out-dir", required=True, help="folder keluaran (setara CELL 7)")
+    ap.add_argument("--apps", nargs="+", default=APPS)
+    ap.add_argument("-k", type=int, default=K)
+    ap.add_argument("-w", "--workers", type=int, default=None, help="jumlah proses (default: jumlah core)")
+    ap.add_argument("--threads-per-worker", type=int, default=None)
+    ap.add_argument("--force", action="store_true", help="latih ulang walau hasil fold sudah ada")
+    ap.add_argument("--float16", action="store_true", help="simpan embedding store sebagai float16")
+    ap.add_argument("--incremental", action="store_true",
+                    help="lewati aplikasi yang datanya tidak berubah, warm-start + fine-tune sisanya")
+    ap.add_argument("--finetune-epochs", type=int, default=FINETUNE_EPOCHS,
+                    help=f"epoch fine-tune mode inkremental (default: {FINETUNE_EPOCHS})")
+    ap.add_argument("--compare-full", metavar="DIR",
+                    help="mode inkremental: latih penuh aplikasi yang berubah ke DIR sebagai pembanding")
+    args = ap.parse_args(argv)
+
+    with open(args.meta, encoding="utf-8") as f:
+        meta = json.load(f)
+    emb_dtype = "float16" if args.float16 else "float32"
+    if args.incremental:
+        run_incremental(meta, args.fasttext_dir, args.out_dir, apps=args.apps, k=args.k,
+                        workers=args.workers, threads_per_worker=args.threads_per_worker,
+                        finetune_epochs=args.finetune_epochs, emb_dtype=emb_dtype,
+                        compare_full=args.compare_full)
+    else:
+        run_cv(meta, args.fasttext_dir, args.out_dir, apps=args.apps, k=args.k,
+               workers=args.workers, threads_per_worker=args.threads_per_worker, force=args.force,
+               emb_dtype=emb_dtype)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
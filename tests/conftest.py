@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """
+    Folder cache per test: file cache (stem, dedup, store, scraper) tidak
+    ditulis ke checkout, dan instance stemmer bersama dibuat ulang sehingga
+    save saat exit menulis ke tmp_path.
+    """
+    from sentinex import config, stemming
+
+    cache_dir = str(tmp_path / "sentinex_cache")
+    monkeypatch.setenv("SENTINEX_CACHE_DIR", cache_dir)  # untuk proses worker (spawn)
+    monkeypatch.delenv("SENTINEX_STEM_CACHE", raising=False)
+    monkeypatch.setattr(config, "CACHE_DIR", cache_dir)
+    monkeypatch.setattr(stemming, "_SERVICE", None)
+    return cache_dir
@@ -0,0 +1,57 @@
+"""Rekap evaluasi streaming harus sama persis dengan keluaran CELL 10 asli (folder HASIL BARU)."""
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import ROOT
+from sentinex.aggregate import EvalAggregator, app_order, evaluate_predictions
+
+BASELINE = os.path.join(ROOT, "HASIL BARU")
+LOG = os.path.join(BASELINE, "BUKTI_PREDIKSI_ALL (1).csv")
+
+pytestmark = pytest.mark.skipif(not os.path.exists(LOG), reason="data HASIL BARU tidak ada")
+
+
+@pytest.fixture(scope="module")
+def agg():
+    return evaluate_predictions([LOG], chunksize=500)
+
+
+def written(df, tmp_path, name, **kwargs):
+    path = tmp_path / name
+    df.to_csv(path, index=False, **kwargs)
+    return path.read_bytes()
+
+
+def baseline(name):
+    with open(os.path.join(BASELINE, name), "rb") as f:
+        return f.read()
+
+
+def test_status_table_matches_baseline(agg, tmp_path):
+    out = written(agg.status_table(), tmp_path, "status.csv")
+    assert out == baseline("REKAP_BENAR_SALAH_PER_APLIKASI.csv")
+
+
+def test_error_table_matches_baseline(agg, tmp_path):
+    out = written(agg.error_table(), tmp_path, "error.csv")
+    assert out == baseline("REKAP_ERROR_TRUE_TO_PRED.csv")
+
+
+def test_recap_table_matches_baseline(agg, tmp_path):
+    out = written(agg.recap_table().round(4), tmp_path, "rekap.csv")
+    assert out == baseline("rekap_4_aplikasi.csv")
+
+
+def test_app_order_known_apps_first():
+    assert app_order(["Zalora", "Blibli", "Tokopedia", "Alfagift"]) == [
+        "Tokopedia", "Blibli", "Alfagift", "Zalora"]
+
+
+def test_error_table_order_with_extra_app():
+    df = pd.DataFrame({"aplikasi": ["Zalora", "Blibli", "Shopee"], "fold": [1, 1, 1],
+                       "true": ["positif"] * 3, "pred": ["negatif"] * 3})
+    agg = EvalAggregator()
+    agg.update(df)
+    assert agg.error_table()["aplikasi"].tolist() == ["Shopee", "Blibli", "Zalora"]
@@ -0,0 +1,162 @@
+"""HTTP API di dalam proses: respons benar, coalescing micro-batch, dan 503 saat antrean penuh."""
+import asyncio
+import json
+import threading
+from urllib.parse import urlsplit
+
+from sentinex import api
+from sentinex.api import SentimentServer
+from sentinex.loadgen import _request, run_load
+from sentinex.parallel import shutdown_pools
+from sentinex.preprocessing import preprocess_batch
+
+TEXTS = ["barangnya bagus banget, pengiriman cepat", "kecewa, barang rusak dan penjual lambat",
+         "biasa saja", "mantap sekali tokonya ramah"]
+
+
+def serve(test, **kwargs):
+    """Jalankan `test(app, url)` dengan server di port acak."""
+    async def main():
+        app = SentimentServer(**kwargs)
+        server = await app.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await test(app, f"http://127.0.0.1:{port}")
+        finally:
+            server.close()
+            await server.wait_closed()
+            await app.close()
+
+    return asyncio.run(main())
+
+
+async def post(url, path, payload):
+    u = urlsplit(url)
+    reader, writer = await asyncio.open_connection(u.hostname, u.port)
+    try:
+        return await _request(reader, writer, u.netloc, path, payload)
+    finally:
+        writer.close()
+
+
+def expected(texts):
+    return preprocess_batch(texts, keep_intermediate=True)
+
+
+# ------------------------------------------------------------
+# Respons benar
+# ------------------------------------------------------------
+def test_endpoints_match_pipeline():
+    async def test(app, url):
+        single = await post(url, "/sentiment", {"text": TEXTS[0]})
+        prep = await post(url, "/preprocess", {"text": TEXTS[1]})
+        batch = await post(url, "/sentiment/batch", {"texts": TEXTS})
+        bad = await post(url, "/sentiment", {"teks": "x"})
+        return single, prep, batch, bad
+
+    (s1, single), (s2, prep), (s3, batch), (s4, _) = serve(test)
+    ref = expected(TEXTS)
+    assert (s1, s2, s3, s4) == (200, 200, 200, 400)
+    assert (single["stem"], single["sentimen"]) == (ref["stem"][0], ref["sentimen"][0])
+    assert prep["token"] == ref["token"][1] and prep["clean"] == ref["clean"][1]
+    assert [r["stem"] for r in batch["results"]] == ref["stem"].tolist()
+    assert [r["sentimen"] for r in batch["results"]] == ref["sentimen"].tolist()
+    assert set(single["timings"]) == {"queue_ms", "process_ms", "batch_size", "total_ms"}
+
+
+def test_loadgen_against_server():
+    async def test(app, url):
+        return await run_load(url, "/sentiment", TEXTS, n=40, concurrency=8)
+
+    report = serve(test)
+    assert report["status"] == {200: 40}
+    assert report["requests"] == 40 and report["latency_ms"]["p50"] is not None
+
+
+
+async def raw(url, head: str):
+    """Kirim request mentah; kembalikan (status, body JSON) lalu tunggu koneksi ditutup server."""
+    u = urlsplit(url)
+    reader, writer = await asyncio.open_connection(u.hostname, u.port)
+    try:
+        writer.write(head.encode("latin-1"))
+        await writer.drain()
+        data = await asyncio.wait_for(reader.read(), 10)  # EOF: server menutup koneksi
+    finally:
+        writer.close()
+    head_part, _, body = data.partition(b"\r\n\r\n")
+    return int(head_part.split()[1]), json.loads(body)
+
+
+def test_content_length_guard():
+    lengths = ["abc", "-5", "1_0", "\u00b2", str(api.MAX_BODY_BYTES + 1)]
+
+    async def test(app, url):
+        out = [await raw(url, f"POST /sentiment HTTP/1.1\r\nContent-Length: {n}\r\n\r\n")
+               for n in lengths]
+        return out, app.requests
+
+    results, handled = serve(test)
+    assert [s for s, _ in results] == [400, 400, 400, 400, 413]
+    assert results[0][1]["error"] == "Content-Length tidak valid"
+    assert handled == 0  # tidak ada yang sampai ke dispatch
+
+# ------------------------------------------------------------
+# Coalescing
+# ------------------------------------------------------------
+def test_concurrent_requests_coalesce_into_one_batch():
+    async def test(app, url):
+        bodies = [json.dumps({"text": t}).encode() for t in TEXTS * 2]
+        return await asyncio.gather(*[app.dispatch("POST", "/sentiment", b) for b in bodies]), app
+
+    results, app = serve(test, max_batch=8, max_wait_ms=2000)
+    assert app.sentiment.batches == 1
+    assert all(status == 200 and out["timings"]["batch_size"] == 8 for status, out, _ in results)
+    ref = expected(TEXTS * 2)
+    assert [out["stem"] for _, out, _ in results] == ref["stem"].tolist()
+
+
+# ------------------------------------------------------------
+# Backpressure
+# ------------------------------------------------------------
+def test_full_queue_returns_503(monkeypatch):
+    gate = threading.Event()
+    real = api.run_batch
+
+    def blocked(*args):
+        gate.wait(10)
+        return real(*args)
+
+    monkeypatch.setattr(api, "run_batch", blocked)
+
+    async def test(app, url):
+        body = json.dumps({"text": TEXTS[0]}).encode()
+        pending = []
+        # 1: berjalan (worker tertahan), 2: menunggu slot, 3: di antrean → antrean penuh
+        for _ in range(3):
+            pending.append(asyncio.create_task(app.dispatch("POST", "/sentiment", body)))
+            await asyncio.sleep(0.05)
+        rejected = await app.dispatch("POST", "/sentiment", body)
+        gate.set()
+        return rejected, [await t for t in pending], app
+
+    (status, payload, headers), done, app = serve(test, max_batch=1, queue_limit=1)
+    assert status == 503 and "antrean" in payload["error"]
+    assert headers == {"Retry-After": "1"}
+    assert app.rejected == 1
+    assert [s for s, _, _ in done] == [200, 200, 200]
+
+
+# ------------------------------------------------------------
+# Worker process (jalur get_pool)
+# ------------------------------------------------------------
+def test_process_pool_workers():
+    async def test(app, url):
+        return await post(url, "/sentiment/batch", {"texts": TEXTS})
+
+    try:
+        status, out = serve(test, workers=2)
+    finally:
+        shutdown_pools()
+    assert status == 200
+    assert [r["stem"] for r in out["results"]] == expected(TEXTS)["stem"].tolist()
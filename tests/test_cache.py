@@ -0,0 +1,74 @@
+"""ResultCache: fingerprint dimemo & cleaning hanya sekali per miss."""
+import json
+
+import pytest
+
+from sentinex import cache, preprocessing, sentiment
+from sentinex.cache import ResultCache, lexicon_fingerprint, preprocess_cached, preprocessing_fingerprint
+from sentinex.lexicon import Lexicon
+from sentinex.normalizer import Normalizer
+from sentinex.preprocessing import preprocess_batch
+
+TEXTS = ["Barangnya bagusss bgt!!", "pengiriman lama @toko #kecewa", "Barangnya bagusss bgt!!", "ok"]
+
+
+@pytest.fixture
+def own_dicts(monkeypatch):
+    """Normalizer & leksikon salinan agar perubahan tidak bocor ke test lain."""
+    monkeypatch.setattr(preprocessing, "normalizer", Normalizer(preprocessing.normalizer.to_dict()))
+    lex = Lexicon(dict(zip(sentiment.lexicon.terms, sentiment.lexicon.weights)), sentiment.lexicon.profanity)
+    monkeypatch.setattr(sentiment, "lexicon", lex)
+
+
+@pytest.fixture
+def digest_calls(monkeypatch):
+    calls = []
+    real = cache._digest
+    monkeypatch.setattr(cache, "_digest", lambda obj: calls.append(obj) or real(obj))
+    return calls
+
+
+def test_fingerprint_memoized(own_dicts, digest_calls):
+    fp = preprocessing_fingerprint(), lexicon_fingerprint()
+    n = len(digest_calls)
+    for _ in range(5):
+        assert (preprocessing_fingerprint(), lexicon_fingerprint()) == fp
+    assert len(digest_calls) == n
+
+
+def test_load_slang_invalidates_fingerprint(own_dicts, tmp_path):
+    before = preprocessing_fingerprint()
+    path = tmp_path / "slang.json"
+    path.write_text(json.dumps({"mantul": "mantap betul"}))
+    preprocessing.load_slang(str(path))
+    assert preprocessing_fingerprint() != before
+
+
+def test_lexicon_update_invalidates_fingerprint(own_dicts):
+    before = lexicon_fingerprint()
+    sentiment.lexicon.add({"mantul": 1.0})
+    assert lexicon_fingerprint() != before
+
+
+def test_miss_runs_cleaning_once(monkeypatch):
+    calls = []
+    real = preprocessing.cleaning_series
+
+    def counting(texts):
+        calls.append(len(texts))
+        return real(texts)
+
+    monkeypatch.setattr(preprocessing, "cleaning_series", counting)
+    monkeypatch.setattr(cache, "cleaning_series", counting)
+    out = preprocess_cached(TEXTS, cache=ResultCache())
+    assert calls == [len(TEXTS)]
+    expected = preprocess_batch(TEXTS)
+    assert out["stem"].tolist() == expected["stem"].tolist()
+    assert out["sentimen"].tolist() == expected["sentimen"].tolist()
+
+
+def test_hit_and_miss_counts():
+    rc = ResultCache()
+    preprocess_cached(TEXTS, cache=rc)
+    preprocess_cached(TEXTS, cache=rc)
+    assert (rc.hits, rc.misses) == (3, 3)
@@ -0,0 +1,35 @@
+"""ChunkEncoder: skema tetap walau tipe tebakan pandas berubah antar chunk."""
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from sentinex.columnar import ChunkEncoder
+
+
+def test_declared_columns_ignore_first_chunk_dtype():
+    enc = ChunkEncoder()
+    first = enc.encode(pd.DataFrame({"stem": [None, None], "dup_cluster": [0.0, None]}))
+    assert first.schema.field("stem").type == pa.string()
+    assert first.schema.field("dup_cluster").type == pa.int64()
+    second = enc.encode(pd.DataFrame({"stem": ["bagus", "mantap"], "dup_cluster": [1, 2]}))
+    assert second.column("stem").to_pylist() == ["bagus", "mantap"]
+
+
+def test_all_null_first_chunk_becomes_string():
+    enc = ChunkEncoder()
+    enc.encode(pd.DataFrame({"reply": [float("nan")] * 2}))
+    t = enc.encode(pd.DataFrame({"reply": ["oke", 12]}))
+    assert t.column("reply").to_pylist() == ["oke", "12"]
+
+
+def test_promote_numeric():
+    enc = ChunkEncoder(promote_numeric=True)
+    assert enc.encode(pd.DataFrame({"score": [5, 4]})).schema.field("score").type == pa.float64()
+    assert enc.encode(pd.DataFrame({"score": [None, 2.5]})).column("score").to_pylist() == [None, 2.5]
+
+
+def test_incompatible_later_chunk_names_column():
+    enc = ChunkEncoder(promote_numeric=True)
+    enc.encode(pd.DataFrame({"score": [5, 4]}))
+    with pytest.raises(ValueError, match="score"):
+        enc.encode(pd.DataFrame({"score": ["lima", "empat"]}))
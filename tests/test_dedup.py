@@ -0,0 +1,96 @@
+"""Indeks near-duplicate: ukuran klaster stabil saat data yang sama diproses ulang."""
+import io
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from sentinex.aggregate import label_distribution
+from sentinex.dedup import NearDupIndex, member_keys, preprocess_dedup, shingle_hashes
+
+TEXTS = [
+    "aplikasi mantap sekali pengiriman cepat",
+    "aplikasi mantap sekali pengiriman cepat!",
+    "mantap",
+    "mantap",
+    "barang rusak dan penjual tidak merespon chat sama sekali",
+]
+
+
+def test_reassigning_same_rows_does_not_inflate_sizes():
+    idx = NearDupIndex()
+    first = idx.assign(TEXTS)
+    stats = idx.stats()
+    again = idx.assign(TEXTS)
+    assert (first == again).all()
+    assert idx.stats()["members"] == stats["members"] == len(TEXTS)
+    assert idx.stats()["duplicates"] == stats["duplicates"]
+
+
+def test_identical_texts_in_one_batch_are_distinct_members():
+    idx = NearDupIndex()
+    ids = idx.assign(["mantap"] * 3)
+    assert idx.sizes[ids[0]] == 3
+
+
+def test_explicit_member_ids():
+    idx = NearDupIndex()
+    idx.assign(["mantap", "mantap"], member_keys(None, ids=["r1", "r2"]))
+    idx.assign(["mantap", "mantap"], member_keys(None, ids=["r2", "r3"]))
+    assert idx.sizes == [3]
+
+
+def test_occurrences_continue_across_chunks():
+    occ = Counter()
+    a = member_keys(["mantap", "mantap"], occurrences=occ)
+    b = member_keys(["mantap"], occurrences=occ)
+    assert len(set(a + b)) == 3
+    assert member_keys(["mantap", "mantap", "mantap"]) == a + b
+
+
+def test_members_survive_save_and_load(tmp_path):
+    path = str(tmp_path / "neardup.json")
+    idx = NearDupIndex(path=path)
+    idx.assign(TEXTS)
+    idx.save()
+    loaded = NearDupIndex.load(path)
+    before = loaded.stats()["members"]
+    loaded.assign(TEXTS)
+    assert loaded.stats()["members"] == before
+    assert loaded.sizes == idx.sizes
+
+
+def test_preprocess_dedup_rerun_keeps_dup_size():
+    idx = NearDupIndex()
+    texts = pd.Series(TEXTS * 2)
+    first, _ = preprocess_dedup(texts, idx)
+    second, info = preprocess_dedup(texts, idx)
+    assert first["dup_size"].tolist() == second["dup_size"].tolist()
+    assert info["processed"] == 0
+
+
+def test_label_distribution_counts_rows_without_cluster():
+    csv = io.StringIO(
+        "sentimen,dup_cluster\n"
+        "Positif,0\n"
+        "Positif,0\n"
+        "Negatif,\n"
+        "Negatif,\n"
+        "Netral,1\n"
+    )
+    table = label_distribution([("App", csv, "sentimen")], dedup_col="dup_cluster")
+    row = table.iloc[0]
+    assert (row["Positif"], row["Negatif"], row["Netral"], row["Total"]) == (1, 2, 1, 4)
+
+
+def test_signature_matches_exact_modular_hash():
+    idx = NearDupIndex()
+    shingles = shingle_hashes("barangnya bagus banget, pengiriman cepat sekali")
+    shingles = np.concatenate([shingles, np.array([0, (1 << 32) - 1], dtype=np.uint64)])
+    p = (1 << 61) - 1
+    expected = [min(((int(a) * int(x) + int(b)) % p) & 0xFFFFFFFF for x in shingles)
+                for a, b in zip(idx._a, idx._b)]  # bilangan bulat Python: tanpa overflow
+    sig = idx.signature(shingles)
+    assert sig.tolist() == expected
+    assert int(idx._a.max()) < 1 << 32 and int(idx._b.max()) < 1 << 32
+    np.testing.assert_array_equal(NearDupIndex().signature(shingles), sig)  # deterministik
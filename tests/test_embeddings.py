@@ -0,0 +1,86 @@
+"""Embedding store memory-mapped: ekspor, baca ulang, dan perluasan kosakata."""
+import json
+import os
+
+import numpy as np
+import pytest
+
+from sentinex.embeddings import EmbeddingStore, export_store, extend_store, open_store, store_exists
+from sentinex.training import FittedTokenizer
+
+
+class FakeFastText:
+    """Model FastText tiruan: vektor deterministik per kata, mencatat kata yang dihitung."""
+
+    def __init__(self, dim: int = 4):
+        self.dim = dim
+        self.calls: list[str] = []
+
+    def get_dimension(self) -> int:
+        return self.dim
+
+    def get_word_vector(self, word: str) -> np.ndarray:
+        self.calls.append(word)
+        seed = int.from_bytes(word.encode("utf-8")[:8].ljust(8, b"\0"), "little")
+        return np.random.default_rng(seed).normal(size=self.dim).astype(np.float32)
+
+
+WORDS = ["bagus", "barang", "cepat", "bagus", "pengiriman"]
+
+
+def test_export_round_trip_is_memory_mapped(tmp_path):
+    ft = FakeFastText()
+    path = str(tmp_path / "store")
+    export_store(ft, WORDS, path, source="tiruan.bin", extra={"source_mtime": 1.5})
+    assert store_exists(path) and not os.path.exists(path + ".tmp")
+
+    store = EmbeddingStore(path)
+    assert isinstance(store.vectors, np.memmap)
+    assert store.words == ["bagus", "barang", "cepat", "pengiriman"]  # tanpa duplikat, urutan tetap
+    assert store.meta["source"] == "tiruan.bin" and store.meta["source_mtime"] == 1.5
+    out = store.lookup(["cepat", "tidak_ada", "bagus"])
+    np.testing.assert_array_equal(out[0], ft.get_word_vector("cepat"))
+    np.testing.assert_array_equal(out[1], np.zeros(4, dtype=np.float32))
+    assert store.missing(["bagus", "mantap"]) == ["mantap"]
+
+
+def test_embedding_matrix_rows_follow_tokenizer(tmp_path):
+    ft = FakeFastText()
+    path = str(tmp_path / "store")
+    export_store(ft, WORDS, path)
+    tok = FittedTokenizer(["bagus barang", "bagus asing"])
+    emb = open_store(path).embedding_matrix(tok)
+    assert emb.shape == (len(tok.word_index) + 1, 4)
+    assert not emb[0].any()
+    np.testing.assert_array_equal(emb[tok.word_index["barang"]], ft.get_word_vector("barang"))
+    assert not emb[tok.word_index["asing"]].any()
+
+
+def test_float16_store(tmp_path):
+    path = str(tmp_path / "store16")
+    export_store(FakeFastText(), WORDS, path, dtype="float16")
+    store = EmbeddingStore(path)
+    assert store.vectors.dtype == np.float16 and store.lookup(["bagus"]).dtype == np.float32
+    with pytest.raises(ValueError):
+        export_store(FakeFastText(), WORDS, path, dtype="int8")
+
+
+def test_extend_only_computes_new_words(tmp_path):
+    path = str(tmp_path / "store")
+    export_store(FakeFastText(), WORDS, path, extra={"source_mtime": 2.0})
+    before = EmbeddingStore(path)
+    old = np.array(before.vectors)
+    stale = open_store(path)
+
+    ft = FakeFastText()
+    assert extend_store(ft, ["bagus", "mantap", "jiwa", "mantap"], path) == ["mantap", "jiwa"]
+    assert ft.calls == ["mantap", "jiwa"]  # vektor lama disalin, tidak dihitung ulang
+    assert extend_store(ft, ["bagus"], path) == []
+
+    after = EmbeddingStore(path)
+    assert after.words == before.words + ["mantap", "jiwa"]
+    np.testing.assert_array_equal(after.vectors[:len(old)], old)
+    with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    assert meta["size"] == len(after) and meta["source_mtime"] == 2.0
+    assert open_store(path) is not stale and "jiwa" in open_store(path)
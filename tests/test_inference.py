@@ -0,0 +1,51 @@
+"""Tokenizer inferensi & pelatihan setara `Tokenizer(oov_token="<OOV>")` Keras di notebook."""
+import numpy as np
+
+from sentinex.inference import KerasStyleTokenizer
+from sentinex.training import FittedTokenizer, pad_post
+
+
+def test_tokenizer_matches_keras():
+    from tensorflow.keras.preprocessing.sequence import pad_sequences
+    from tensorflow.keras.preprocessing.text import Tokenizer
+
+    texts = ["Barang BAGUS, sekali!!", "pengiriman\tcepat; barang bagus", "ongkir (mahal) -- kecewa",
+             "", "bagus bagus bagus", "é-commerce ok?", "a\nb  c"]
+    ref = Tokenizer(oov_token="<OOV>")
+    ref.fit_on_texts(texts)
+    tok = FittedTokenizer(texts)
+    assert tok.word_index == ref.word_index
+
+    unseen = texts + ["kata baru sekali", "BAGUS!!"]
+    assert KerasStyleTokenizer(ref.word_index).texts_to_sequences(unseen) == ref.texts_to_sequences(unseen)
+    seqs = ref.texts_to_sequences(unseen)
+    np.testing.assert_array_equal(pad_post(seqs, 3),
+                                  pad_sequences(seqs, maxlen=3, padding="post", truncating="post"))
+
+
+def test_tokenizer_extend_keeps_old_indices():
+    tok = FittedTokenizer(["bagus sekali", "bagus"])
+    before = dict(tok.word_index)
+    assert tok.extend(["mantap bagus", "mantap jiwa"]) == ["mantap", "jiwa"]
+    assert {w: tok.word_index[w] for w in before} == before
+    assert tok.word_index["mantap"] == len(before) + 1
+
+
+def test_bundle_round_trip_matches_notebook_model(tmp_path):
+    """Bundle tersimpan memberi probabilitas sama dengan model notebook (padding post, max_len)."""
+    from sentinex.inference import ModelBundle, save_app_bundle
+    from sentinex.training import make_bigru_model
+
+    texts = ["barang bagus sekali", "pengiriman lama banget", "penjual ramah", "barang rusak parah"]
+    tok = FittedTokenizer(texts)
+    rng = np.random.default_rng(0)
+    emb = rng.normal(size=(len(tok.word_index) + 1, 8)).astype("float32")
+    model = make_bigru_model(len(tok.word_index) + 1, 8, emb, 6, 3)
+    save_app_bundle(str(tmp_path), "Tokopedia", tok, model, max_len=6,
+                    classes=["Negatif", "Netral", "Positif"], emb_dim=8)
+
+    queries = texts + ["kata asing semua", "bagus " * 10, ""]
+    ref = model.predict(pad_post(tok.texts_to_sequences(queries), 6), verbose=0)
+    app = ModelBundle(str(tmp_path)).get("Tokopedia")
+    np.testing.assert_allclose(app.predict_proba(queries, batch_size=2), ref, atol=1e-5)
+    assert app.predict(queries) == [["Negatif", "Netral", "Positif"][i] for i in ref.argmax(axis=1)]
@@ -0,0 +1,88 @@
+"""Filter bahasa Inggris: keputusan cepat, fallback langdetect, cache, dan mode strict."""
+import pandas as pd
+import pytest
+
+from sentinex import langfilter
+from sentinex.langfilter import LanguageFilter, english_mask, filter_csv, quick_decide
+
+langdetect = pytest.importorskip("langdetect")
+
+ID = ["barang sampai cepat", "pengiriman lama banget, kecewa", "mantap, sesuai pesanan gan"]
+EN = ["easy to use, good app", "very good app and fast delivery thank you", "this is the worst app"]
+AMBIGUOUS = ["the barang is bagus", "nice", "shopee top markotop"]
+
+
+def cell5_is_english(text: str) -> bool:
+    """Acuan CELL 5: langdetect seed 0, teks pendek / gagal deteksi → bukan Inggris."""
+    langdetect.DetectorFactory.seed = 0
+    t = str(text).strip()
+    try:
+        return len(t) >= 3 and langdetect.detect(t) == "en"
+    except Exception:
+        return False
+
+
+@pytest.fixture
+def detector_calls(monkeypatch):
+    """Catat teks yang diteruskan ke langdetect."""
+    calls = []
+    real = langfilter._detect_many
+
+    def spy(texts, workers):
+        calls.extend(texts)
+        return real(texts, workers)
+
+    monkeypatch.setattr(langfilter, "_detect_many", spy)
+    return calls
+
+
+def test_quick_decide_clear_cases():
+    assert [quick_decide(t) for t in ID] == [False] * len(ID)
+    assert [quick_decide(t) for t in EN] == [True] * len(EN)
+    assert quick_decide("ok") is False and quick_decide("12345 !!") is False  # pendek / tanpa huruf
+    assert quick_decide("the barang is bagus") is None
+
+
+def test_ambiguous_texts_use_seeded_langdetect(detector_calls):
+    texts = ID + EN + AMBIGUOUS
+    flags = LanguageFilter().is_english_many(texts)
+    assert flags == [False] * 3 + [True] * 3 + [cell5_is_english(t) for t in AMBIGUOUS]
+    assert sorted(detector_calls) == sorted(t for t in AMBIGUOUS if quick_decide(t) is None)
+    assert LanguageFilter().is_english_many(AMBIGUOUS) == flags[6:]  # seed tetap → hasil sama
+
+
+def test_cache_hits_and_duplicates(detector_calls):
+    lf = LanguageFilter()
+    texts = ["the barang is bagus"] * 3 + ID
+    first = lf.is_english_many(texts)
+    assert detector_calls == ["the barang is bagus"]  # duplikat hanya dideteksi sekali
+    assert lf.stats() == {"texts": 6, "cached": 0, "quick": 3, "detector": 1, "size": 4}
+
+    assert lf.is_english_many(texts) == first
+    assert len(detector_calls) == 1
+    assert lf.stats()["cached"] == 4 and lf.stats()["size"] == 4
+
+    small = LanguageFilter(maxsize=2)
+    small.is_english_many(ID)
+    assert small.stats()["size"] == 2
+
+
+def test_strict_matches_cell5(detector_calls):
+    texts = ID + EN + AMBIGUOUS + ["ok", ""]
+    lf = LanguageFilter(strict=True)
+    assert lf.is_english_many(texts) == [cell5_is_english(t) for t in texts]
+    assert lf.stats()["quick"] == 0 and len(detector_calls) == len(texts)
+
+
+def test_english_mask_and_filter_csv(tmp_path, monkeypatch):
+    monkeypatch.setattr(langfilter, "_FILTERS", {})
+    s = pd.Series(ID + EN, index=range(10, 16))
+    mask = english_mask(s)
+    assert mask.index.tolist() == s.index.tolist() and mask.tolist() == [False] * 3 + [True] * 3
+
+    src = tmp_path / "ulasan.csv"
+    pd.DataFrame({"content": ID + EN, "score": range(6)}).to_csv(src, index=False)
+    info = filter_csv(str(src), str(tmp_path), "Shopee", "content")
+    assert (info["n_total"], info["n_removed_en"], info["n_used_id"]) == (6, 3, 3)
+    assert pd.read_csv(info["idonly_path"])["content"].tolist() == ID
+    assert pd.read_csv(info["removed_en_path"])["score"].tolist() == [3, 4, 5]
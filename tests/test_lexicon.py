@@ -0,0 +1,63 @@
+"""Lexicon: kata utuh, frasa terpanjang, kata kasar, dan score_many == score."""
+from sentinex.lexicon import Lexicon, Score
+from sentinex.sentiment import deteksi_sentimen, deteksi_sentimen_batch
+
+
+def make():
+    return Lexicon({"ok": 1.0, "lag": -1.0, "sesuai": 2.0, "tidak sesuai": -3.0,
+                    "tidak sesuai pesanan": -5.0, "bagus": 1.5}, profanity=["tolol"])
+
+
+def test_whole_words_not_substrings():
+    lex = make()
+    assert lex.score("tokopedia lagi promo") == Score(0.0, 0.0, False)
+    assert lex.score("OK bagus, lag") == Score(1.0, 1.0, False)  # "bagus," bukan token "bagus"
+    assert lex.score("ok ok bagus") == Score(2.5, 0.0, False)  # tiap entri sekali per teks
+    assert deteksi_sentimen("aplikasi tokopedia lagi ramai") == "Netral"
+
+
+def test_longest_phrase_takes_precedence():
+    lex = make()
+    assert lex.score("barang tidak sesuai") == Score(0.0, 3.0, False)
+    assert lex.score("tidak sesuai pesanan") == Score(0.0, 5.0, False)
+    assert lex.score("tidak sesuai pesan") == Score(0.0, 3.0, False)
+    assert lex.score("tidak sesuai tapi sesuai") == Score(2.0, 3.0, False)
+    assert lex.score("tidak") == Score(0.0, 0.0, False)
+    assert lex.label("warna tidak sesuai") == "Negatif"
+    assert lex.label("warna sesuai") == "Positif"
+
+
+def test_profanity_forces_negative():
+    lex = make()
+    s = lex.score("bagus sesuai tapi admin tolol")
+    assert s.profane and s.positive == 3.5
+    assert lex.label("bagus sesuai tapi admin tolol") == "Negatif"
+    lex.add_profanity(["  Bego "])
+    assert lex.label("bego") == "Negatif" and lex.label("begokah") == "Netral"
+
+
+def test_update_weights_and_from_lists():
+    lex = make()
+    v = lex.version
+    lex.add({"OK": -1.0, "mantap": 1.0})
+    assert lex.version > v
+    assert len(lex) == 7 and lex.score("ok mantap") == Score(1.0, 1.0, False)
+    lex2 = Lexicon.from_lists(["bagus"], ["tidak sesuai"], ["tolol"])
+    lex.update(lex2)
+    assert lex.score("bagus") == Score(1.0, 0.0, False) and "tolol" in lex.profanity
+
+
+def test_from_file_skips_header(tmp_path):
+    path = tmp_path / "positive.tsv"
+    path.write_text("word\tweight\nbagus\t3\ntidak buruk\t2\nrusak\n", encoding="utf-8")
+    lex = Lexicon.from_file(str(path))
+    assert lex.terms == ["bagus", "tidak buruk"]
+    assert lex.score("tidak buruk kok bagus") == Score(5.0, 0.0, False)
+
+
+def test_score_many_matches_score():
+    lex = make()
+    texts = ["ok", "tidak sesuai pesanan tolol", "", "  lag  ok ", "sesuai tidak"]
+    assert lex.score_many(texts) == [lex.score(t) for t in texts]
+    assert lex.label_many(texts) == [lex.label(t) for t in texts]
+    assert deteksi_sentimen_batch(texts) == [deteksi_sentimen(t) for t in texts]
@@ -0,0 +1,98 @@
+"""Metrik tahap: nesting, drain/merge antar proses, dan format teks Prometheus."""
+import json
+import logging
+import re
+import time
+
+import pytest
+
+from sentinex import metrics
+from sentinex.metrics import Metrics
+
+# nama{label="nilai",...} angka  — baris sampel format teks Prometheus 0.0.4
+SAMPLE_RE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{[a-zA-Z_]\w*="[^"]*"(,[a-zA-Z_]\w*="[^"]*")*\})? '
+                       r'-?[0-9.e+-]+$')
+
+
+def test_nested_stages_recorded_separately():
+    m = Metrics()
+    with m.stage("luar", rows=10):
+        with m.stage("dalam") as rec:
+            time.sleep(0.01)
+            rec.rows = 4
+        with m.stage("dalam", rows=6):
+            pass
+    snap = m.snapshot()
+    assert list(snap) == ["dalam", "luar"]  # urutan pertama kali selesai
+    assert (snap["dalam"]["calls"], snap["dalam"]["rows"]) == (2, 10)
+    assert snap["luar"]["seconds"] >= snap["dalam"]["seconds"] >= 0.01
+    assert snap["dalam"]["max_seconds"] <= snap["dalam"]["seconds"]
+    assert snap["luar"]["rows_per_s"] == pytest.approx(10 / snap["luar"]["seconds"])
+
+
+def test_stage_recorded_on_error():
+    m = Metrics()
+    with pytest.raises(RuntimeError):
+        with m.stage("gagal", rows=3):
+            raise RuntimeError("x")
+    assert m.snapshot()["gagal"]["calls"] == 1
+
+
+def test_drain_and_merge():
+    worker, parent = Metrics(), Metrics()
+    worker.record("stemming", 2.0, rows=100, rss_delta=10)
+    worker.record("stemming", 1.0, rows=50)
+    parent.record("stemming", 3.0, rows=1)
+    parent.record("cleaning", 0.5)
+
+    drained = worker.drain()
+    assert worker.snapshot() == {}
+    parent.merge(drained)
+    parent.merge({"baru": {"calls": 1, "rows": 0, "seconds": 0.0, "max_seconds": 0.0, "rss_delta": 0}})
+    snap = parent.snapshot()
+    assert {k: snap["stemming"][k] for k in ("calls", "rows", "seconds", "max_seconds", "rss_delta")} == {
+        "calls": 3, "rows": 151, "seconds": 6.0, "max_seconds": 3.0, "rss_delta": 10}
+    assert snap["baru"]["rows_per_s"] is None and list(snap) == ["stemming", "cleaning", "baru"]
+    parent.reset()
+    assert parent.snapshot() == {}
+
+
+def test_record_logs_json(caplog):
+    with caplog.at_level(logging.INFO, logger="sentinex.metrics"):
+        Metrics().record("cleaning", 0.25, rows=7)
+    assert json.loads(caplog.records[-1].getMessage()) == {
+        "stage": "cleaning", "seconds": 0.25, "rows": 7, "rss_delta": 0}
+
+
+def test_prometheus_text_format():
+    m = Metrics()
+    m.record("cleaning", 1.5, rows=1000)
+    m.record("stemming", 0.25, rows=10, rss_delta=-4096)
+    text = m.to_prometheus(prefix="uji")
+    assert text.endswith("\n")
+
+    declared = {}
+    for line in text.splitlines():
+        if line.startswith("# HELP "):
+            continue
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split()
+            assert kind in ("counter", "gauge") and name not in declared
+            declared[name] = kind
+            continue
+        assert SAMPLE_RE.match(line), line
+        assert line.split("{")[0].split()[0] in declared  # sampel setelah TYPE-nya
+    assert declared["uji_stage_calls_total"] == "counter"
+    assert declared["uji_stage_max_seconds"] == "gauge"
+    assert 'uji_stage_rows_total{stage="cleaning"} 1000' in text
+    assert 'uji_stage_seconds_total{stage="stemming"} 0.25' in text
+    assert 'uji_stage_rss_delta_bytes_total{stage="stemming"} -4096' in text
+    assert 'uji_cache_entries{cache="stem"}' in text
+    assert re.search(r"^uji_process_rss_bytes \d", text, re.M)
+
+
+def test_shared_stage_helper():
+    before = metrics.get_metrics().snapshot().get("uji_bersama", {}).get("calls", 0)
+    with metrics.stage("uji_bersama", rows=2):
+        pass
+    assert metrics.get_metrics().snapshot()["uji_bersama"]["calls"] == before + 1
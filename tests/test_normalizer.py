@@ -0,0 +1,60 @@
+"""Normalizer: lookup per token utuh, frasa greedy terpanjang, dan pemuatan kamus CSV."""
+import pytest
+
+from sentinex.normalizer import Normalizer
+from sentinex.preprocessing import normalizer as default_normalizer
+
+SLANG = {"ga": "tidak", "bgt": "banget", "gak papa": "tidak apa apa", "gak papa sih": "tidak masalah",
+         "gak": "tidak"}
+
+
+def test_whole_tokens_only():
+    norm = Normalizer(SLANG)
+    assert norm("harga ga mahal bgt") == "harga tidak mahal banget"
+    assert norm("gaji bagus, ga") == "gaji bagus, tidak"  # "ga" di dalam kata tidak diganti
+    assert norm("bgtu saja") == "bgtu saja"
+    assert norm("  ga  ") == "  tidak  "  # spasi awal/akhir & ganda dipertahankan
+    assert default_normalizer("harganya ga murah") == "harganya tidak murah"
+
+
+def test_phrases_greedy_longest():
+    norm = Normalizer(SLANG)
+    assert norm.max_phrase == 3
+    assert norm("gak papa sih kak") == "tidak masalah kak"
+    assert norm("gak papa kok") == "tidak apa apa kok"
+    assert norm("gak bisa") == "tidak bisa"
+    assert norm("papa gak") == "papa tidak"
+
+
+def test_update_and_to_dict():
+    norm = Normalizer({"Ga ": "tidak"})
+    v = norm.version
+    norm.update({"tp": "tapi", "ga": "enggak", "  ": "x"})
+    assert norm.version == v + 1
+    assert norm.to_dict() == {"ga": "enggak", "tp": "tapi"}
+    assert len(norm) == 2
+
+
+def test_from_csv_named_columns(tmp_path):
+    path = tmp_path / "kamus.csv"
+    path.write_text("id,Slang,Formal\n1,ga,tidak\n2,gak papa,tidak apa apa\n3,ga,enggak\n4,,kosong\n",
+                    encoding="utf-8")
+    norm = Normalizer.from_csv(str(path))
+    assert norm.to_dict() == {"ga": "tidak", "gak papa": "tidak apa apa"}  # entri pertama menang
+    assert Normalizer.from_file(str(path)).to_dict() == norm.to_dict()
+
+
+def test_from_csv_header_is_never_an_entry(tmp_path):
+    path = tmp_path / "kamus.csv"
+    path.write_text("kata,arti\nga,tidak\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="header=False"):
+        Normalizer.from_csv(str(path))
+    assert Normalizer.from_csv(str(path), slang_col="kata", baku_col="arti").to_dict() == {"ga": "tidak"}
+
+    raw = tmp_path / "tanpa_header.csv"
+    raw.write_text("ga,tidak\nbgt,banget\n", encoding="utf-8")
+    assert Normalizer.from_csv(str(raw), header=False).to_dict() == {"ga": "tidak", "bgt": "banget"}
+
+    empty = tmp_path / "kosong.csv"
+    empty.write_text("", encoding="utf-8")
+    assert len(Normalizer.from_csv(str(empty))) == 0
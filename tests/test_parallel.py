@@ -0,0 +1,61 @@
+"""Process pool paralel harus jalan walau `sentinex.parallel` adalah impor sentinex pertama."""
+import subprocess
+import sys
+import textwrap
+
+from conftest import ROOT
+
+SCRIPT = textwrap.dedent("""
+    import sys
+    sys.path.insert(0, {root!r})
+
+    if __name__ == "__main__":
+        from sentinex.parallel import preprocess_parallel, shutdown_pools
+        from sentinex.preprocessing import preprocess_batch
+
+        texts = [f"aplikasi ini bagus banget {{i}} tapi pengiriman lambat" for i in range(3000)]
+        hasil = preprocess_parallel(texts, workers=2, chunksize=500)
+        assert len(hasil) == 3000
+        assert hasil["stem"].tolist() == preprocess_batch(texts)["stem"].tolist()
+        shutdown_pools()
+        print("OK")
+""")
+
+
+def test_pool_in_fresh_interpreter(tmp_path):
+    script = tmp_path / "run_pool.py"
+    script.write_text(SCRIPT.format(root=ROOT), encoding="utf-8")
+    proc = subprocess.run([sys.executable, str(script)], capture_output=True, text=True,
+                          timeout=600, cwd=tmp_path)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert proc.stdout.strip().endswith("OK")
+
+
+SAVE_SCRIPT = textwrap.dedent("""
+    import sys
+    sys.path.insert(0, {root!r})
+
+    if __name__ == "__main__":
+        from sentinex.parallel import preprocess_parallel, shutdown_pools
+
+        texts = [f"pengiriman kebutuhan {{i}} memuaskan" for i in range(3000)]
+        preprocess_parallel(texts, workers=2, chunksize=500)
+        shutdown_pools()
+""")
+
+
+def test_worker_stems_saved_by_parent(tmp_path):
+    """Kata yang hanya di-stem di worker tetap masuk file cache stem proses induk."""
+    import json
+    import os
+
+    script = tmp_path / "run_save.py"
+    script.write_text(SAVE_SCRIPT.format(root=ROOT), encoding="utf-8")
+    cache_file = tmp_path / "stem_cache.json"
+    env = {**os.environ, "SENTINEX_STEM_CACHE": str(cache_file)}
+    proc = subprocess.run([sys.executable, str(script)], capture_output=True, text=True,
+                          timeout=600, cwd=tmp_path, env=env)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    entries = dict(json.loads(cache_file.read_text(encoding="utf-8"))["entries"])
+    assert entries["pengiriman"] == "kirim"
+    assert entries["kebutuhan"] == "butuh"
@@ -0,0 +1,203 @@
+"""Scraper per halaman terhadap StubPlayClient (tanpa jaringan)."""
+import json
+import os
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+from sentinex import config
+from sentinex.scraper import (
+    GooglePlayClient,
+    HostRateLimiter,
+    ScraperCompatError,
+    StubPlayClient,
+    scrape_many,
+    scrape_reviews,
+)
+
+PKG = "com.contoh.app"
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+def fast_limiter():
+    return HostRateLimiter(rate=1000, burst=1000)
+
+
+def stub(n=450, **kwargs):
+    return StubPlayClient({PKG: StubPlayClient.make_reviews(PKG, n)}, **kwargs)
+
+
+def state_file(cache_dir):
+    (path,) = [p for p in (cache_dir / "scrape").iterdir() if p.name.endswith(".state.json")]
+    return path
+
+
+# ------------------------------------------------------------
+# Pagination
+# ------------------------------------------------------------
+def test_pagination_page_sizes_and_order():
+    client = stub(450)
+    df = scrape_reviews(PKG, count=450, page_size=200, client=client, limiter=fast_limiter())
+    assert [c[1] for c in client.calls] == [200, 200, 50]
+    assert [c[2] for c in client.calls] == [None, "200", "400"]
+    assert len(df) == 450 and df["review_id"].is_unique
+    assert df["date"].is_monotonic_decreasing
+
+
+def test_pagination_stops_when_source_exhausted():
+    client = stub(120)
+    df = scrape_reviews(PKG, count=500, page_size=200, client=client, limiter=fast_limiter())
+    assert len(df) == 120
+    assert len(client.calls) == 1
+
+
+# ------------------------------------------------------------
+# Resume dari checkpoint
+# ------------------------------------------------------------
+def test_resume_after_failure_continues_from_token():
+    with pytest.raises(ConnectionError):
+        scrape_reviews(PKG, count=450, page_size=200, client=stub(fail_after=1), limiter=fast_limiter())
+
+    client = stub()
+    df = scrape_reviews(PKG, count=450, page_size=200, client=client, limiter=fast_limiter())
+    assert [c[2] for c in client.calls] == ["200", "400"]
+    assert len(df) == 450 and df["review_id"].is_unique
+
+
+def test_smaller_count_reuses_checkpoint():
+    scrape_reviews(PKG, count=400, page_size=200, client=stub(), limiter=fast_limiter())
+    client = stub()
+    df = scrape_reviews(PKG, count=300, page_size=200, client=client, limiter=fast_limiter())
+    assert client.calls == []
+    assert len(df) == 300
+
+
+def test_resume_false_starts_over():
+    scrape_reviews(PKG, count=400, page_size=200, client=stub(), limiter=fast_limiter())
+    client = stub()
+    scrape_reviews(PKG, count=200, page_size=200, client=client, limiter=fast_limiter(), resume=False)
+    assert [c[2] for c in client.calls] == [None]
+
+
+# ------------------------------------------------------------
+# Kedaluwarsa checkpoint (max_age)
+# ------------------------------------------------------------
+def test_max_age_expires_checkpoint(cache_dir):
+    scrape_reviews(PKG, count=400, page_size=200, client=stub(), limiter=fast_limiter())
+    path = state_file(cache_dir)
+    state = json.loads(path.read_text())
+    state["started"] = time.time() - 100
+    path.write_text(json.dumps(state))
+
+    client = stub()
+    scrape_reviews(PKG, count=400, page_size=200, client=client, limiter=fast_limiter(), max_age=1000)
+    assert client.calls == []  # masih segar
+
+    scrape_reviews(PKG, count=400, page_size=200, client=client, limiter=fast_limiter(), max_age=50)
+    assert [c[2] for c in client.calls] == [None, "200"]  # basi → dari awal
+    assert json.loads(path.read_text())["started"] > time.time() - 50
+
+
+# ------------------------------------------------------------
+# Rate limit per host
+# ------------------------------------------------------------
+def test_rate_limiter_shared_across_packages():
+    rate = 20.0
+    pkgs = {f"app{i}": f"com.contoh.app{i}" for i in range(3)}
+    client = StubPlayClient({p: StubPlayClient.make_reviews(p, 300) for p in pkgs.values()})
+    limiter = HostRateLimiter(rate=rate, burst=1)
+    t0 = time.monotonic()
+    hasil = scrape_many(pkgs, max_workers=3, count=300, page_size=100, client=client, limiter=limiter)
+    elapsed = time.monotonic() - t0
+
+    assert {k: len(v) for k, v in hasil.items()} == {k: 300 for k in pkgs}
+    times = sorted(c[3] for c in client.calls)
+    assert len(times) == 9
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    assert min(gaps) >= 1 / rate * 0.8
+    assert elapsed >= (len(times) - 1) / rate * 0.8
+
+
+def test_rate_limiter_is_per_host():
+    limiter = HostRateLimiter(rate=5, burst=1)
+    limiter.acquire("a.example")
+    t0 = time.monotonic()
+    limiter.acquire("b.example")  # host lain: tidak menunggu
+    assert time.monotonic() - t0 < 0.1
+    limiter.acquire("a.example")  # host sama: menunggu ± 1/rate
+    assert time.monotonic() - t0 >= 0.15
+
+
+def test_rate_limiter_thread_safe_burst():
+    limiter = HostRateLimiter(rate=1000, burst=3)
+    done = []
+    threads = [threading.Thread(target=lambda: done.append(limiter.acquire("h"))) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert len(done) == 10
+
+
+# ------------------------------------------------------------
+# Adapter google_play_scraper (API privat terisolasi)
+# ------------------------------------------------------------
+@pytest.fixture
+def fake_gplay(monkeypatch):
+    """Modul google_play_scraper palsu: continuation = objek dengan `.token`."""
+    calls = []
+
+    class Cont:
+        def __init__(self, token, lang, country, sort, count, filter_score, filter_device):
+            self.token = token
+
+    def reviews(package_id, lang, country, sort, count, filter_score_with, continuation_token):
+        calls.append(continuation_token)
+        start = int(continuation_token.token) if continuation_token else 0
+        page = StubPlayClient.make_reviews(package_id, 5)[start:start + count]
+        return page, Cont(str(start + count), lang, country, sort, count, None, None)
+
+    root = types.ModuleType("google_play_scraper")
+    root.Sort = types.SimpleNamespace(NEWEST="newest", MOST_RELEVANT="relevant")
+    root.reviews = reviews
+    features = types.ModuleType("google_play_scraper.features")
+    mod = types.ModuleType("google_play_scraper.features.reviews")
+    mod._ContinuationToken = Cont
+    for name, m in [("google_play_scraper", root), ("google_play_scraper.features", features),
+                    ("google_play_scraper.features.reviews", mod)]:
+        monkeypatch.setitem(sys.modules, name, m)
+    return types.SimpleNamespace(calls=calls, module=mod, root=root)
+
+
+def test_adapter_round_trips_token(fake_gplay):
+    client = GooglePlayClient()
+    page, token = client.fetch_page(PKG, "id", "id", "NEWEST", 2, None, None)
+    assert len(page) == 2 and token == "2"
+    page, token = client.fetch_page(PKG, "id", "id", "NEWEST", 2, None, token)
+    assert fake_gplay.calls[-1].token == "2"
+    assert page[0]["reviewId"] == f"{PKG}-2"
+
+
+def test_adapter_fails_loudly_when_private_api_changes(fake_gplay, monkeypatch):
+    monkeypatch.delattr(fake_gplay.module, "_ContinuationToken")
+    with pytest.raises(ScraperCompatError):
+        GooglePlayClient().fetch_page(PKG, "id", "id", "NEWEST", 2, None, "2")
+
+
+def test_adapter_rejects_continuation_without_token(fake_gplay, monkeypatch):
+    monkeypatch.setattr(fake_gplay.root, "reviews", lambda *a, **k: ([], object()))
+    with pytest.raises(ScraperCompatError):
+        GooglePlayClient().fetch_page(PKG, "id", "id", "NEWEST", 2, None, None)
+
+
+def test_checkpoint_files_live_in_cache_dir(cache_dir):
+    scrape_reviews(PKG, count=10, page_size=200, client=stub(10), limiter=fast_limiter())
+    assert os.path.isdir(cache_dir / "scrape")
@@ -0,0 +1,70 @@
+"""StemmerService: batas LRU, simpan/muat cache, dan pertukaran kata baru worker ↔ induk."""
+import json
+import os
+
+from sentinex import stemming
+from sentinex.stemming import CACHE_FORMAT_VERSION, StemmerService, get_stemmer
+
+
+def test_lru_evicts_least_recently_used():
+    svc = StemmerService(maxsize=2)
+    svc.stem_word("makanan")
+    svc.stem_word("pengiriman")
+    svc.stem_word("makanan")  # makanan jadi yang terbaru
+    svc.stem_word("kebutuhan")  # pengiriman tergusur
+    assert list(svc._cache) == ["makanan", "kebutuhan"]
+    assert svc.stats() == {"hits": 1, "misses": 3, "size": 2, "maxsize": 2, "hit_rate": 0.25}
+
+    svc.merge([("a", "a"), ("b", "b"), ("c", "c")])
+    assert list(svc._cache) == ["b", "c"]
+
+
+def test_save_load_round_trip(tmp_path):
+    path = str(tmp_path / "sub" / "stem.json")
+    svc = StemmerService(path=path)
+    assert svc.stem_tokens(["pengiriman", "makanan", "kebutuhan"]) == "kirim makan butuh"
+    assert svc.save() == path and not os.path.exists(path + ".tmp")
+
+    loaded = StemmerService(path=path)
+    assert loaded.load() == 3
+    assert list(loaded._cache.items()) == list(svc._cache.items())  # urutan LRU terjaga
+    assert loaded.stem_word("makanan") == "makan" and loaded.stats()["misses"] == 0
+    assert loaded._stemmer is None  # semua hit: Sastrawi tidak perlu dibangun
+
+    # batas lebih kecil saat memuat → yang tersisa entri terbaru
+    small = StemmerService(maxsize=1)
+    assert small.load(path) == 1 and list(small._cache) == ["kebutuhan"]
+
+
+def test_load_ignores_missing_corrupt_or_old_files(tmp_path):
+    svc = StemmerService()
+    assert svc.load(str(tmp_path / "tidak_ada.json")) == 0
+    bad = tmp_path / "rusak.json"
+    bad.write_text("{bukan json", encoding="utf-8")
+    assert svc.load(str(bad)) == 0
+    old = tmp_path / "lama.json"
+    old.write_text(json.dumps({"version": CACHE_FORMAT_VERSION + 1, "entries": [["a", "b"]]}),
+                   encoding="utf-8")
+    assert svc.load(str(old)) == 0 and svc.stats()["size"] == 0
+    assert StemmerService().save() is None  # tanpa path: tidak menulis apa pun
+
+
+def test_drain_new_and_merge():
+    worker = StemmerService()
+    worker.stem_word("makanan")  # sebelum track_new: tidak dicatat
+    worker.track_new = True
+    worker.stem_word("pengiriman")
+    worker.stem_word("makanan")  # hit cache: bukan kata baru
+    assert worker.drain_new() == [("pengiriman", "kirim")]
+    assert worker.drain_new() == []
+
+    parent = StemmerService()
+    assert parent.merge([("pengiriman", "kirim")]) == 1
+    assert parent.merge([("pengiriman", "kirim")]) == 0
+    assert parent.stem_word("pengiriman") == "kirim" and parent.hits == 1
+
+
+def test_shared_service_uses_isolated_cache_dir(isolated_cache):
+    svc = get_stemmer()
+    assert svc is get_stemmer() is stemming._SERVICE
+    assert svc.path == os.path.join(isolated_cache, "stem_cache.json")
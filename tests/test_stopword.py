@@ -0,0 +1,46 @@
+"""stopword / stopword_tokens harus identik dengan StopWordRemover.remove Sastrawi."""
+import pytest
+
+from conftest import ROOT
+from sentinex.bench import CORPORA, load_corpus
+from sentinex.preprocessing import (
+    cleaning, normalisasi, stop_words_remover_new, stopword, stopword_tokens, stopword_tokens_batch,
+)
+
+EDGE_CASES = [
+    "",
+    " ",
+    "   ",
+    "dan",
+    "dan yang di",                       # seluruhnya stopword
+    "yang dan barang bagus",             # stopword berurutan di awal
+    "barang bagus dan yang",             # stopword berurutan di akhir
+    "barang yang dan di dari toko",      # stopword berurutan di tengah
+    "dan barang dan toko dan",           # kemunculan berulang (list.remove → yang pertama)
+    "barang  yang  bagus ",              # spasi ganda & spasi akhir → token kosong
+    " yang barang",
+    "barang\tyang\nbagus dan\r\nmurah",  # whitespace selain spasi
+    "Yang DAN barang",                   # huruf besar bukan stopword
+]
+
+
+def sastrawi(text: str) -> str:
+    return stop_words_remover_new.remove(text)
+
+
+@pytest.mark.parametrize("text", EDGE_CASES)
+def test_edge_cases_match_sastrawi(text):
+    assert stopword(text) == sastrawi(text)
+    assert stopword_tokens(text) == sastrawi(text).split()
+
+
+@pytest.mark.parametrize("name", sorted(CORPORA))
+def test_bundled_corpus_matches_sastrawi(name):
+    texts = load_corpus(CORPORA[name], root=ROOT)
+    if not texts:
+        pytest.skip(f"korpus {name} tidak ada")
+    # teks mentah dan teks seperti di pipeline (setelah cleaning + normalisasi)
+    samples = texts + [normalisasi(cleaning(t)) for t in texts]
+    for t in samples:
+        assert stopword_tokens(t) == sastrawi(t).split(), t
+    assert stopword_tokens_batch(samples) == [sastrawi(t).split() for t in samples]
@@ -0,0 +1,69 @@
+"""Sinkronisasi inkremental: celah yang terpotong max_new dilanjutkan (kursor backfill)."""
+import pytest
+
+from sentinex import config
+from sentinex.scraper import HostRateLimiter, StubPlayClient
+from sentinex.store import ReviewStore, sync_package
+
+PKG = "com.contoh.app"
+ALL = StubPlayClient.make_reviews(PKG, 100)  # terbaru dulu
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "CACHE_DIR", str(tmp_path / "cache"))
+    s = ReviewStore(str(tmp_path / "reviews.sqlite"))
+    yield s
+    s.close()
+
+
+def sync(store, client, max_new):
+    return sync_package(store, PKG, max_new=max_new, page_size=10, client=client,
+                        limiter=HostRateLimiter(rate=1000, burst=1000))
+
+
+def stored_ids(store):
+    return set(store.load(PKG)["review_id"])
+
+
+def test_capped_sync_resumes_gap(store):
+    sync(store, StubPlayClient({PKG: ALL[60:]}), max_new=1000)  # data lama: 40 ulasan
+    assert len(stored_ids(store)) == 40
+
+    client = StubPlayClient({PKG: ALL})  # 60 ulasan baru di atasnya
+    info = sync(store, client, max_new=25)
+    assert (info["new"], info["backfill_pending"]) == (25, 1)
+
+    info = sync(store, client, max_new=25)
+    assert info["new"] == 25 and info["backfill_pending"] == 1
+
+    info = sync(store, client, max_new=25)
+    assert (info["new"], info["backfill_pending"]) == (10, 0)
+    assert stored_ids(store) == {r["reviewId"] for r in ALL}
+
+    info = sync(store, client, max_new=25)
+    assert (info["new"], info["fetched"]) == (0, 10)
+
+
+def test_cursor_survives_reopen(store, tmp_path):
+    sync(store, StubPlayClient({PKG: ALL}), max_new=30)
+    store.close()
+    reopened = ReviewStore(str(tmp_path / "reviews.sqlite"))
+    try:
+        ((_, token, floor),) = reopened.cursors(PKG)
+        assert (token, floor) == ("30", None)
+        info = sync(reopened, StubPlayClient({PKG: ALL}), max_new=1000)
+        assert (info["new"], info["backfill_pending"]) == (70, 0)
+    finally:
+        reopened.close()
+
+
+def test_load_filters_rating_after_full_sync(store):
+    sync(store, StubPlayClient({PKG: ALL}), max_new=1000)
+    assert len(stored_ids(store)) == 100  # sinkronisasi tetap menyimpan semua skor
+
+    df = store.load(PKG, limit=5, rating=2)
+    assert len(df) == 5 and set(df["rating"]) == {2}
+    assert df["date"].is_monotonic_decreasing
+    assert df["review_id"].tolist() == [r["reviewId"] for r in ALL if r["score"] == 2][:5]
+    assert len(store.load(rating=5)) == 20
@@ -0,0 +1,63 @@
+"""Mode streaming: keluaran selalu berupa file yang bisa dibaca, termasuk saat 0 baris."""
+import io
+
+import pytest
+
+from sentinex.columnar import read_frame
+from sentinex.preprocessing import preprocess_batch
+from sentinex.streaming import process_csv_stream
+
+FORMATS = [".csv", ".parquet", ".arrow"]
+ENGLISH = ("content,label\n"
+           "this is a great app and I love it,positif\n"
+           "very good application thank you so much,positif\n")
+
+
+@pytest.mark.parametrize("ext", FORMATS)
+@pytest.mark.parametrize("data, drop_english", [
+    (b"", False),
+    (b"content,label\n", False),
+    (ENGLISH.encode(), True),
+])
+def test_zero_rows_still_writes_readable_file(tmp_path, ext, data, drop_english):
+    out = str(tmp_path / f"hasil{ext}")
+    info = process_csv_stream(io.BytesIO(data), "content", out, drop_english=drop_english)
+    assert info["rows"] == 0
+    df = read_frame(out)
+    assert len(df) == 0
+    assert {"content", "stem", "sentimen"} <= set(df.columns)
+
+
+@pytest.mark.parametrize("ext", FORMATS)
+def test_chunks_match_batch(tmp_path, ext):
+    texts = [f"barangnya bagus {i} tapi pengiriman lama banget" for i in range(25)]
+    csv = "content\n" + "\n".join(texts) + "\n"
+    out = str(tmp_path / f"hasil{ext}")
+    info = process_csv_stream(io.BytesIO(csv.encode()), "content", out, chunksize=7)
+    assert (info["rows"], info["chunks"]) == (25, 4)
+    df = read_frame(out)
+    expected = preprocess_batch(texts)
+    assert df["stem"].tolist() == expected["stem"].tolist()
+    assert df["sentimen"].astype(str).tolist() == expected["sentimen"].tolist()
+
+
+@pytest.mark.parametrize("ext", [".parquet", ".arrow"])
+def test_dtype_drift_between_chunks(tmp_path, ext):
+    # chunk 1: `reply` kosong semua & `score` int; chunk 2: `reply` teks & `score` ada sel kosong/pecahan
+    csv = ("content,reply,score\n"
+           "barangnya bagus,,5\n"
+           "pengiriman lama,,4\n"
+           "mantap sekali,terima kasih kak,\n"
+           "kurang puas,,3.5\n")
+    out = str(tmp_path / f"hasil{ext}")
+    info = process_csv_stream(io.BytesIO(csv.encode()), "content", out, chunksize=2)
+    assert info["chunks"] == 2
+    df = read_frame(out)
+    assert df["reply"].tolist()[2] == "terima kasih kak"
+    assert df["score"].tolist()[:2] == [5.0, 4.0] and df["score"].tolist()[3] == 3.5
+
+
+def test_sink_base_init():
+    from sentinex.streaming import ArrowSink, ParquetSink, Sink
+
+    assert issubclass(ParquetSink, Sink) and issubclass(ArrowSink, ParquetSink)
@@ -0,0 +1,172 @@
+"""Orkestrator k-fold: split stabil & resume yang tidak mencampur split lama."""
+import json
+import os
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sentinex import training
+from sentinex.training import (
+    assign_folds, fold_result_path, fold_split, load_app_data, load_split, row_keys, run_cv,
+    run_incremental,
+)
+
+POS = ["barang bagus sekali", "pengiriman cepat mantap", "penjual ramah dan responsif",
+       "kualitas oke sesuai gambar", "harga murah barang awet"]
+NEG = ["barang rusak parah", "pengiriman lama sekali", "penjual tidak merespon chat",
+       "kualitas jelek tidak sesuai", "kecewa uang tidak kembali"]
+
+
+def make_data(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        label = "positif" if i % 2 == 0 else "negatif"
+        base = rng.choice(POS if label == "positif" else NEG)
+        rows.append({"content": f"{base} ulasan{i}", "label": label})
+    return pd.DataFrame(rows)
+
+
+def write_app(tmp_path, app: str, df: pd.DataFrame) -> dict:
+    path = tmp_path / f"{app.lower()}_idonly.csv"
+    df.to_csv(path, index=False)
+    return {"idonly_path": str(path), "text_col": "content", "label_col": "label"}
+
+
+# ------------------------------------------------------------
+# Pembagian fold
+# ------------------------------------------------------------
+def test_assign_folds_deterministic_and_stratified():
+    keys = [f"k{i}" for i in range(40)]
+    y = np.array([i % 2 for i in range(40)])
+    a, b = assign_folds(keys, y, k=4), assign_folds(keys, y, k=4)
+    np.testing.assert_array_equal(a, b)
+    assert set(a) == {1, 2, 3, 4}
+    for f in range(1, 5):
+        assert np.bincount(y[a == f]).tolist() == [5, 5]
+
+
+def test_assign_folds_warm_keeps_existing_keys():
+    keys = [f"k{i}" for i in range(40)] + ["dup", "dup"]
+    y = np.array([i % 2 for i in range(42)])
+    old = assign_folds(keys, y, k=4)
+    previous = {"keys": keys, "fold": old.tolist()}
+
+    # baris dihapus, urutan diacak, baris baru ditambah
+    order = list(range(5, 42))
+    random.Random(1).shuffle(order)
+    new_keys = [keys[i] for i in order] + [f"baru{i}" for i in range(8)]
+    new_y = np.concatenate([y[order], np.array([0, 1] * 4)])
+    folds = assign_folds(new_keys, new_y, k=4, previous=previous)
+
+    for pos, i in enumerate(order):
+        assert folds[pos] == old[i]
+    new = folds[len(order):]
+    assert set(new) <= {1, 2, 3, 4}
+    np.testing.assert_array_equal(assign_folds(new_keys, new_y, k=4, previous=previous), folds)
+    # label seimbang tetap terjaga: tiap fold selisih maksimal 1 per kelas
+    for c in (0, 1):
+        counts = np.bincount(folds[new_y == c], minlength=5)[1:]
+        assert counts.max() - counts.min() <= 1
+
+
+# ------------------------------------------------------------
+# run_cv: data berubah → split baru, semua fold dilatih ulang
+# ------------------------------------------------------------
+def fake_run_jobs(calls):
+    """Pengganti `_run_jobs` tanpa TensorFlow: hasil fold = prediksi 'benar' untuk baris test split."""
+    def run(jobs, workers, threads):
+        for meta, _, fold_i, k, out_dir, *_ in jobs:
+            calls.append((meta["app"], fold_i))
+            X_text, y, classes = load_app_data(meta)
+            _, te = fold_split(meta, out_dir, k, fold_i)
+            result = {
+                "app": meta["app"], "fold": fold_i, "classes": classes, "seconds": 0.0,
+                "metrics": {"aplikasi": meta["app"], "fold": fold_i, "accuracy": 1.0,
+                            "precision_macro": 1.0, "recall_macro": 1.0, "f1_macro": 1.0},
+                "cm": np.diag(np.bincount(y[te], minlength=len(classes))).tolist(),
+                "preds": [{"aplikasi": meta["app"], "fold": fold_i, "text": X_text[i],
+                           "true": classes[y[i]], "pred": classes[y[i]], "status": "BENAR"} for i in te],
+            }
+            with open(fold_result_path(out_dir, meta["app"], fold_i), "w", encoding="utf-8") as f:
+                json.dump(result, f)
+        return []
+    return run
+
+
+def test_run_cv_resplits_when_data_changes(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(training, "_run_jobs", fake_run_jobs(calls))
+    monkeypatch.setattr(training, "ensure_embedding_store", lambda *a, **kw: None)
+    ft_dir, out = tmp_path / "ft", tmp_path / "out"
+    ft_dir.mkdir()
+    (ft_dir / "tokopedia_fasttext.bin").write_bytes(b"")
+    meta = {"Tokopedia": write_app(tmp_path, "Tokopedia", make_data(30))}
+    run = lambda: run_cv(meta, str(ft_dir), str(out), apps=["Tokopedia"], k=3, workers=1)  # noqa: E731
+
+    run()
+    assert sorted(calls) == [("Tokopedia", i) for i in (1, 2, 3)]
+    calls.clear()
+    run()
+    assert calls == []  # resume: tidak ada yang dilatih ulang
+
+    # sebagian fold hilang → hanya fold itu yang dijalankan
+    os.remove(fold_result_path(str(out), "Tokopedia", 2))
+    run()
+    assert calls == [("Tokopedia", 2)]
+    calls.clear()
+
+    data = pd.concat([make_data(30).iloc[4:], make_data(12, seed=5).assign(
+        content=lambda d: d["content"] + " tambahan")], ignore_index=True)
+    write_app(tmp_path, "Tokopedia", data)
+    paths = run()
+    assert sorted(calls) == [("Tokopedia", i) for i in (1, 2, 3)]
+    assert load_split(str(out), "Tokopedia")["keys"] == row_keys(dict(meta["Tokopedia"], app="Tokopedia"))
+    preds = pd.read_csv(paths["preds"])
+    assert sorted(preds["text"]) == sorted(data["content"])  # tidak ada fold dari split lama
+
+
+# ------------------------------------------------------------
+# Inkremental (TensorFlow CPU, data kecil)
+# ------------------------------------------------------------
+@pytest.fixture
+def tiny_project(tmp_path):
+    fasttext = pytest.importorskip("fasttext")
+    ft_dir = tmp_path / "ft"
+    ft_dir.mkdir()
+    meta = {}
+    for app, seed in (("Tokopedia", 0), ("Shopee", 1)):
+        df = make_data(40, seed)
+        meta[app] = write_app(tmp_path, app, df)
+        corpus = tmp_path / f"{app}.txt"
+        corpus.write_text("\n".join(df["content"]), encoding="utf-8")
+        ft = fasttext.train_unsupervised(str(corpus), model="skipgram", dim=8, epoch=1, minCount=1,
+                                         thread=1, verbose=0)
+        ft.save_model(str(ft_dir / f"{app.lower()}_fasttext.bin"))
+    return tmp_path, meta, str(ft_dir), str(tmp_path / "out")
+
+
+def test_incremental_skips_unchanged_and_warm_starts_changed(tiny_project):
+    tmp_path, meta, ft_dir, out = tiny_project
+    apps = ["Tokopedia", "Shopee"]
+    run_cv(meta, ft_dir, out, apps=apps, k=2, workers=1, threads_per_worker=1)
+
+    grown = pd.concat([make_data(40, 1), make_data(6, 9).assign(content=lambda d: d["content"] + " baru")],
+                      ignore_index=True)
+    write_app(tmp_path, "Shopee", grown)
+    report = run_incremental(meta, ft_dir, out, apps=apps, k=2, workers=1, threads_per_worker=1,
+                             finetune_epochs=1)
+
+    mode = dict(zip(report["aplikasi"], report["mode"]))
+    assert mode["Tokopedia"] == "dilewati"
+    assert mode["Shopee"] == "inkremental"
+    assert report.set_index("aplikasi").loc["Shopee", "baris_baru"] == 6
+    for fold_i in (1, 2):
+        with open(fold_result_path(out, "Shopee", fold_i), encoding="utf-8") as f:
+            assert json.load(f)["mode"] == "inkremental"
+        with open(fold_result_path(out, "Tokopedia", fold_i), encoding="utf-8") as f:
+            assert json.load(f)["mode"] == "penuh"
+    preds = pd.read_csv(os.path.join(out, "bukti_true_vs_pred_per_fold.csv"))
+    assert (preds["aplikasi"] == "Shopee").sum() == len(grown)